@@ -2,4 +2,6 @@
 
 uv run alembic upgrade head
 
+uv run python -m src.interfaces.cli.create_mood_partitions
+
 uv run uvicorn --host 0.0.0.0 --port 8000 src.api:app
@@ -1,9 +1,27 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from src.interfaces.http.controllers import auth_controller, mood_controller, user_controller
+from src.infrastructure.database.session import database
+from src.interfaces.http.controllers import (
+    auth_controller,
+    health_controller,
+    mood_controller,
+    user_controller,
+)
+from src.settings import Settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.connect(Settings())
+    yield
+    await database.dispose()
+
 
-app = FastAPI(title='Sunrise API')
+app = FastAPI(title='Sunrise API', lifespan=lifespan)
 
 app.include_router(user_controller.router)
 app.include_router(auth_controller.router)
 app.include_router(mood_controller.router)
+app.include_router(health_controller.router)
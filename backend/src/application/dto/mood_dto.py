@@ -1,6 +1,10 @@
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Any
 
+from src.domain.entities.associated_emotion import AssociatedEmotionEnum
+from src.domain.entities.mood import Mood, RegistryType
+
 
 @dataclass
 class RegisterMoodCommand:
@@ -12,11 +16,41 @@ class RegisterMoodCommand:
     description: str = ''
 
 
+@dataclass
+class RegisterMoodResult:
+    index: int
+    mood: Mood | None = None
+    error: str | None = None
+
+
+@dataclass
+class MoodFilters:
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    registry_type: RegistryType | None = None
+    visual_scale_min: int | None = None
+    visual_scale_max: int | None = None
+    emotion: AssociatedEmotionEnum | None = None
+    emotion_intensity_min: int | None = None
+    emotion_intensity_max: int | None = None
+    triggers: list[str] = field(default_factory=list)
+
+    @property
+    def filters_emotions(self) -> bool:
+        return (
+            self.emotion is not None
+            or self.emotion_intensity_min is not None
+            or self.emotion_intensity_max is not None
+        )
+
+
 @dataclass
 class GetMoodsCommand:
     user_id: str
     offset: int = 0
     limit: int = 100
+    cursor: str | None = None
+    filters: MoodFilters = field(default_factory=MoodFilters)
 
 
 @dataclass
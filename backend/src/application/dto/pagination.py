@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+@dataclass
+class Page(Generic[T]):
+    """Página de resultados com o cursor opaco para a próxima página"""
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
@@ -23,6 +23,13 @@ class UpdateUserCommand:
     last_name: Optional[str] = None
 
 
+@dataclass
+class DeleteUserCommand:
+    """Comando para excluir a conta de um usuário"""
+
+    user_id: str
+
+
 @dataclass
 class LoginCommand:
     """Comando para login"""
@@ -39,3 +46,28 @@ class GetUsersCommand:
     is_admin: bool
     offset: int = 0
     limit: int = 10
+    cursor: Optional[str] = None
+
+
+@dataclass
+class RefreshTokenCommand:
+    """Comando para renovar o token de acesso"""
+
+    refresh_token: str
+
+
+@dataclass
+class AuthTokens:
+    """Tokens emitidos na autenticação"""
+
+    access_token: str
+    refresh_token: str
+
+
+@dataclass
+class AccountPurgeProgress:
+    """Progresso de um lote da remoção dos dados de uma conta excluída"""
+
+    user_id: str
+    moods_purged: int
+    completed: bool
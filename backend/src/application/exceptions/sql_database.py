@@ -20,3 +20,9 @@ class IntegrityConstraintViolationError(SQLDatabaseError):
     """Exception raised for integrity constraint violations."""
 
     pass
+
+
+class InvalidCursorError(SQLDatabaseError):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    pass
@@ -0,0 +1 @@
+from ..cache.principal_cache import PrincipalCache as PrincipalCache
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.domain.entities.user import User
+
+
+class PrincipalCache(ABC):
+    """Port - Interface para cache de usuários autenticados"""
+
+    @abstractmethod
+    def get(self, subject: str) -> Optional[User]:
+        """Busca o usuário associado ao subject do token"""
+        pass
+
+    @abstractmethod
+    def set(self, subject: str, user: User) -> None:
+        """Armazena o usuário associado ao subject do token"""
+        pass
+
+    @abstractmethod
+    def get_token_version(self, user_id: str) -> Optional[int]:
+        """Busca a versão dos tokens de um usuário"""
+        pass
+
+    @abstractmethod
+    def set_token_version(self, user_id: str, token_version: int) -> None:
+        """Armazena a versão dos tokens de um usuário"""
+        pass
+
+    @abstractmethod
+    def invalidate(self, user_id: str) -> None:
+        """Remove as entradas de um usuário"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+        pass
@@ -0,0 +1 @@
+from ..database.unit_of_work import UnitOfWork as UnitOfWork
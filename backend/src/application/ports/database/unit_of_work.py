@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+
+class UnitOfWork(ABC):
+    """Port - Transação de um caso de uso, confirmada uma única vez ao final"""
+
+    async def __aenter__(self) -> 'UnitOfWork':
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        # Anything not explicitly committed is discarded, including work before an error
+        await self.rollback()
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Confirma tudo o que os repositórios escreveram na transação"""
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Descarta o que ainda não foi confirmado"""
+        pass
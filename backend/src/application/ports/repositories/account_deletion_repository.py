@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class AccountDeletionRepository(ABC):
+    """Port - Interface para a fila de exclusões de contas"""
+
+    @abstractmethod
+    async def schedule(self, user_id: str) -> None:
+        """Agenda a remoção dos dados de um usuário, sem efeito se ela já estiver agendada"""
+        pass
+
+    @abstractmethod
+    async def claim_next(self) -> Optional[str]:
+        """Reserva até o fim da transação a exclusão pendente mais antiga, retornando o usuário"""
+        pass
+
+    @abstractmethod
+    async def purge_moods(self, user_id: str, batch_size: int) -> int:
+        """Remove até batch_size humores do usuário, retornando quantos foram removidos"""
+        pass
+
+    @abstractmethod
+    async def record_progress(self, user_id: str, moods_purged: int) -> int:
+        """Soma os humores removidos ao progresso da exclusão, retornando o total"""
+        pass
+
+    @abstractmethod
+    async def complete(self, user_id: str) -> bool:
+        """Remove o usuário se não restar nenhum humor dele, retornando se a exclusão terminou"""
+        pass
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from src.application.dto.mood_dto import MoodFilters
+from src.application.dto.pagination import Page
 from src.domain.entities.mood import Mood
 
 
@@ -9,7 +11,29 @@ class MoodRepository(ABC):
         pass
 
     @abstractmethod
-    async def list_moods(self, user_id: str, offset: int, limit: int) -> list[Mood]:
+    async def save_many(self, moods: list[Mood]) -> list[Mood]:
+        pass
+
+    @abstractmethod
+    async def list_moods(
+        self,
+        user_id: str,
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        filters: MoodFilters | None = None,
+    ) -> Page[Mood]:
+        pass
+
+    @abstractmethod
+    async def list_mood_documents(
+        self,
+        user_id: str,
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        filters: MoodFilters | None = None,
+    ) -> Page[str]:
         pass
 
     @abstractmethod
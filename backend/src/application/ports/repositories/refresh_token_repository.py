@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.domain.entities.refresh_token import RefreshToken
+
+
+class RefreshTokenRepository(ABC):
+    """Port - Interface para repositório de refresh tokens"""
+
+    @abstractmethod
+    async def save(self, refresh_token: RefreshToken) -> None:
+        """Salva um refresh token"""
+        pass
+
+    @abstractmethod
+    async def find_by_token_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """Busca um refresh token pelo hash"""
+        pass
+
+    @abstractmethod
+    async def revoke(self, token_hash: str) -> bool:
+        """Revoga um refresh token, retornando False se ele já estava revogado"""
+        pass
+
+    @abstractmethod
+    async def revoke_family(self, family_id: str) -> None:
+        """Revoga todos os refresh tokens de uma mesma família"""
+        pass
+
+    @abstractmethod
+    async def delete_expired(self, user_id: str) -> int:
+        """Remove os refresh tokens expirados de um usuário, retornando quantos removeu"""
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Optional
 
+from src.application.dto.pagination import Page
 from src.domain.entities.user import User
 
 
@@ -18,16 +19,28 @@ class UserRepository(ABC):
         pass
 
     @abstractmethod
-    async def find_by_id(self, user_id: str) -> Optional[User]:
-        """Busca um usuário por ID"""
+    async def find_by_id(self, user_id: str, for_update: bool = False) -> Optional[User]:
+        """Busca um usuário por ID, bloqueando a linha até o fim da transação se for_update"""
         pass
 
     @abstractmethod
-    async def find_all(self, offset: int = 0, limit: int = 10) -> List[User]:
-        """Busca todos os usuários com paginação"""
+    async def get_token_version(self, user_id: str) -> int:
+        """Busca a versão atual dos tokens de um usuário"""
+        pass
+
+    @abstractmethod
+    async def find_all(
+        self, offset: int = 0, limit: int = 10, cursor: Optional[str] = None
+    ) -> Page[User]:
+        """Busca os usuários por ordem de cadastro, paginando pelo cursor"""
         pass
 
     @abstractmethod
     async def update(self, user: User) -> User:
         """Atualiza um usuário"""
         pass
+
+    @abstractmethod
+    async def update_password(self, user_id: str, password: str) -> None:
+        """Atualiza o hash da senha de um usuário"""
+        pass
@@ -1,17 +1,26 @@
+from pydantic import ValidationError
+
 from src.application.dto.mood_dto import (
     DeleteMoodCommand,
     GetMoodsCommand,
     RegisterMoodCommand,
+    RegisterMoodResult,
     UpdateMoodCommand,
 )
+from src.application.dto.pagination import Page
+from src.application.ports.database.unit_of_work import UnitOfWork
 from src.application.ports.repositories.mood_repository import MoodRepository
 from src.domain.entities.mood import Mood
+from src.domain.entities.principal import Principal
 from src.domain.entities.user import User
 from src.domain.exceptions.user_exceptions import InsufficientPermissionsError
 
 
 async def register_mood(
-    mood_repository: MoodRepository, mood_command: RegisterMoodCommand, current_user: User
+    unit_of_work: UnitOfWork,
+    mood_repository: MoodRepository,
+    mood_command: RegisterMoodCommand,
+    current_user: User | Principal,
 ) -> Mood:
     if current_user.id != mood_command.user_id:
         if not current_user.is_admin:
@@ -25,43 +34,115 @@ async def register_mood(
         triggers=mood_command.triggers,
         description=mood_command.description,
     )
-    return await mood_repository.save(mood)
+
+    async with unit_of_work:
+        mood = await mood_repository.save(mood)
+        await unit_of_work.commit()
+    return mood
+
+
+async def register_moods(
+    unit_of_work: UnitOfWork,
+    mood_repository: MoodRepository,
+    mood_commands: list[RegisterMoodCommand],
+    current_user: User | Principal,
+) -> list[RegisterMoodResult]:
+    for user_id in {mood_command.user_id for mood_command in mood_commands}:
+        if current_user.id != user_id:
+            if not current_user.is_admin:
+                raise InsufficientPermissionsError('Not enough permissions')
+
+    results = [RegisterMoodResult(index=index) for index in range(len(mood_commands))]
+    valid_results = []
+    for result, mood_command in zip(results, mood_commands):
+        try:
+            result.mood = Mood(
+                user_id=mood_command.user_id,
+                registry_type=mood_command.registry_type,
+                visual_scale=mood_command.visual_scale,
+                associated_emotions=mood_command.associated_emotions,
+                triggers=mood_command.triggers,
+                description=mood_command.description,
+            )
+            valid_results.append(result)
+        except ValidationError as e:
+            result.error = str(e)
+
+    if valid_results:
+        async with unit_of_work:
+            saved_moods = await mood_repository.save_many([result.mood for result in valid_results])
+            await unit_of_work.commit()
+        for result, saved_mood in zip(valid_results, saved_moods):
+            result.mood = saved_mood
+
+    return results
 
 
 async def list_moods(
-    mood_repository: MoodRepository, command: GetMoodsCommand, current_user: User
-) -> list[Mood]:
+    mood_repository: MoodRepository, command: GetMoodsCommand, current_user: User | Principal
+) -> Page[Mood]:
     if current_user.id != command.user_id:
         if not current_user.is_admin:
             raise InsufficientPermissionsError('Not enough permissions')
 
     return await mood_repository.list_moods(
-        user_id=command.user_id, offset=command.offset, limit=command.limit
+        user_id=command.user_id,
+        offset=command.offset,
+        limit=command.limit,
+        cursor=command.cursor,
+        filters=command.filters,
+    )
+
+
+async def list_mood_documents(
+    mood_repository: MoodRepository, command: GetMoodsCommand, current_user: User | Principal
+) -> Page[str]:
+    if current_user.id != command.user_id:
+        if not current_user.is_admin:
+            raise InsufficientPermissionsError('Not enough permissions')
+
+    return await mood_repository.list_mood_documents(
+        user_id=command.user_id,
+        offset=command.offset,
+        limit=command.limit,
+        cursor=command.cursor,
+        filters=command.filters,
     )
 
 
 async def update_mood(
-    mood_repository: MoodRepository, mood_command: UpdateMoodCommand, current_user: User
+    unit_of_work: UnitOfWork,
+    mood_repository: MoodRepository,
+    mood_command: UpdateMoodCommand,
+    current_user: User | Principal,
 ) -> Mood:
     if current_user.id != mood_command.user_id:
         if not current_user.is_admin:
             raise InsufficientPermissionsError('Not enough permissions')
 
-    mood = await mood_repository.find_mood_by_id(mood_command.mood_id, mood_command.user_id)
+    async with unit_of_work:
+        mood = await mood_repository.find_mood_by_id(mood_command.mood_id, mood_command.user_id)
 
-    mood.update_visual_scale(mood_command.visual_scale)
-    mood.update_associated_emotions(mood_command.associated_emotions)
-    mood.update_triggers(mood_command.triggers)
-    mood.update_description(mood_command.description)
+        mood.update_visual_scale(mood_command.visual_scale)
+        mood.update_associated_emotions(mood_command.associated_emotions)
+        mood.update_triggers(mood_command.triggers)
+        mood.update_description(mood_command.description)
 
-    return await mood_repository.update(mood)
+        mood = await mood_repository.update(mood)
+        await unit_of_work.commit()
+    return mood
 
 
 async def delete_mood(
-    mood_repository: MoodRepository, command: DeleteMoodCommand, current_user: User
+    unit_of_work: UnitOfWork,
+    mood_repository: MoodRepository,
+    command: DeleteMoodCommand,
+    current_user: User | Principal,
 ) -> None:
     if current_user.id != command.user_id:
         if not current_user.is_admin:
             raise InsufficientPermissionsError('Not enough permissions')
 
-    await mood_repository.delete(command.mood_id, command.user_id)
+    async with unit_of_work:
+        await mood_repository.delete(command.mood_id, command.user_id)
+        await unit_of_work.commit()
@@ -1,10 +1,25 @@
+from typing import Optional
+
+from src.application.dto.pagination import Page
 from src.application.dto.user_dto import (
+    AccountPurgeProgress,
+    AuthTokens,
     CreateUserCommand,
+    DeleteUserCommand,
     GetUsersCommand,
     LoginCommand,
+    RefreshTokenCommand,
     UpdateUserCommand,
 )
+from src.application.ports.cache.principal_cache import PrincipalCache
+from src.application.ports.database.unit_of_work import UnitOfWork
+from src.application.ports.repositories.account_deletion_repository import (
+    AccountDeletionRepository,
+)
+from src.application.ports.repositories.refresh_token_repository import RefreshTokenRepository
 from src.application.ports.repositories.user_repository import UserRepository
+from src.domain.entities.principal import Principal
+from src.domain.entities.refresh_token import RefreshToken
 from src.domain.entities.user import User
 from src.domain.exceptions.user_exceptions import (
     InactiveUserError,
@@ -12,11 +27,16 @@ from src.domain.exceptions.user_exceptions import (
     InvalidCredentialsError,
 )
 from src.domain.services.jwt_token import JWTTokenService
-from src.domain.services.password import PasswordService
+from src.domain.services.password import AsyncPasswordService, async_password_service
+from src.domain.services.refresh_token import RefreshTokenService
 
 
-async def create_user(user_repository: UserRepository, command: CreateUserCommand) -> User:
-    password_service = PasswordService()
+async def create_user(
+    unit_of_work: UnitOfWork,
+    user_repository: UserRepository,
+    command: CreateUserCommand,
+    password_service: AsyncPasswordService = async_password_service,
+) -> User:
     user = User(
         username=command.username,
         email=command.email,
@@ -25,53 +45,221 @@ async def create_user(user_repository: UserRepository, command: CreateUserComman
         last_name=command.last_name,
     )
 
-    user.password = password_service.hash_password(user.password)
+    user.password = await password_service.hash_password(user.password)
 
-    return await user_repository.save(user)
+    async with unit_of_work:
+        user = await user_repository.save(user)
+        await unit_of_work.commit()
+    return user
 
 
-async def list_users(user_repository: UserRepository, command: GetUsersCommand) -> list[User]:
+async def list_users(user_repository: UserRepository, command: GetUsersCommand) -> Page[User]:
     if not command.is_admin:
         raise InsufficientPermissionsError('Only admin users can retrieve the user list')
 
     if not command.is_active:
         raise InactiveUserError('Inactive users cannot perform this action')
 
-    return await user_repository.find_all(offset=command.offset, limit=command.limit)
+    return await user_repository.find_all(
+        offset=command.offset, limit=command.limit, cursor=command.cursor
+    )
+
+
+async def get_current_user(
+    user_repository: UserRepository,
+    token: str,
+    principal_cache: Optional[PrincipalCache] = None,
+) -> User:
+    payload = JWTTokenService().decode_token(token)
+    return await _get_user_from_claims(user_repository, payload, principal_cache)
+
+
+async def get_current_principal(
+    user_repository: UserRepository,
+    token: str,
+    principal_cache: Optional[PrincipalCache] = None,
+) -> User | Principal:
+    payload = JWTTokenService().decode_token(token)
+    if 'user_id' not in payload:
+        user = await _get_user_from_claims(user_repository, payload, principal_cache)
+        if not user.is_active:
+            raise InactiveUserError('User account is inactive')
+        return user
+
+    principal = Principal(
+        id=payload['user_id'],
+        email=payload['sub'],
+        is_admin=payload['is_admin'],
+        is_active=payload['is_active'],
+        token_version=payload['token_version'],
+    )
+
+    token_version = None
+    if principal_cache is not None:
+        token_version = principal_cache.get_token_version(principal.id)
 
+    if token_version is None:
+        token_version = await user_repository.get_token_version(principal.id)
+        if principal_cache is not None:
+            principal_cache.set_token_version(principal.id, token_version)
 
-async def get_current_user(user_repository: UserRepository, token: str) -> User:
-    jwt_service = JWTTokenService()
-    payload = jwt_service.decode_token(token)
+    if token_version != principal.token_version:
+        raise InvalidCredentialsError('Token has been revoked')
+
+    if not principal.is_active:
+        raise InactiveUserError('User account is inactive')
+
+    return principal
+
+
+async def _get_user_from_claims(
+    user_repository: UserRepository,
+    payload: dict,
+    principal_cache: Optional[PrincipalCache] = None,
+) -> User:
     user_email = payload.get('sub')
 
     if not user_email:
         raise ValueError('Invalid token')
 
+    if principal_cache is not None:
+        cached_user = principal_cache.get(user_email)
+        if cached_user is not None:
+            return cached_user
+
     user = await user_repository.find_by_email(user_email)
 
+    if principal_cache is not None:
+        principal_cache.set(user_email, user)
+
     return user
 
 
 async def update_user(
-    user_repository: UserRepository, command: UpdateUserCommand, current_user: User
+    unit_of_work: UnitOfWork,
+    user_repository: UserRepository,
+    command: UpdateUserCommand,
+    current_user: User,
 ) -> User:
     if current_user.id != command.user_id:
         if not current_user.is_admin:
             raise InsufficientPermissionsError('Not enough permissions')
 
-    update_user = await user_repository.find_by_id(command.user_id)
+    async with unit_of_work:
+        # Holds the row so a concurrent deletion cannot be undone by this write
+        update_user = await user_repository.find_by_id(command.user_id, for_update=True)
+
+        if command.username and command.username != update_user.username:
+            update_user.update_username(command.username)
+
+        if command.first_name is not None or command.last_name is not None:
+            update_user.update_profile(first_name=command.first_name, last_name=command.last_name)
+
+        update_user = await user_repository.update(update_user)
+        await unit_of_work.commit()
+    return update_user
+
+
+async def delete_user(
+    unit_of_work: UnitOfWork,
+    user_repository: UserRepository,
+    account_deletion_repository: AccountDeletionRepository,
+    command: DeleteUserCommand,
+    current_user: User,
+) -> None:
+    if current_user.id != command.user_id:
+        if not current_user.is_admin:
+            raise InsufficientPermissionsError('Not enough permissions')
+
+    async with unit_of_work:
+        delete_user = await user_repository.find_by_id(command.user_id, for_update=True)
+        # Locks the account out right away; the moods are purged later, in batches
+        delete_user.deactivate()
+        await user_repository.update(delete_user)
+        await account_deletion_repository.schedule(delete_user.id)
+        await unit_of_work.commit()
+
+
+async def purge_deleted_account(
+    unit_of_work: UnitOfWork,
+    account_deletion_repository: AccountDeletionRepository,
+    batch_size: int,
+) -> Optional[AccountPurgeProgress]:
+    async with unit_of_work:
+        user_id = await account_deletion_repository.claim_next()
+        if user_id is None:
+            return None
+
+        purged = await account_deletion_repository.purge_moods(user_id, batch_size)
+        moods_purged = await account_deletion_repository.record_progress(user_id, purged)
+        completed = purged == 0 and await account_deletion_repository.complete(user_id)
+        await unit_of_work.commit()
+    return AccountPurgeProgress(user_id=user_id, moods_purged=moods_purged, completed=completed)
+
+
+async def login(
+    unit_of_work: UnitOfWork,
+    user_repository: UserRepository,
+    refresh_token_repository: RefreshTokenRepository,
+    command: LoginCommand,
+    password_service: AsyncPasswordService = async_password_service,
+) -> AuthTokens:
+    async with unit_of_work:
+        user = await _authenticate(user_repository, command, password_service)
+        tokens = await _issue_tokens(refresh_token_repository, user)
+        await unit_of_work.commit()
+    return tokens
+
+
+async def refresh_access_token(
+    unit_of_work: UnitOfWork,
+    user_repository: UserRepository,
+    refresh_token_repository: RefreshTokenRepository,
+    command: RefreshTokenCommand,
+) -> AuthTokens:
+    token_hash = RefreshTokenService.hash_token(command.refresh_token)
+
+    async with unit_of_work:
+        refresh_token = await refresh_token_repository.find_by_token_hash(token_hash)
+
+        if not refresh_token:
+            raise InvalidCredentialsError('Invalid refresh token')
 
-    if command.username and command.username != update_user.username:
-        update_user.update_username(command.username)
+        try:
+            tokens = await _rotate_refresh_token(
+                user_repository, refresh_token_repository, refresh_token
+            )
+        finally:
+            # A refused refresh still consumes the token, and a reuse still revokes its family
+            await unit_of_work.commit()
+    return tokens
 
-    if command.first_name is not None or command.last_name is not None:
-        update_user.update_profile(first_name=command.first_name, last_name=command.last_name)
 
-    return await user_repository.update(update_user)
+async def _rotate_refresh_token(
+    user_repository: UserRepository,
+    refresh_token_repository: RefreshTokenRepository,
+    refresh_token: RefreshToken,
+) -> AuthTokens:
+    if refresh_token.revoked or not await refresh_token_repository.revoke(refresh_token.token_hash):
+        await refresh_token_repository.revoke_family(refresh_token.family_id)
+        raise InvalidCredentialsError('Refresh token has already been used')
 
+    if refresh_token.is_expired():
+        raise InvalidCredentialsError('Refresh token has expired')
 
-async def get_access_token(user_repository: UserRepository, command: LoginCommand) -> str:
+    user = await user_repository.find_by_id(refresh_token.user_id)
+
+    if not user.is_active:
+        raise InactiveUserError('User account is inactive')
+
+    return await _issue_tokens(refresh_token_repository, user, refresh_token.family_id)
+
+
+async def _authenticate(
+    user_repository: UserRepository,
+    command: LoginCommand,
+    password_service: AsyncPasswordService,
+) -> User:
     user = await user_repository.find_by_email(command.email)
     if not user:
         raise InvalidCredentialsError('Incorrect username or password')
@@ -79,10 +267,30 @@ async def get_access_token(user_repository: UserRepository, command: LoginComman
     if not user.is_active:
         raise InactiveUserError('User account is inactive')
 
-    if not PasswordService().verify_password(command.password, user.password):
+    verified, updated_password = await password_service.verify_and_update(
+        command.password, user.password
+    )
+    if not verified:
         raise InvalidCredentialsError('Incorrect username or password')
 
-    token_data = {'sub': user.email}
-    access_token = JWTTokenService().create_access_token(token_data)
+    if updated_password:
+        await user_repository.update_password(user.id, updated_password)
+        user.password = updated_password
+
+    return user
+
+
+async def _issue_tokens(
+    refresh_token_repository: RefreshTokenRepository,
+    user: User,
+    family_id: Optional[str] = None,
+) -> AuthTokens:
+    token, refresh_token = RefreshTokenService().create_refresh_token(user.id, family_id)
+    # Every login and refresh adds a row, so each one also clears the user's expired ones
+    await refresh_token_repository.delete_expired(user.id)
+    await refresh_token_repository.save(refresh_token)
 
-    return access_token
+    return AuthTokens(
+        access_token=JWTTokenService().create_user_access_token(user),
+        refresh_token=token,
+    )
@@ -1,2 +1,3 @@
 from ..entities.mood import *
+from ..entities.principal import Principal as Principal
 from ..entities.user import User as User
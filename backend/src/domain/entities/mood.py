@@ -1,4 +1,3 @@
-import uuid
 from enum import Enum
 from typing import Any
 
@@ -6,6 +5,7 @@ from pydantic import BaseModel, Field
 
 from src.domain.entities.associated_emotion import AssociatedEmotion
 from src.domain.entities.emotional_trigger import EmotionalTrigger
+from src.domain.services.id_generator import new_id
 
 
 class VisualScale(Enum):
@@ -27,7 +27,7 @@ class Mood(BaseModel):
     visual_scale: VisualScale
     associated_emotions: list[AssociatedEmotion]
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     triggers: list[EmotionalTrigger] = Field(default_factory=list)
     description: str = ''
 
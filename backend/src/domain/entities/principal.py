@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class Principal(BaseModel):
+    """Usuário autenticado reconstruído a partir das claims do token"""
+
+    id: str
+    email: str
+    is_admin: bool
+    is_active: bool
+    token_version: int
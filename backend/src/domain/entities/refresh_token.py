@@ -0,0 +1,15 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from pydantic import BaseModel
+
+
+class RefreshToken(BaseModel):
+    token_hash: str
+    user_id: str
+    family_id: str
+    expires_at: datetime
+    revoked: bool = False
+
+    def is_expired(self) -> bool:
+        return self.expires_at <= datetime.now(tz=ZoneInfo('UTC'))
@@ -1,21 +1,22 @@
 import re
-import uuid
 from typing import Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
 from src.domain.exceptions.user_exceptions import InvalidPasswordError, InvalidUsernameError
+from src.domain.services.id_generator import new_id
 
 
 class User(BaseModel):
     username: str
     email: EmailStr
     password: str
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     first_name: Optional[str] = Field(default='')
     last_name: Optional[str] = Field(default='')
     is_admin: bool = Field(default=False)
     is_active: bool = Field(default=True)
+    token_version: int = Field(default=0)
 
     @field_validator('username')
     @classmethod
@@ -64,15 +65,25 @@ class User(BaseModel):
 
     def deactivate(self) -> None:
         self.is_active = False
+        self.revoke_tokens()
 
     def activate(self) -> None:
         self.is_active = True
+        self.revoke_tokens()
 
     def make_admin(self) -> None:
         self.is_admin = True
+        self.revoke_tokens()
 
     def remove_admin(self) -> None:
         self.is_admin = False
+        self.revoke_tokens()
+
+    def revoke_tokens(self) -> None:
+        """
+        Invalidates every token issued with the current claims by bumping the token version.
+        """
+        self.token_version += 1
 
     @property
     def full_name(self) -> str:
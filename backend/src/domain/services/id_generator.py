@@ -0,0 +1,45 @@
+import os
+import time
+import uuid
+from threading import Lock
+
+_RAND_A_MAX = 0xFFF
+
+
+class UUID7Generator:
+    """Gera UUIDv7 (RFC 9562) ordenados pelo tempo e monotônicos dentro do processo"""
+
+    def __init__(self, clock=time.time_ns):
+        self._clock = clock
+        self._lock = Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def generate(self) -> uuid.UUID:
+        with self._lock:
+            timestamp_ms = self._clock() // 1_000_000
+            if timestamp_ms > self._last_ms:
+                self._last_ms = timestamp_ms
+                # Seeded in the lower half so a burst within one millisecond rarely overflows
+                self._counter = int.from_bytes(os.urandom(2)) & 0x7FF
+            elif self._counter < _RAND_A_MAX:
+                self._counter += 1
+            else:
+                # Counter exhausted: borrow the next millisecond instead of going backwards
+                self._last_ms += 1
+                self._counter = 0
+            timestamp_ms, counter = self._last_ms, self._counter
+
+        rand_b = int.from_bytes(os.urandom(8)) & (1 << 62) - 1
+        value = (
+            (timestamp_ms & (1 << 48) - 1) << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b
+        )
+        return uuid.UUID(int=value)
+
+
+uuid7_generator = UUID7Generator()
+
+
+def new_id() -> str:
+    """Gera um novo id ordenado pelo tempo de criação"""
+    return str(uuid7_generator.generate())
@@ -4,6 +4,7 @@ from zoneinfo import ZoneInfo
 
 from jwt import DecodeError, ExpiredSignatureError, decode, encode
 
+from src.domain.entities.user import User
 from src.settings import Settings
 
 
@@ -14,6 +15,7 @@ class JWTTokenService:
         self._access_token_expires_minutes = Settings().JWT_ACCESS_TOKEN_EXPIRE_MINUTES
         self._algorithm = Settings().JWT_ALGORITHM
         self._secret_key = Settings().JWT_SECRET_KEY
+        self._self_contained_claims = Settings().JWT_SELF_CONTAINED_CLAIMS
 
     def create_access_token(self, data: Dict[str, Any]) -> str:
         """Cria um token de acesso JWT"""
@@ -25,6 +27,18 @@ class JWTTokenService:
         encoded_jwt = encode(to_encode, self._secret_key, algorithm=self._algorithm)
         return encoded_jwt
 
+    def create_user_access_token(self, user: User) -> str:
+        """Cria o token de acesso de um usuário, com as claims de autorização se habilitadas"""
+        data = {'sub': user.email}
+        if self._self_contained_claims:
+            data.update({
+                'user_id': user.id,
+                'is_admin': user.is_admin,
+                'is_active': user.is_active,
+                'token_version': user.token_version,
+            })
+        return self.create_access_token(data)
+
     def decode_token(self, token: str) -> Dict[str, Any]:
         """Decodifica um token JWT e retorna os dados"""
         try:
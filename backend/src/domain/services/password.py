@@ -1,16 +1,125 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from src.settings import Settings
+
+
+@dataclass(frozen=True)
+class Argon2Parameters:
+    """Parâmetros de custo do Argon2"""
+
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'Argon2Parameters':
+        return cls(
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST,
+            parallelism=settings.ARGON2_PARALLELISM,
+        )
 
 
 class PasswordService:
-    """Implementação do serviço de senha usando bcrypt"""
+    """Implementação do serviço de senha usando Argon2"""
 
-    def __init__(self):
-        self._pwd_context = PasswordHash.recommended()
+    def __init__(self, parameters: Optional[Argon2Parameters] = None):
+        parameters = parameters or Argon2Parameters.from_settings(Settings())
+        self._pwd_context = PasswordHash((
+            Argon2Hasher(
+                time_cost=parameters.time_cost,
+                memory_cost=parameters.memory_cost,
+                parallelism=parameters.parallelism,
+            ),
+        ))
 
     def hash_password(self, password: str) -> str:
-        """Gera hash da senha usando bcrypt"""
+        """Gera hash da senha usando Argon2"""
         return self._pwd_context.hash(password)
 
     def verify_password(self, password: str, hashed: str) -> bool:
         """Verifica se a senha confere com o hash"""
         return self._pwd_context.verify(password, hashed)
+
+    def verify_and_update(self, password: str, hashed: str) -> tuple[bool, Optional[str]]:
+        """Verifica a senha e gera um novo hash se o atual usa outros parâmetros"""
+        return self._pwd_context.verify_and_update(password, hashed)
+
+
+@dataclass(frozen=True)
+class PasswordServiceMetrics:
+    """Métricas do pool de hashing de senhas"""
+
+    max_workers: int
+    in_flight: int
+    queued: int
+
+
+class AsyncPasswordService:
+    """Serviço de senha assíncrono que executa o hashing fora do event loop"""
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_workers: int,
+        password_service: Optional[PasswordService] = None,
+    ):
+        self._executor = executor
+        self._max_workers = max_workers
+        self._password_service = password_service or PasswordService()
+        self._pending = 0
+        self._lock = Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'AsyncPasswordService':
+        """Cria o serviço com o pool configurado em Settings"""
+        max_workers = settings.PASSWORD_HASHER_MAX_WORKERS
+        if settings.PASSWORD_HASHER_EXECUTOR == 'process':
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix='password-hasher'
+            )
+        return cls(executor, max_workers, PasswordService(Argon2Parameters.from_settings(settings)))
+
+    async def hash_password(self, password: str) -> str:
+        """Gera hash da senha em um worker do pool"""
+        return await self._run(self._password_service.hash_password, password)
+
+    async def verify_password(self, password: str, hashed: str) -> bool:
+        """Verifica a senha em um worker do pool"""
+        return await self._run(self._password_service.verify_password, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, Optional[str]]:
+        """Verifica a senha em um worker do pool, retornando um novo hash se necessário"""
+        return await self._run(self._password_service.verify_and_update, password, hashed)
+
+    def metrics(self) -> PasswordServiceMetrics:
+        """Retorna a ocupação atual do pool"""
+        with self._lock:
+            pending = self._pending
+        return PasswordServiceMetrics(
+            max_workers=self._max_workers,
+            in_flight=min(pending, self._max_workers),
+            queued=max(pending - self._max_workers, 0),
+        )
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._pending += 1
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+async_password_service = AsyncPasswordService.from_settings(Settings())
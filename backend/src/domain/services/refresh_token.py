@@ -0,0 +1,35 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from src.domain.entities.refresh_token import RefreshToken
+from src.domain.services.id_generator import new_id
+from src.settings import Settings
+
+
+class RefreshTokenService:
+    """Serviço de emissão de refresh tokens opacos"""
+
+    def __init__(self):
+        self._refresh_token_expires_days = Settings().JWT_REFRESH_TOKEN_EXPIRE_DAYS
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """Gera o hash SHA-256 armazenado no lugar do token"""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def create_refresh_token(
+        self, user_id: str, family_id: Optional[str] = None
+    ) -> tuple[str, RefreshToken]:
+        """Cria um refresh token, retornando o valor em texto e a entidade a ser persistida"""
+        token = secrets.token_urlsafe(32)
+        refresh_token = RefreshToken(
+            token_hash=self.hash_token(token),
+            user_id=user_id,
+            family_id=family_id or new_id(),
+            expires_at=datetime.now(tz=ZoneInfo('UTC'))
+            + timedelta(days=self._refresh_token_expires_days),
+        )
+        return token, refresh_token
@@ -0,0 +1,53 @@
+from threading import Lock
+from typing import Optional
+
+from src.application.ports.cache.principal_cache import PrincipalCache
+from src.domain.entities.user import User
+from src.infrastructure.cache.ttl_store import TTLStore
+from src.settings import Settings
+
+
+class InMemoryPrincipalCache(PrincipalCache):
+    """Cache LRU em memória com expiração por TTL, indexado pelo subject do token"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._users = TTLStore(max_size, ttl_seconds)
+        self._token_versions = TTLStore(max_size, ttl_seconds)
+        self._lock = Lock()
+
+    def get(self, subject: str) -> Optional[User]:
+        with self._lock:
+            user = self._users.get(subject)
+        return user.model_copy() if user is not None else None
+
+    def set(self, subject: str, user: User) -> None:
+        with self._lock:
+            self._users.set(subject, user.model_copy())
+
+    def get_token_version(self, user_id: str) -> Optional[int]:
+        with self._lock:
+            return self._token_versions.get(user_id)
+
+    def set_token_version(self, user_id: str, token_version: int) -> None:
+        with self._lock:
+            self._token_versions.set(user_id, token_version)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._users.discard(lambda _, user: user.id == user_id)
+            self._token_versions.discard(lambda key, _: key == user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._token_versions.clear()
+
+
+principal_cache = InMemoryPrincipalCache(
+    max_size=Settings().PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=Settings().PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def get_principal_cache() -> PrincipalCache:
+    return principal_cache
@@ -0,0 +1,30 @@
+from threading import Lock
+
+from src.infrastructure.cache.ttl_store import TTLStore
+from src.settings import Settings
+
+
+class RecentWriters:
+    """Subjects que escreveram no primário dentro da janela de read-your-writes"""
+
+    def __init__(self, max_size: int, window_seconds: float):
+        self._writers = TTLStore(max_size, window_seconds)
+        self._lock = Lock()
+
+    def record(self, subject: str) -> None:
+        with self._lock:
+            self._writers.set(subject, True)
+
+    def wrote_recently(self, subject: str) -> bool:
+        with self._lock:
+            return self._writers.get(subject) is not None
+
+
+recent_writers = RecentWriters(
+    max_size=Settings().READ_YOUR_WRITES_MAX_SUBJECTS,
+    window_seconds=Settings().READ_YOUR_WRITES_SECONDS,
+)
+
+
+def get_recent_writers() -> RecentWriters:
+    return recent_writers
@@ -0,0 +1,35 @@
+import math
+from threading import Lock
+
+from src.infrastructure.cache.ttl_store import TTLStore
+from src.settings import Settings
+
+
+class TriggerVocabulary:
+    """Cache LRU em memória dos ids do vocabulário de gatilhos, indexado pelo nome"""
+
+    def __init__(self, max_size: int):
+        # Ids are never reassigned, so entries only leave the cache by eviction
+        self._ids = TTLStore(max_size, math.inf)
+        self._lock = Lock()
+
+    def get_many(self, names: set[str]) -> dict[str, int]:
+        with self._lock:
+            ids = {name: self._ids.get(name) for name in names}
+        return {
+            name: trigger_name_id
+            for name, trigger_name_id in ids.items()
+            if trigger_name_id is not None
+        }
+
+    def set_many(self, ids: dict[str, int]) -> None:
+        with self._lock:
+            for name, trigger_name_id in ids.items():
+                self._ids.set(name, trigger_name_id)
+
+
+trigger_vocabulary = TriggerVocabulary(max_size=Settings().TRIGGER_VOCABULARY_CACHE_SIZE)
+
+
+def get_trigger_vocabulary() -> TriggerVocabulary:
+    return trigger_vocabulary
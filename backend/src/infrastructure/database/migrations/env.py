@@ -1,6 +1,7 @@
 from logging.config import fileConfig
 
 from src.infrastructure.database.orm import table_registry
+from src.infrastructure.database.partitions import is_partition_name
 from sqlalchemy.ext.asyncio import async_engine_from_config
 from src.settings import Settings
 from sqlalchemy import pool
@@ -30,6 +31,20 @@ target_metadata = table_registry.metadata
 # ... etc.
 
 
+def include_name(name, type_, parent_names):
+    # Monthly partitions are managed by the partition job, not declared in the models
+    if type_ == 'table':
+        return not is_partition_name(name)
+    return True
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Postgres mirrors a foreign key to a partitioned table onto each of its partitions
+    if type_ == 'foreign_key_constraint' and reflected:
+        return not is_partition_name(object.referred_table.name)
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -47,6 +62,8 @@ def run_migrations_offline() -> None:
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_name=include_name,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -54,7 +71,12 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 def do_run_migrations(connection): 
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
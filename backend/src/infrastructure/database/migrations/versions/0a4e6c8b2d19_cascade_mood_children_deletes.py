@@ -0,0 +1,44 @@
+"""cascade mood children deletes
+
+Revision ID: 0a4e6c8b2d19
+Revises: f5b8d2c7a914
+Create Date: 2025-10-02 16:27:51.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a4e6c8b2d19'
+down_revision: Union[str, Sequence[str], None] = 'f5b8d2c7a914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHILD_TABLES = ('associated_emotions', 'emotional_triggers')
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table in CHILD_TABLES:
+        name = f'{table}_mood_id_mood_created_at_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name,
+            table,
+            'moods',
+            ['mood_id', 'mood_created_at'],
+            ['id', 'created_at'],
+            ondelete=ondelete,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_keys(None)
@@ -0,0 +1,46 @@
+"""add account deletions
+
+Revision ID: 3c9e1b7d5a62
+Revises: 0a4e6c8b2d19
+Create Date: 2025-10-06 09:41:17.502318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1b7d5a62'
+down_revision: Union[str, Sequence[str], None] = '0a4e6c8b2d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('account_deletions',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('requested_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('moods_purged', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(
+        'ix_account_deletions_pending',
+        'account_deletions',
+        ['requested_at'],
+        unique=False,
+        postgresql_where=sa.text('completed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_account_deletions_pending',
+        table_name='account_deletions',
+        postgresql_where=sa.text('completed_at IS NULL'),
+    )
+    op.drop_table('account_deletions')
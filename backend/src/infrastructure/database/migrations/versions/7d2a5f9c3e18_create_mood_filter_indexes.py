@@ -0,0 +1,110 @@
+"""create mood filter indexes
+
+Revision ID: 7d2a5f9c3e18
+Revises: 3c9e1b7d5a62
+Create Date: 2025-10-09 16:27:51.904733
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a5f9c3e18'
+down_revision: Union[str, Sequence[str], None] = '3c9e1b7d5a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres truncates identifiers to this many bytes
+MAX_IDENTIFIER_LENGTH = 63
+
+NEW_INDEXES = (
+    ('ix_moods_user_id_created_at_id_event', 'moods', ('user_id', 'created_at', 'id'),
+     "registry_type = 'event'"),
+    # The scale only rides along, so the index still yields the listing's order
+    ('ix_moods_user_id_created_at_id_visual_scale', 'moods',
+     ('user_id', 'created_at DESC', 'id DESC'), None, ('visual_scale',)),
+    ('ix_associated_emotions_mood_id_mood_created_at_name_intensity', 'associated_emotions',
+     ('mood_id', 'mood_created_at', 'name', 'intensity'), None),
+    ('ix_emotional_triggers_mood_id_mood_created_at_trigger_name_id', 'emotional_triggers',
+     ('mood_id', 'mood_created_at', 'trigger_name_id'), None),
+)
+# The covering indexes above start with these columns, so they replace them
+REPLACED_INDEXES = (
+    ('ix_associated_emotions_mood_id_mood_created_at', 'associated_emotions',
+     ('mood_id', 'mood_created_at'), None),
+    ('ix_emotional_triggers_mood_id_mood_created_at', 'emotional_triggers',
+     ('mood_id', 'mood_created_at'), None),
+)
+
+
+def _partition_index_name(name: str, table: str, partition: str) -> str:
+    # Postgres would name it after the columns, which clashes with the older indexes over
+    # the same leading columns, so the partition takes the table's place in the parent name
+    return name.replace(f'ix_{table}_', f'ix_{partition}_', 1)[:MAX_IDENTIFIER_LENGTH]
+
+
+def _create_partitioned_index(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    where: Optional[str],
+    include: Sequence[str] = (),
+) -> None:
+    # A partitioned index cannot be built concurrently, so it starts empty on the parent alone
+    # and each partition builds its own without blocking writes, then attaches to it
+    included = f' INCLUDE ({", ".join(include)})' if include else ''
+    predicate = f' WHERE {where}' if where else ''
+    op.execute(
+        f'CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} '
+        f'({", ".join(columns)}){included}{predicate}'
+    )
+    partitions = op.get_bind().scalars(
+        sa.text(
+            'SELECT inhrelid::regclass::text FROM pg_inherits '
+            'WHERE inhparent = CAST(:table AS regclass) ORDER BY 1'
+        ),
+        {'table': table},
+    ).all()
+
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            partition_index = _partition_index_name(name, table, partition)
+            # A concurrent build that failed halfway leaves an INVALID index, which IF NOT
+            # EXISTS would keep
+            invalid = op.get_bind().scalar(
+                sa.text(
+                    'SELECT NOT indisvalid FROM pg_index '
+                    'WHERE indexrelid = to_regclass(:name)'
+                ),
+                {'name': partition_index},
+            )
+            if invalid:
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {partition_index}')
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} '
+                f'ON {partition} ({", ".join(columns)}){included}{predicate}'
+            )
+    for partition in partitions:
+        op.execute(
+            f'ALTER INDEX {name} ATTACH PARTITION {_partition_index_name(name, table, partition)}'
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index in NEW_INDEXES:
+        _create_partitioned_index(*index)
+    # Dropping a partitioned index drops the partition indexes attached to it
+    for name, *_ in REPLACED_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index in REPLACED_INDEXES:
+        _create_partitioned_index(*index)
+    for name, *_ in NEW_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
@@ -0,0 +1,36 @@
+"""add inline mood children
+
+Revision ID: a81c5e2f9d37
+Revises: f3a9d61c0b42
+Create Date: 2025-09-16 18:22:40.512938
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81c5e2f9d37'
+down_revision: Union[str, Sequence[str], None] = 'f3a9d61c0b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable without a default, so adding them does not rewrite the table; existing rows are
+    # filled in batches by `python -m src.interfaces.cli.backfill_inline_moods`
+    op.add_column(
+        'moods',
+        sa.Column('inline_emotions', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.add_column('moods', sa.Column('inline_triggers', postgresql.ARRAY(sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('moods', 'inline_triggers')
+    op.drop_column('moods', 'inline_emotions')
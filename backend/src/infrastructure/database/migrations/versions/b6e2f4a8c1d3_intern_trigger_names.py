@@ -0,0 +1,74 @@
+"""intern trigger names
+
+Revision ID: b6e2f4a8c1d3
+Revises: a81c5e2f9d37
+Create Date: 2025-09-19 10:04:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2f4a8c1d3'
+down_revision: Union[str, Sequence[str], None] = 'a81c5e2f9d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('trigger_names',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.add_column('emotional_triggers', sa.Column('trigger_name_id', sa.Integer(), nullable=True))
+
+    # Backfill: one row per distinct name, then point every trigger row at its name
+    op.execute(
+        'INSERT INTO trigger_names (name) '
+        'SELECT DISTINCT name FROM emotional_triggers ORDER BY name'
+    )
+    op.execute(
+        'UPDATE emotional_triggers SET trigger_name_id = trigger_names.id '
+        'FROM trigger_names WHERE trigger_names.name = emotional_triggers.name'
+    )
+
+    op.alter_column('emotional_triggers', 'trigger_name_id', nullable=False)
+    op.create_foreign_key(
+        'emotional_triggers_trigger_name_id_fkey',
+        'emotional_triggers',
+        'trigger_names',
+        ['trigger_name_id'],
+        ['id'],
+    )
+    op.create_index(
+        op.f('ix_emotional_triggers_trigger_name_id'),
+        'emotional_triggers',
+        ['trigger_name_id'],
+        unique=False,
+    )
+    op.drop_column('emotional_triggers', 'name')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('emotional_triggers', sa.Column('name', sa.String(), nullable=True))
+    op.execute(
+        'UPDATE emotional_triggers SET name = trigger_names.name '
+        'FROM trigger_names WHERE trigger_names.id = emotional_triggers.trigger_name_id'
+    )
+    op.alter_column('emotional_triggers', 'name', nullable=False)
+
+    op.drop_index(
+        op.f('ix_emotional_triggers_trigger_name_id'), table_name='emotional_triggers'
+    )
+    op.drop_constraint(
+        'emotional_triggers_trigger_name_id_fkey', 'emotional_triggers', type_='foreignkey'
+    )
+    op.drop_column('emotional_triggers', 'trigger_name_id')
+    op.drop_table('trigger_names')
@@ -0,0 +1,114 @@
+"""compact column types
+
+Revision ID: d1f7a3e9b5c2
+Revises: b6e2f4a8c1d3
+Create Date: 2025-09-23 09:41:27.550913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f7a3e9b5c2'
+down_revision: Union[str, Sequence[str], None] = 'b6e2f4a8c1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEYS = (
+    ('moods_user_id_fkey', 'moods', 'users', 'user_id'),
+    ('associated_emotions_mood_id_fkey', 'associated_emotions', 'moods', 'mood_id'),
+    ('emotional_triggers_mood_id_fkey', 'emotional_triggers', 'moods', 'mood_id'),
+    ('refresh_tokens_user_id_fkey', 'refresh_tokens', 'users', 'user_id'),
+)
+UUID_COLUMNS = (
+    ('users', 'id'),
+    ('moods', 'id'),
+    ('moods', 'user_id'),
+    ('associated_emotions', 'mood_id'),
+    ('emotional_triggers', 'mood_id'),
+    ('refresh_tokens', 'user_id'),
+    ('refresh_tokens', 'family_id'),
+)
+SMALLINT_COLUMNS = (
+    ('moods', 'visual_scale'),
+    ('associated_emotions', 'intensity'),
+)
+registry_type = postgresql.ENUM('daily', 'event', name='registry_type')
+emotion_name = postgresql.ENUM(
+    'anger', 'fear', 'joy', 'sadness', 'surprise', name='emotion_name'
+)
+ENUM_COLUMNS = (
+    ('moods', 'registry_type', registry_type),
+    ('associated_emotions', 'name', emotion_name),
+)
+
+
+def _drop_foreign_keys() -> None:
+    for name, table, _, _ in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+
+
+def _create_foreign_keys() -> None:
+    for name, table, referred_table, column in FOREIGN_KEYS:
+        op.create_foreign_key(name, table, referred_table, [column], ['id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The referencing and referenced columns must change type together
+    _drop_foreign_keys()
+    for table, column in UUID_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.String(),
+            type_=sa.Uuid(),
+            postgresql_using=f'{column}::uuid',
+        )
+    _create_foreign_keys()
+
+    bind = op.get_bind()
+    for table, column, enum in ENUM_COLUMNS:
+        enum.create(bind)
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.String(),
+            type_=enum,
+            postgresql_using=f'{column}::{enum.name}',
+        )
+
+    for table, column in SMALLINT_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.Integer(), type_=sa.SmallInteger())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in SMALLINT_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.SmallInteger(), type_=sa.Integer())
+
+    bind = op.get_bind()
+    for table, column, enum in ENUM_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=enum,
+            type_=sa.String(),
+            postgresql_using=f'{column}::text',
+        )
+        enum.drop(bind)
+
+    _drop_foreign_keys()
+    for table, column in UUID_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.Uuid(),
+            type_=sa.String(),
+            postgresql_using=f'{column}::text',
+        )
+    _create_foreign_keys()
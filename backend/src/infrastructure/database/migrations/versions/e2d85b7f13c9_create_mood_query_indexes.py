@@ -0,0 +1,84 @@
+"""create mood query indexes
+
+Revision ID: e2d85b7f13c9
+Revises: c4a7e91d2b60
+Create Date: 2025-09-13 11:05:27.640912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d85b7f13c9'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e91d2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_invalid_index(name: str) -> None:
+    # A concurrent build that failed halfway leaves an INVALID index, which IF NOT EXISTS keeps
+    invalid = op.get_bind().scalar(
+        sa.text('SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'),
+        {'name': name},
+    )
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        _drop_invalid_index('ix_moods_user_id_created_at_id')
+        op.create_index(
+            'ix_moods_user_id_created_at_id',
+            'moods',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _drop_invalid_index(op.f('ix_associated_emotions_mood_id'))
+        op.create_index(
+            op.f('ix_associated_emotions_mood_id'),
+            'associated_emotions',
+            ['mood_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _drop_invalid_index(op.f('ix_emotional_triggers_mood_id'))
+        op.create_index(
+            op.f('ix_emotional_triggers_mood_id'),
+            'emotional_triggers',
+            ['mood_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_emotional_triggers_mood_id'),
+            table_name='emotional_triggers',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f('ix_associated_emotions_mood_id'),
+            table_name='associated_emotions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_moods_user_id_created_at_id',
+            table_name='moods',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
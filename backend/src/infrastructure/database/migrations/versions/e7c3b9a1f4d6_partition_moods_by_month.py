@@ -0,0 +1,238 @@
+"""partition moods by month
+
+Revision ID: e7c3b9a1f4d6
+Revises: d1f7a3e9b5c2
+Create Date: 2025-09-26 14:18:03.271845
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3b9a1f4d6'
+down_revision: Union[str, Sequence[str], None] = 'd1f7a3e9b5c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('moods', 'associated_emotions', 'emotional_triggers')
+CHILD_TABLES = ('associated_emotions', 'emotional_triggers')
+# Monthly partitions created past the current month; the partition job keeps extending them
+MONTHS_AHEAD = 3
+
+registry_type = postgresql.ENUM(name='registry_type', create_type=False)
+emotion_name = postgresql.ENUM(name='emotion_name', create_type=False)
+
+MOOD_COLUMNS = (
+    'id, user_id, visual_scale, registry_type, description, created_at, updated_at, '
+    'inline_emotions, inline_triggers'
+)
+CHILD_COLUMNS = {
+    'associated_emotions': 'id, mood_id, name, intensity, created_at, updated_at',
+    'emotional_triggers': 'id, mood_id, trigger_name_id, created_at, updated_at',
+}
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    ]
+
+
+def _id_column(table: str) -> sa.Column:
+    # Keeps the existing sequence, so child ids carry on from where they were
+    return sa.Column(
+        'id', sa.Integer(), server_default=sa.text(f"nextval('{table}_id_seq')"), nullable=False
+    )
+
+
+def _mood_columns() -> list[sa.Column]:
+    return [
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('visual_scale', sa.SmallInteger(), nullable=False),
+        sa.Column('description', sa.String(), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        *_timestamps(),
+        sa.Column('registry_type', registry_type, nullable=False),
+        sa.Column('inline_emotions', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('inline_triggers', postgresql.ARRAY(sa.Text()), nullable=True),
+    ]
+
+
+def _child_columns(table: str) -> list[sa.Column]:
+    if table == 'associated_emotions':
+        return [
+            sa.Column('name', emotion_name, nullable=False),
+            sa.Column('intensity', sa.SmallInteger(), nullable=False),
+        ]
+    return [sa.Column('trigger_name_id', sa.Integer(), nullable=False)]
+
+
+def _set_aside(tables: Sequence[str], suffix: str) -> None:
+    # Renames the tables and frees the index names the new definitions reuse
+    for table in (*CHILD_TABLES, 'moods'):
+        op.execute(f'ALTER SEQUENCE IF EXISTS {table}_id_seq OWNED BY NONE')
+        op.execute(f'ALTER TABLE {table} RENAME TO {table}_{suffix}')
+        op.execute(f'ALTER TABLE {table}_{suffix} DROP CONSTRAINT {table}_pkey CASCADE')
+    for index in tables:
+        op.execute(f'DROP INDEX {index}')
+
+
+def _attach_sequences() -> None:
+    for table in CHILD_TABLES:
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _set_aside(
+        (
+            'ix_moods_user_id_created_at_id',
+            'ix_associated_emotions_mood_id',
+            'ix_emotional_triggers_mood_id',
+            'ix_emotional_triggers_trigger_name_id',
+        ),
+        'unpartitioned',
+    )
+
+    op.create_table(
+        'moods',
+        *_mood_columns(),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='moods_user_id_fkey'),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index(
+        'ix_moods_user_id_created_at_id', 'moods', ['user_id', 'created_at', 'id'], unique=False
+    )
+    for table in CHILD_TABLES:
+        op.create_table(
+            table,
+            _id_column(table),
+            sa.Column('mood_id', sa.Uuid(), nullable=False),
+            sa.Column('mood_created_at', sa.DateTime(), nullable=False),
+            *_child_columns(table),
+            *_timestamps(),
+            sa.ForeignKeyConstraint(
+                ['mood_id', 'mood_created_at'], ['moods.id', 'moods.created_at']
+            ),
+            sa.PrimaryKeyConstraint('id', 'mood_created_at'),
+            postgresql_partition_by='RANGE (mood_created_at)',
+        )
+        op.create_index(
+            f'ix_{table}_mood_id_mood_created_at',
+            table,
+            ['mood_id', 'mood_created_at'],
+            unique=False,
+        )
+    op.create_foreign_key(
+        'emotional_triggers_trigger_name_id_fkey',
+        'emotional_triggers',
+        'trigger_names',
+        ['trigger_name_id'],
+        ['id'],
+    )
+    op.create_index(
+        op.f('ix_emotional_triggers_trigger_name_id'),
+        'emotional_triggers',
+        ['trigger_name_id'],
+        unique=False,
+    )
+    _attach_sequences()
+
+    # One partition per month from the oldest mood to a few months ahead, plus a default
+    # partition for anything outside them
+    oldest = op.get_bind().scalar(sa.text('SELECT min(created_at) FROM moods_unpartitioned'))
+    current = date.today().replace(day=1)
+    month = min(oldest.date(), current).replace(day=1) if oldest else current
+    while month <= _add_months(current, MONTHS_AHEAD):
+        for table in TABLES:
+            op.execute(
+                f'CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} '
+                f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+            )
+        month = _add_months(month, 1)
+    for table in TABLES:
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(
+        f'INSERT INTO moods ({MOOD_COLUMNS}) SELECT {MOOD_COLUMNS} FROM moods_unpartitioned'
+    )
+    for table in CHILD_TABLES:
+        columns = CHILD_COLUMNS[table]
+        selected = ', '.join(f'child.{column}' for column in columns.split(', '))
+        op.execute(
+            f'INSERT INTO {table} ({columns}, mood_created_at) '
+            f'SELECT {selected}, moods.created_at FROM {table}_unpartitioned child '
+            'JOIN moods_unpartitioned moods ON moods.id = child.mood_id'
+        )
+
+    for table in (*CHILD_TABLES, 'moods'):
+        op.drop_table(f'{table}_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_aside(
+        (
+            'ix_moods_user_id_created_at_id',
+            'ix_associated_emotions_mood_id_mood_created_at',
+            'ix_emotional_triggers_mood_id_mood_created_at',
+            'ix_emotional_triggers_trigger_name_id',
+        ),
+        'partitioned',
+    )
+
+    op.create_table(
+        'moods',
+        *_mood_columns(),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='moods_user_id_fkey'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_moods_user_id_created_at_id', 'moods', ['user_id', 'created_at', 'id'], unique=False
+    )
+    for table in CHILD_TABLES:
+        op.create_table(
+            table,
+            _id_column(table),
+            sa.Column('mood_id', sa.Uuid(), nullable=False),
+            *_child_columns(table),
+            *_timestamps(),
+            sa.ForeignKeyConstraint(['mood_id'], ['moods.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(op.f(f'ix_{table}_mood_id'), table, ['mood_id'], unique=False)
+    op.create_foreign_key(
+        'emotional_triggers_trigger_name_id_fkey',
+        'emotional_triggers',
+        'trigger_names',
+        ['trigger_name_id'],
+        ['id'],
+    )
+    op.create_index(
+        op.f('ix_emotional_triggers_trigger_name_id'),
+        'emotional_triggers',
+        ['trigger_name_id'],
+        unique=False,
+    )
+    _attach_sequences()
+
+    op.execute(f'INSERT INTO moods ({MOOD_COLUMNS}) SELECT {MOOD_COLUMNS} FROM moods_partitioned')
+    for table in CHILD_TABLES:
+        columns = CHILD_COLUMNS[table]
+        op.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_partitioned')
+
+    # Dropping the parents drops every partition with them
+    for table in (*CHILD_TABLES, 'moods'):
+        op.drop_table(f'{table}_partitioned')
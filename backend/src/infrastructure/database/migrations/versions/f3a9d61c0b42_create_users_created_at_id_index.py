@@ -0,0 +1,54 @@
+"""create users created_at id index
+
+Revision ID: f3a9d61c0b42
+Revises: e2d85b7f13c9
+Create Date: 2025-09-14 09:41:03.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9d61c0b42'
+down_revision: Union[str, Sequence[str], None] = 'e2d85b7f13c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_invalid_index(name: str) -> None:
+    # A concurrent build that failed halfway leaves an INVALID index, which IF NOT EXISTS keeps
+    invalid = op.get_bind().scalar(
+        sa.text('SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'),
+        {'name': name},
+    )
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        _drop_invalid_index('ix_users_created_at_id')
+        op.create_index(
+            'ix_users_created_at_id',
+            'users',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_created_at_id',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
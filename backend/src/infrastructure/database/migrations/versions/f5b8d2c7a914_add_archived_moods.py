@@ -0,0 +1,53 @@
+"""add archived moods
+
+Revision ID: f5b8d2c7a914
+Revises: e7c3b9a1f4d6
+Create Date: 2025-09-30 11:02:45.813370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b8d2c7a914'
+down_revision: Union[str, Sequence[str], None] = 'e7c3b9a1f4d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archived_moods',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('visual_scale', sa.SmallInteger(), nullable=False),
+    sa.Column(
+        'registry_type',
+        postgresql.ENUM(name='registry_type', create_type=False),
+        nullable=False,
+    ),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('emotions', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('triggers', postgresql.ARRAY(sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_moods_user_id_created_at_id',
+        'archived_moods',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_archived_moods_user_id_created_at_id', table_name='archived_moods')
+    op.drop_table('archived_moods')
@@ -1,19 +1,75 @@
+import uuid
 from datetime import datetime
+from enum import Enum as PyEnum
+from typing import Any, Optional
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    SmallInteger,
+    Text,
+    TypeDecorator,
+    Uuid,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
 
-table_registry = registry()
+from src.domain.entities.associated_emotion import AssociatedEmotionEnum
+from src.domain.entities.mood import RegistryType
+from src.infrastructure.database.partitions import default_partition_ddl
+
+
+class UUIDString(TypeDecorator):
+    """Coluna uuid nativa exposta como str, no formato em que as entidades guardam os ids"""
+
+    impl = Uuid
+    cache_ok = True
+
+    @staticmethod
+    def process_bind_param(value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            # No row can have this id, and NULL compares equal to none of them
+            return None
+
+    @staticmethod
+    def process_result_value(value, dialect):
+        return None if value is None else str(value)
+
+
+def _pg_enum(enum_class: type[PyEnum], name: str) -> Enum:
+    # Stores the lowercase values the API and the domain use, not the member names
+    return Enum(
+        enum_class, name=name, values_callable=lambda members: [member.value for member in members]
+    )
+
+
+table_registry = registry(
+    type_annotation_map={
+        RegistryType: _pg_enum(RegistryType, 'registry_type'),
+        AssociatedEmotionEnum: _pg_enum(AssociatedEmotionEnum, 'emotion_name'),
+    }
+)
 
 
 @table_registry.mapped_as_dataclass
 class UserModel:
     __tablename__ = 'users'
+    __table_args__ = (Index('ix_users_created_at_id', 'created_at', 'id'),)
 
     username: Mapped[str] = mapped_column(unique=True)
     password: Mapped[str]
     email: Mapped[str] = mapped_column(unique=True)
-    id: Mapped[str] = mapped_column(primary_key=True)
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True)
     first_name: Mapped[str] = mapped_column(default='')
     last_name: Mapped[str] = mapped_column(default='')
     created_at: Mapped[datetime] = mapped_column(default=func.now(), server_default=func.now())
@@ -22,61 +78,207 @@ class UserModel:
     )
     is_admin: Mapped[bool] = mapped_column(default=False)
     is_active: Mapped[bool] = mapped_column(default=True)
+    token_version: Mapped[int] = mapped_column(default=0, server_default='0')
 
+    # Deleting a user never loads their moods: the account purge removes them in batches first,
+    # and the foreign key refuses a user deleted any other way while moods remain
     moods: Mapped[list['MoodModel']] = relationship(
         init=False,
-        cascade='all, delete-orphan',
-        lazy='selectin',
+        cascade='save-update, merge',
+        passive_deletes='all',
+        lazy='raise',
     )
 
 
 @table_registry.mapped_as_dataclass
 class MoodModel:
     __tablename__ = 'moods'
+    __table_args__ = (
+        Index('ix_moods_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        # Event entries are the minority, so their filtered listing gets its own small index
+        Index(
+            'ix_moods_user_id_created_at_id_event',
+            'user_id',
+            'created_at',
+            'id',
+            postgresql_where=text("registry_type = 'event'"),
+        ),
+        # Scale filters walk the listing's order off this index and stop at the page limit;
+        # a leading scale range would leave every match to be sorted
+        Index(
+            'ix_moods_user_id_created_at_id_visual_scale',
+            'user_id',
+            text('created_at DESC'),
+            text('id DESC'),
+            postgresql_include=['visual_scale'],
+        ),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
 
-    user_id: Mapped[str] = mapped_column(ForeignKey('users.id'))
-    visual_scale: Mapped[int]
-    registry_type: Mapped[str]
+    user_id: Mapped[str] = mapped_column(UUIDString, ForeignKey('users.id'))
+    visual_scale: Mapped[int] = mapped_column(SmallInteger)
+    registry_type: Mapped[RegistryType]
     description: Mapped[str]
-    id: Mapped[str] = mapped_column(primary_key=True)
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True)
 
+    # The database removes the children of a deleted mood, so the ORM does not load them first
     associated_emotions: Mapped[list['AssociatedEmotionsModel']] = relationship(
         cascade='all, delete-orphan',
-        lazy='selectin',
+        passive_deletes=True,
+        lazy='raise',
+        order_by='AssociatedEmotionsModel.id',
     )
     triggers: Mapped[list['EmotionalTriggerModel']] = relationship(
         cascade='all, delete-orphan',
-        lazy='selectin',
+        passive_deletes=True,
+        lazy='raise',
+        order_by='EmotionalTriggerModel.id',
     )
 
-    created_at: Mapped[datetime] = mapped_column(default=func.now(), server_default=func.now())
+    # Partition key, so it is part of the primary key
+    created_at: Mapped[datetime] = mapped_column(
+        primary_key=True, default=func.now(), server_default=func.now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
         default=func.now(), server_default=func.now(), onupdate=func.now()
     )
 
+    # Inline copy of the children used by the inline storage layout, NULL until backfilled
+    inline_emotions: Mapped[Optional[list[dict[str, Any]]]] = mapped_column(
+        JSONB(none_as_null=True), default=None, deferred=True
+    )
+    inline_triggers: Mapped[Optional[list[str]]] = mapped_column(
+        ARRAY(Text), default=None, deferred=True
+    )
+
 
 @table_registry.mapped_as_dataclass
 class AssociatedEmotionsModel:
     __tablename__ = 'associated_emotions'
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['mood_id', 'mood_created_at'],
+            ['moods.id', 'moods.created_at'],
+            ondelete='CASCADE',
+        ),
+        # Covers the emotion filters, so checking a mood's emotions never reads the heap
+        Index(
+            'ix_associated_emotions_mood_id_mood_created_at_name_intensity',
+            'mood_id',
+            'mood_created_at',
+            'name',
+            'intensity',
+        ),
+        {'postgresql_partition_by': 'RANGE (mood_created_at)'},
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True, autoincrement=True)
-    mood_id: Mapped[str] = mapped_column(ForeignKey('moods.id'), nullable=False)
-    name: Mapped[str]
-    intensity: Mapped[int]
+    mood_id: Mapped[str] = mapped_column(UUIDString, nullable=False)
+    # Copy of moods.created_at, so each row lives in the same month partition as its mood
+    mood_created_at: Mapped[datetime] = mapped_column(init=False, primary_key=True)
+    name: Mapped[AssociatedEmotionEnum]
+    intensity: Mapped[int] = mapped_column(SmallInteger)
     created_at: Mapped[datetime] = mapped_column(default=func.now(), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         default=func.now(), server_default=func.now(), onupdate=func.now()
     )
 
 
+@table_registry.mapped_as_dataclass
+class TriggerNameModel:
+    __tablename__ = 'trigger_names'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(unique=True)
+
+
 @table_registry.mapped_as_dataclass
 class EmotionalTriggerModel:
     __tablename__ = 'emotional_triggers'
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['mood_id', 'mood_created_at'],
+            ['moods.id', 'moods.created_at'],
+            ondelete='CASCADE',
+        ),
+        Index(
+            'ix_emotional_triggers_mood_id_mood_created_at_trigger_name_id',
+            'mood_id',
+            'mood_created_at',
+            'trigger_name_id',
+        ),
+        {'postgresql_partition_by': 'RANGE (mood_created_at)'},
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True, autoincrement=True)
-    mood_id: Mapped[str] = mapped_column(ForeignKey('moods.id'))
-    name: Mapped[str]
+    mood_id: Mapped[str] = mapped_column(UUIDString)
+    mood_created_at: Mapped[datetime] = mapped_column(init=False, primary_key=True)
+    # Interned in trigger_names, so each row carries an integer instead of the free text
+    trigger_name_id: Mapped[int] = mapped_column(
+        ForeignKey('trigger_names.id'), index=True, default=None
+    )
+    trigger_name: Mapped[TriggerNameModel] = relationship(init=False, lazy='raise')
     created_at: Mapped[datetime] = mapped_column(default=func.now(), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         default=func.now(), server_default=func.now(), onupdate=func.now()
     )
+
+
+@table_registry.mapped_as_dataclass
+class ArchivedMoodModel:
+    __tablename__ = 'archived_moods'
+    __table_args__ = (
+        Index('ix_archived_moods_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
+    # Moods moved out of the hot tables, one row each with the children inlined
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True)
+    user_id: Mapped[str] = mapped_column(UUIDString, ForeignKey('users.id'))
+    visual_scale: Mapped[int] = mapped_column(SmallInteger)
+    registry_type: Mapped[RegistryType]
+    description: Mapped[str]
+    emotions: Mapped[list[dict[str, Any]]] = mapped_column(JSONB)
+    triggers: Mapped[list[str]] = mapped_column(ARRAY(Text))
+    created_at: Mapped[datetime]
+    updated_at: Mapped[datetime]
+    archived_at: Mapped[datetime] = mapped_column(default=func.now(), server_default=func.now())
+
+
+@table_registry.mapped_as_dataclass
+class RefreshTokenModel:
+    __tablename__ = 'refresh_tokens'
+
+    token_hash: Mapped[str] = mapped_column(primary_key=True)
+    user_id: Mapped[str] = mapped_column(UUIDString, ForeignKey('users.id'), index=True)
+    family_id: Mapped[str] = mapped_column(UUIDString, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    revoked: Mapped[bool] = mapped_column(default=False)
+    created_at: Mapped[datetime] = mapped_column(default=func.now(), server_default=func.now())
+
+
+@table_registry.mapped_as_dataclass
+class AccountDeletionModel:
+    __tablename__ = 'account_deletions'
+    __table_args__ = (
+        Index(
+            'ix_account_deletions_pending',
+            'requested_at',
+            postgresql_where=text('completed_at IS NULL'),
+        ),
+    )
+
+    # No foreign key, so the record of a purge outlives the user it removed
+    user_id: Mapped[str] = mapped_column(UUIDString, primary_key=True)
+    requested_at: Mapped[datetime] = mapped_column(default=func.now(), server_default=func.now())
+    moods_purged: Mapped[int] = mapped_column(default=0, server_default='0')
+    completed_at: Mapped[Optional[datetime]] = mapped_column(default=None)
+
+
+# Without a partition an insert has nowhere to go; create_all gets the default one, and the
+# migrations and the partition job add the monthly ones
+for partitioned_model in (MoodModel, AssociatedEmotionsModel, EmotionalTriggerModel):
+    event.listen(
+        partitioned_model.__table__,
+        'after_create',
+        default_partition_ddl(partitioned_model.__table__),
+    )
@@ -0,0 +1,70 @@
+import re
+from datetime import date
+
+from sqlalchemy import DDL, Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Moods and their children are co-partitioned by the month the mood was created
+MOOD_PARTITIONED_TABLES = ('moods', 'associated_emotions', 'emotional_triggers')
+_PARTITION_NAME = re.compile(
+    rf'^(?:{"|".join(MOOD_PARTITIONED_TABLES)})_(?:default|p\d{{4}}_\d{{2}})$'
+)
+# Arbitrary application-wide key, so concurrent runs of the job create each partition once
+_MAINTENANCE_LOCK_KEY = 0x6D6F6F64
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f'{table}_p{month:%Y_%m}'
+
+
+def is_partition_name(name: str) -> bool:
+    """Indica se a tabela é uma partição dos humores, que não aparece nos modelos do ORM"""
+    return _PARTITION_NAME.match(name) is not None
+
+
+def default_partition_ddl(table: Table) -> DDL:
+    """DDL da partição padrão, que recebe as linhas fora de qualquer partição mensal"""
+    return DDL(f'CREATE TABLE IF NOT EXISTS {table.name}_default PARTITION OF {table.name} DEFAULT')
+
+
+def monthly_partition_ddl(table: str, month: date) -> str:
+    return (
+        f'CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} '
+        f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+    )
+
+
+async def create_mood_partitions(
+    connection: AsyncConnection, today: date, months_ahead: int
+) -> list[str]:
+    """Cria as partições mensais do mês atual até months_ahead meses à frente"""
+    await connection.execute(
+        text('SELECT pg_advisory_xact_lock(:key)'), {'key': _MAINTENANCE_LOCK_KEY}
+    )
+    existing = set(
+        await connection.scalars(
+            text(
+                'SELECT child.relname FROM pg_inherits '
+                'JOIN pg_class child ON child.oid = pg_inherits.inhrelid'
+            )
+        )
+    )
+
+    created = []
+    current = month_start(today)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        for table in MOOD_PARTITIONED_TABLES:
+            if partition_name(table, month) not in existing:
+                await connection.execute(text(monthly_partition_ddl(table, month)))
+                created.append(partition_name(table, month))
+    return created
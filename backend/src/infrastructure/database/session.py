@@ -1,10 +1,178 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.settings import Settings
 
-engine = create_async_engine(Settings().DATABASE_URL)
+
+@dataclass(frozen=True)
+class PoolMetrics:
+    """Ocupação do pool de conexões, tempo gasto esperando por uma e abrindo novas"""
+
+    size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    max_wait_seconds: float
+    connects: int
+    connect_seconds_total: float
+
+
+# Connect time spent inside the checkout being timed, or None outside of one
+_checkout_connect_seconds: ContextVar[Optional[float]] = ContextVar(
+    'checkout_connect_seconds', default=None
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Pool que acumula quanto tempo cada checkout esperou por uma conexão e quanto levou abrindo"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_seconds_total = 0.0
+        self._max_wait_seconds = 0.0
+        self._connects = 0
+        self._connect_seconds_total = 0.0
+
+    def _do_get(self):
+        # QueuePool retries by calling _do_get again, which belongs to the outer checkout
+        if _checkout_connect_seconds.get() is not None:
+            return super()._do_get()
+
+        start = time.perf_counter()
+        token = _checkout_connect_seconds.set(0.0)
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            # Opening a new connection is not waiting for one, so it is reported apart
+            waited = time.perf_counter() - start - _checkout_connect_seconds.get()
+            _checkout_connect_seconds.reset(token)
+            with self._metrics_lock:
+                self._checkouts += 1
+                self._timeouts += timed_out
+                self._wait_seconds_total += waited
+                self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            connected = time.perf_counter() - start
+            with self._metrics_lock:
+                self._connects += 1
+                self._connect_seconds_total += connected
+            checkout_connect_seconds = _checkout_connect_seconds.get()
+            if checkout_connect_seconds is not None:
+                _checkout_connect_seconds.set(checkout_connect_seconds + connected)
+
+    def metrics(self) -> PoolMetrics:
+        with self._metrics_lock:
+            return PoolMetrics(
+                size=self.size(),
+                max_overflow=self._max_overflow,
+                checked_out=self.checkedout(),
+                idle=self.checkedin(),
+                overflow=max(self.overflow(), 0),
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                wait_seconds_total=self._wait_seconds_total,
+                max_wait_seconds=self._max_wait_seconds,
+                connects=self._connects,
+                connect_seconds_total=self._connect_seconds_total,
+            )
+
+
+def create_engine(settings: Settings, url: Optional[str] = None) -> AsyncEngine:
+    """Cria o engine com o pool e as opções de conexão configurados em Settings"""
+    connect_args = {
+        'prepare_threshold': (
+            settings.DATABASE_PREPARE_THRESHOLD if settings.DATABASE_PREPARED_STATEMENTS else None
+        ),
+    }
+    if settings.DATABASE_STATEMENT_TIMEOUT_MS:
+        connect_args['options'] = f'-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}'
+
+    return create_async_engine(
+        url or settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+class Database:
+    """Engines do primário e da réplica, criados e descartados pelo lifespan da aplicação"""
+
+    def __init__(self):
+        self._engine: Optional[AsyncEngine] = None
+        self._replica_engine: Optional[AsyncEngine] = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            raise RuntimeError('Database is not connected')
+        return self._engine
+
+    @property
+    def replica_engine(self) -> AsyncEngine:
+        """Engine da réplica de leitura, ou o do primário se não houver réplica configurada"""
+        if self._replica_engine is None:
+            return self.engine
+        return self._replica_engine
+
+    def connect(self, settings: Settings) -> AsyncEngine:
+        if self._engine is None:
+            self._engine = create_engine(settings)
+            if settings.DATABASE_REPLICA_URL:
+                self._replica_engine = create_engine(settings, settings.DATABASE_REPLICA_URL)
+        return self._engine
+
+    async def dispose(self) -> None:
+        for engine in (self._replica_engine, self._engine):
+            if engine is not None:
+                await engine.dispose()
+        self._engine = None
+        self._replica_engine = None
+
+    def pool_metrics(self, replica: bool = False) -> PoolMetrics:
+        engine = self.replica_engine if replica else self.engine
+        return engine.pool.metrics()
+
+
+database = Database()
+
+
+def get_database() -> Database:
+    return database
 
 
 async def get_session():
-    async with AsyncSession(engine, expire_on_commit=False) as session:
+    async with AsyncSession(database.engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_replica_session():
+    async with AsyncSession(database.replica_engine, expire_on_commit=False) as session:
         yield session
@@ -0,0 +1,36 @@
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.application.ports.database.unit_of_work import UnitOfWork
+
+_AFTER_COMMIT = 'after_commit_callbacks'
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Agenda callback para depois do commit da transação atual; é descartado no rollback"""
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, 'after_commit')
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        callback()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def commit(self) -> None:
+        await self._session.commit()
+
+    async def rollback(self) -> None:
+        await self._session.rollback()
@@ -0,0 +1,101 @@
+from typing import Optional
+
+from sqlalchemy import delete, exists, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.ports.repositories.account_deletion_repository import (
+    AccountDeletionRepository,
+)
+from src.infrastructure.database.orm import (
+    AccountDeletionModel,
+    ArchivedMoodModel,
+    MoodModel,
+    RefreshTokenModel,
+    UserModel,
+)
+
+
+class SQLAlchemyAccountDeletionRepository(AccountDeletionRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def schedule(self, user_id: str) -> None:
+        await self._session.execute(
+            pg_insert(AccountDeletionModel)
+            .values(user_id=user_id)
+            .on_conflict_do_nothing(index_elements=[AccountDeletionModel.user_id])
+        )
+
+    async def claim_next(self) -> Optional[str]:
+        # Skips the purges other workers hold, so each user is purged by one worker at a time
+        return await self._session.scalar(
+            select(AccountDeletionModel.user_id)
+            .where(AccountDeletionModel.completed_at.is_(None))
+            .order_by(AccountDeletionModel.requested_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def purge_moods(self, user_id: str, batch_size: int) -> int:
+        # Moods in the hot tables first, their children going with them through the foreign
+        # keys, then the archived ones; neither is ever loaded into the session
+        for model in (MoodModel, ArchivedMoodModel):
+            batch = (
+                select(model.id, model.created_at)
+                .where(model.user_id == user_id)
+                .order_by(model.created_at, model.id)
+                .limit(batch_size)
+            )
+            result = await self._session.execute(
+                delete(model)
+                .where(tuple_(model.id, model.created_at).in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                return result.rowcount
+        return 0
+
+    async def record_progress(self, user_id: str, moods_purged: int) -> int:
+        return await self._session.scalar(
+            update(AccountDeletionModel)
+            .where(AccountDeletionModel.user_id == user_id)
+            .values(moods_purged=AccountDeletionModel.moods_purged + moods_purged)
+            .returning(AccountDeletionModel.moods_purged)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def complete(self, user_id: str) -> bool:
+        # Holding the user row waits out any mood insert still in flight and blocks new ones,
+        # so the check below sees every mood the user will ever have
+        locked = await self._session.scalar(
+            select(UserModel.id).where(UserModel.id == user_id).with_for_update()
+        )
+        if locked is not None:
+            remaining = await self._session.scalar(
+                select(
+                    or_(
+                        exists().where(MoodModel.user_id == user_id),
+                        exists().where(ArchivedMoodModel.user_id == user_id),
+                    )
+                )
+            )
+            if remaining:
+                return False
+
+            await self._session.execute(
+                delete(RefreshTokenModel).where(RefreshTokenModel.user_id == user_id)
+            )
+            await self._session.execute(
+                delete(UserModel)
+                .where(UserModel.id == user_id)
+                .execution_options(synchronize_session=False)
+            )
+
+        await self._session.execute(
+            update(AccountDeletionModel)
+            .where(AccountDeletionModel.user_id == user_id)
+            .values(completed_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return True
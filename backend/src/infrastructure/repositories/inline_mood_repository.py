@@ -0,0 +1,168 @@
+from typing import Any, Optional
+
+from sqlalchemy import Text, cast, func, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
+
+from src.application.dto.mood_dto import MoodFilters
+from src.application.exceptions.sql_database import (
+    EntityNotFoundError,
+    IntegrityConstraintViolationError,
+)
+from src.domain.entities.associated_emotion import AssociatedEmotion
+from src.domain.entities.emotional_trigger import EmotionalTrigger
+from src.domain.entities.mood import Mood
+from src.infrastructure.database.orm import (
+    AssociatedEmotionsModel,
+    EmotionalTriggerModel,
+    MoodModel,
+    TriggerNameModel,
+)
+from src.infrastructure.repositories.mood_repository import (
+    SQLAlchemyMoodRepository,
+    inline_children_conditions,
+    names_to_json,
+)
+
+INLINE_CHILDREN_LOADER = (
+    undefer(MoodModel.inline_emotions),
+    undefer(MoodModel.inline_triggers),
+)
+
+
+class SQLAlchemyInlineMoodRepository(SQLAlchemyMoodRepository):
+    """Repositório de humores que guarda emoções e gatilhos na própria linha do humor"""
+
+    loader_options = INLINE_CHILDREN_LOADER
+
+    @staticmethod
+    def _model_to_entity(mood_model: MoodModel) -> Mood:
+        associated_emotions = [
+            AssociatedEmotion(**emotion) for emotion in mood_model.inline_emotions or []
+        ]
+        triggers = [EmotionalTrigger(name=name) for name in mood_model.inline_triggers or []]
+
+        return Mood(
+            id=mood_model.id,
+            user_id=mood_model.user_id,
+            registry_type=mood_model.registry_type,
+            visual_scale=mood_model.visual_scale,
+            associated_emotions=associated_emotions,
+            triggers=triggers,
+            description=mood_model.description,
+        )
+
+    @staticmethod
+    def _document_children() -> tuple[Any, Any]:
+        return (
+            func.coalesce(MoodModel.inline_emotions, cast([], JSONB)),
+            names_to_json(MoodModel.inline_triggers),
+        )
+
+    @staticmethod
+    def _children_conditions(filters: MoodFilters) -> list[Any]:
+        return inline_children_conditions(
+            MoodModel.inline_emotions, MoodModel.inline_triggers, filters
+        )
+
+    @staticmethod
+    def _inline_children(mood: Mood) -> dict:
+        return {
+            'inline_emotions': [
+                {'name': emotion.name.value, 'intensity': emotion.intensity}
+                for emotion in mood.associated_emotions
+            ],
+            'inline_triggers': [trigger.name for trigger in mood.triggers],
+        }
+
+    async def _insert_statement(self, moods: list[Mood]):
+        return insert(MoodModel).values([
+            {
+                'id': mood.id,
+                'user_id': mood.user_id,
+                'visual_scale': mood.visual_scale.value,
+                'registry_type': mood.registry_type,
+                'description': mood.description,
+                **self._inline_children(mood),
+            }
+            for mood in moods
+        ])
+
+    async def update(self, mood: Mood) -> Mood:
+        try:
+            updated_id = await self.session.scalar(
+                update(MoodModel)
+                .where(MoodModel.id == mood.id, MoodModel.user_id == mood.user_id)
+                .values(
+                    visual_scale=mood.visual_scale.value,
+                    description=mood.description,
+                    **self._inline_children(mood),
+                )
+                .returning(MoodModel.id)
+                .execution_options(synchronize_session=False)
+            )
+        except IntegrityError as e:
+            raise IntegrityConstraintViolationError(f'Integrity constraint violated: {e}')
+
+        if updated_id is None:
+            raise EntityNotFoundError('Mood not found')
+        return mood.model_copy(deep=True)
+
+    async def backfill(self, batch_size: int, after_id: Optional[str] = None) -> list[str]:
+        """Copia as linhas filhas de até batch_size humores sem cópia inline após after_id"""
+        emotions = (
+            select(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object(
+                            'name',
+                            AssociatedEmotionsModel.name,
+                            'intensity',
+                            AssociatedEmotionsModel.intensity,
+                        ),
+                        AssociatedEmotionsModel.id,
+                    )
+                )
+            )
+            # Both keys, so each lookup prunes to the mood's partition
+            .where(
+                AssociatedEmotionsModel.mood_id == MoodModel.id,
+                AssociatedEmotionsModel.mood_created_at == MoodModel.created_at,
+            )
+            .scalar_subquery()
+        )
+        triggers = (
+            select(
+                func.array_agg(aggregate_order_by(TriggerNameModel.name, EmotionalTriggerModel.id))
+            )
+            .join(EmotionalTriggerModel.trigger_name)
+            .where(
+                EmotionalTriggerModel.mood_id == MoodModel.id,
+                EmotionalTriggerModel.mood_created_at == MoodModel.created_at,
+            )
+            .scalar_subquery()
+        )
+        batch = (
+            select(MoodModel.id)
+            .where(MoodModel.inline_emotions.is_(None))
+            .order_by(MoodModel.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        if after_id is not None:
+            batch = batch.where(MoodModel.id > after_id)
+
+        result = await self.session.scalars(
+            update(MoodModel)
+            .where(MoodModel.id.in_(batch.scalar_subquery()))
+            .values(
+                inline_emotions=func.coalesce(emotions, cast([], JSONB)),
+                inline_triggers=func.coalesce(triggers, cast([], ARRAY(Text))),
+                # The backfill is not a user edit
+                updated_at=MoodModel.updated_at,
+            )
+            .returning(MoodModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        return sorted(result.all())
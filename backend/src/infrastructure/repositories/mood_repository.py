@@ -1,7 +1,34 @@
-from sqlalchemy import select
+from datetime import timedelta
+from functools import partial
+from operator import attrgetter
+from typing import Any, Callable, Optional
+
+from sqlalchemy import (
+    Integer,
+    Text,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    union_all,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 
+from src.application.dto.mood_dto import MoodFilters
+from src.application.dto.pagination import Page
 from src.application.exceptions.sql_database import (
     EntityNotFoundError,
     IntegrityConstraintViolationError,
@@ -10,16 +37,123 @@ from src.application.ports.repositories.mood_repository import MoodRepository
 from src.domain.entities.associated_emotion import AssociatedEmotion
 from src.domain.entities.emotional_trigger import EmotionalTrigger
 from src.domain.entities.mood import Mood
+from src.infrastructure.cache.trigger_vocabulary import TriggerVocabulary
 from src.infrastructure.database.orm import (
+    ArchivedMoodModel,
     AssociatedEmotionsModel,
     EmotionalTriggerModel,
     MoodModel,
+    TriggerNameModel,
+)
+from src.infrastructure.database.unit_of_work import after_commit
+from src.infrastructure.repositories.pagination import build_page, decode_cursor
+
+MOOD_CHILDREN_LOADER = (
+    selectinload(MoodModel.associated_emotions),
+    selectinload(MoodModel.triggers).joinedload(EmotionalTriggerModel.trigger_name),
 )
+EMPTY_JSON = literal_column("'[]'::json")
+
+
+def mood_document(model: type[MoodModel | ArchivedMoodModel], emotions: Any, triggers: Any):
+    """Humor serializado pelo banco no formato de MoodResponse, como texto JSON"""
+    # Cast to text so the driver hands the document over as is instead of parsing it
+    return cast(
+        func.json_build_object(
+            'id',
+            model.id,
+            'user_id',
+            model.user_id,
+            'registry_type',
+            model.registry_type,
+            'visual_scale',
+            model.visual_scale,
+            'associated_emotions',
+            emotions,
+            'triggers',
+            triggers,
+            'description',
+            model.description,
+        ),
+        Text,
+    ).label('document')
+
+
+def names_to_json(names: Any):
+    """Converte um array de nomes de gatilho na lista de objetos da resposta"""
+    trigger = func.unnest(names).table_valued('name', with_ordinality='position').render_derived()
+    return func.coalesce(
+        select(
+            func.json_agg(
+                aggregate_order_by(
+                    func.json_build_object('name', trigger.c.name), trigger.c.position
+                )
+            )
+        )
+        .select_from(trigger)
+        .scalar_subquery(),
+        EMPTY_JSON,
+    )
+
+
+def column_conditions(model: type[MoodModel | ArchivedMoodModel], filters: MoodFilters) -> list:
+    """Condições dos filtros sobre as colunas do próprio humor"""
+    conditions = []
+    if filters.created_from is not None:
+        conditions.append(model.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        conditions.append(model.created_at < filters.created_to)
+    if filters.registry_type is not None:
+        conditions.append(model.registry_type == filters.registry_type)
+    if filters.visual_scale_min is not None:
+        conditions.append(model.visual_scale >= filters.visual_scale_min)
+    if filters.visual_scale_max is not None:
+        conditions.append(model.visual_scale <= filters.visual_scale_max)
+    return conditions
+
+
+def emotion_conditions(name: Any, intensity: Any, filters: MoodFilters) -> list:
+    """Condições dos filtros sobre uma emoção, dados o nome e a intensidade dela"""
+    conditions = []
+    if filters.emotion is not None:
+        conditions.append(name == filters.emotion)
+    if filters.emotion_intensity_min is not None:
+        conditions.append(intensity >= filters.emotion_intensity_min)
+    if filters.emotion_intensity_max is not None:
+        conditions.append(intensity <= filters.emotion_intensity_max)
+    return conditions
+
+
+def inline_children_conditions(emotions: Any, triggers: Any, filters: MoodFilters) -> list:
+    """Condições dos filtros sobre emoções em JSONB e gatilhos em array de nomes"""
+    conditions = []
+    if filters.filters_emotions:
+        # Read back as the emotion_name enum, so the name compares like the child column does
+        emotion = (
+            func.jsonb_to_recordset(emotions)
+            .table_valued(
+                column('name', AssociatedEmotionsModel.name.type), column('intensity', Integer)
+            )
+            .render_derived(with_types=True)
+        )
+        conditions.append(
+            exists()
+            .select_from(emotion)
+            .where(*emotion_conditions(emotion.c.name, emotion.c.intensity, filters))
+        )
+    if filters.triggers:
+        conditions.append(triggers.overlap(cast(filters.triggers, ARRAY(Text))))
+    return conditions
 
 
 class SQLAlchemyMoodRepository(MoodRepository):
-    def __init__(self, session: AsyncSession):
+    loader_options = MOOD_CHILDREN_LOADER
+
+    def __init__(
+        self, session: AsyncSession, trigger_vocabulary: Optional[TriggerVocabulary] = None
+    ):
         self.session = session
+        self._trigger_vocabulary = trigger_vocabulary
 
     @staticmethod
     def _model_to_entity(mood_model: MoodModel) -> Mood:
@@ -28,7 +162,9 @@ class SQLAlchemyMoodRepository(MoodRepository):
             for emotion in mood_model.associated_emotions
         ]
 
-        triggers = [EmotionalTrigger(name=trigger.name) for trigger in mood_model.triggers]
+        triggers = [
+            EmotionalTrigger(name=trigger.trigger_name.name) for trigger in mood_model.triggers
+        ]
 
         return Mood(
             id=mood_model.id,
@@ -41,108 +177,521 @@ class SQLAlchemyMoodRepository(MoodRepository):
         )
 
     @staticmethod
-    def _entity_to_model(mood: Mood) -> MoodModel:
-        associated_emotions = SQLAlchemyMoodRepository._convert_associated_emotions_to_model(
-            mood.associated_emotions, mood.id
-        )
-        triggers = SQLAlchemyMoodRepository._convert_triggers_to_model(mood.triggers, mood.id)
-
-        return MoodModel(
-            id=mood.id,
-            user_id=mood.user_id,
-            visual_scale=mood.visual_scale.value,
-            registry_type=mood.registry_type.value,
-            description=mood.description,
-            associated_emotions=associated_emotions,
-            triggers=triggers,
+    def _archived_to_entity(archived: ArchivedMoodModel) -> Mood:
+        return Mood(
+            id=archived.id,
+            user_id=archived.user_id,
+            registry_type=archived.registry_type,
+            visual_scale=archived.visual_scale,
+            associated_emotions=[AssociatedEmotion(**emotion) for emotion in archived.emotions],
+            triggers=[EmotionalTrigger(name=name) for name in archived.triggers],
+            description=archived.description,
         )
 
+    def _row_to_entity(self, row: MoodModel | ArchivedMoodModel) -> Mood:
+        if isinstance(row, ArchivedMoodModel):
+            return self._archived_to_entity(row)
+        return self._model_to_entity(row)
+
     @staticmethod
-    def _convert_associated_emotions_to_model(
-        associated_emotions: list[AssociatedEmotion], mood_id: str
-    ) -> list[AssociatedEmotionsModel]:
-        return [
-            AssociatedEmotionsModel(
-                mood_id=mood_id,
-                name=emotion.name.value,
-                intensity=emotion.intensity,
-            )
-            for emotion in associated_emotions
+    def _sync_children(
+        children: list[Any],
+        fields: tuple[str, ...],
+        requested: list[tuple[Any, ...]],
+        factory: Callable[..., Any],
+    ) -> None:
+        """Aplica na coleção apenas as diferenças entre as linhas salvas e as pedidas"""
+        pending = list(requested)
+        stale = []
+        for child in children:
+            values = tuple(getattr(child, field) for field in fields)
+            if values in pending:
+                pending.remove(values)
+            else:
+                stale.append(child)
+
+        # Rows that no longer match are rewritten in place before inserting or deleting any
+        for child, values in zip(stale, pending):
+            for field, value in zip(fields, values):
+                setattr(child, field, value)
+        for values in pending[len(stale) :]:
+            children.append(factory(**dict(zip(fields, values))))
+        for child in stale[len(pending) :]:
+            children.remove(child)
+
+    async def _trigger_name_ids(self, names: set[str]) -> dict[str, int]:
+        """Resolve os ids dos nomes de gatilho, cadastrando no vocabulário os que faltarem"""
+        ids = self._trigger_vocabulary.get_many(names) if self._trigger_vocabulary else {}
+        while missing := names - ids.keys():
+            requested = values(column('name', Text), name='requested').data([
+                (name,) for name in missing
+            ])
+            inserted = (
+                pg_insert(TriggerNameModel)
+                .from_select(['name'], select(requested.c.name))
+                .on_conflict_do_nothing(index_elements=['name'])
+                .returning(TriggerNameModel.id, TriggerNameModel.name)
+                .cte('inserted_trigger_names')
+            )
+            # A name inserted by a concurrent transaction is neither inserted nor visible to
+            # this statement's snapshot; the next pass sees it once that transaction commits
+            result = await self.session.execute(
+                union_all(
+                    select(inserted.c.id, inserted.c.name, literal(True).label('new')),
+                    select(TriggerNameModel.id, TriggerNameModel.name, literal(False)).where(
+                        TriggerNameModel.name.in_(missing)
+                    ),
+                )
+            )
+            existing, inserted_ids = {}, {}
+            for trigger_name_id, name, new in result:
+                (inserted_ids if new else existing)[name] = trigger_name_id
+            ids |= existing | inserted_ids
+
+            if self._trigger_vocabulary is not None:
+                self._trigger_vocabulary.set_many(existing)
+                # Names inserted by this transaction only exist for others once it commits
+                after_commit(self.session, partial(self._trigger_vocabulary.set_many, inserted_ids))
+        return ids
+
+    async def _insert_statement(self, moods: list[Mood]):
+        # The children go in as data-modifying CTEs, so the moods are one INSERT round trip
+        moods_insert = (
+            insert(MoodModel)
+            .values([
+                {
+                    'id': mood.id,
+                    'user_id': mood.user_id,
+                    'visual_scale': mood.visual_scale.value,
+                    'registry_type': mood.registry_type,
+                    'description': mood.description,
+                }
+                for mood in moods
+            ])
+            .returning(MoodModel.id, MoodModel.created_at)
+            .cte('inserted_moods')
+        )
+        statement = select(moods_insert.c.id)
+
+        def mood_created_at(mood: Mood):
+            # Children go to the partition of their mood, whose created_at the database assigns
+            return (
+                select(moods_insert.c.created_at)
+                .where(moods_insert.c.id == mood.id)
+                .scalar_subquery()
+            )
+
+        emotions = [
+            {
+                'mood_id': mood.id,
+                'mood_created_at': mood_created_at(mood),
+                'name': emotion.name,
+                'intensity': emotion.intensity,
+            }
+            for mood in moods
+            for emotion in mood.associated_emotions
         ]
+        if emotions:
+            statement = statement.add_cte(
+                insert(AssociatedEmotionsModel).values(emotions).cte('inserted_emotions')
+            )
 
-    @staticmethod
-    def _convert_triggers_to_model(
-        triggers: list[EmotionalTrigger], mood_id: str
-    ) -> list[EmotionalTriggerModel]:
-        return [
-            EmotionalTriggerModel(
-                mood_id=mood_id,
-                name=trigger.name,
-            )
-            for trigger in triggers
+        trigger_name_ids = await self._trigger_name_ids({
+            trigger.name for mood in moods for trigger in mood.triggers
+        })
+        triggers = [
+            {
+                'mood_id': mood.id,
+                'mood_created_at': mood_created_at(mood),
+                'trigger_name_id': trigger_name_ids[trigger.name],
+            }
+            for mood in moods
+            for trigger in mood.triggers
         ]
+        if triggers:
+            statement = statement.add_cte(
+                insert(EmotionalTriggerModel).values(triggers).cte('inserted_triggers')
+            )
+
+        return statement
 
     async def save(self, mood: Mood) -> Mood:
-        mood_db = self._entity_to_model(mood)
+        (saved_mood,) = await self.save_many([mood])
+        return saved_mood
+
+    async def save_many(self, moods: list[Mood]) -> list[Mood]:
         try:
-            self.session.add(mood_db)
-            await self.session.commit()
-            await self.session.refresh(mood_db)
-            return self._model_to_entity(mood_db)
+            await self.session.execute(await self._insert_statement(moods))
         except IntegrityError as e:
-            await self.session.rollback()
             raise IntegrityConstraintViolationError(f'Integrity constraint violated: {e}')
 
-    async def list_moods(self, user_id: str, offset: int, limit: int) -> list[Mood]:
-        result = await self.session.scalars(
-            select(MoodModel).where(MoodModel.user_id == user_id).offset(offset).limit(limit)
+        return [mood.model_copy(deep=True) for mood in moods]
+
+    @staticmethod
+    def _document_children() -> tuple[Any, Any]:
+        emotions = (
+            select(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            'name',
+                            AssociatedEmotionsModel.name,
+                            'intensity',
+                            AssociatedEmotionsModel.intensity,
+                        ),
+                        AssociatedEmotionsModel.id,
+                    )
+                )
+            )
+            .where(
+                AssociatedEmotionsModel.mood_id == MoodModel.id,
+                AssociatedEmotionsModel.mood_created_at == MoodModel.created_at,
+            )
+            .scalar_subquery()
+        )
+        triggers = (
+            select(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object('name', TriggerNameModel.name),
+                        EmotionalTriggerModel.id,
+                    )
+                )
+            )
+            .join(EmotionalTriggerModel.trigger_name)
+            .where(
+                EmotionalTriggerModel.mood_id == MoodModel.id,
+                EmotionalTriggerModel.mood_created_at == MoodModel.created_at,
+            )
+            .scalar_subquery()
         )
-        return [self._model_to_entity(mood) for mood in result.all()]
+        return func.coalesce(emotions, EMPTY_JSON), func.coalesce(triggers, EMPTY_JSON)
+
+    @staticmethod
+    def _children_conditions(filters: MoodFilters) -> list[Any]:
+        conditions = []
+        if filters.filters_emotions:
+            conditions.append(
+                exists().where(
+                    AssociatedEmotionsModel.mood_id == MoodModel.id,
+                    AssociatedEmotionsModel.mood_created_at == MoodModel.created_at,
+                    *emotion_conditions(
+                        AssociatedEmotionsModel.name, AssociatedEmotionsModel.intensity, filters
+                    ),
+                )
+            )
+        if filters.triggers:
+            conditions.append(
+                exists().where(
+                    EmotionalTriggerModel.mood_id == MoodModel.id,
+                    EmotionalTriggerModel.mood_created_at == MoodModel.created_at,
+                    EmotionalTriggerModel.trigger_name_id.in_(
+                        select(TriggerNameModel.id).where(
+                            TriggerNameModel.name.in_(filters.triggers)
+                        )
+                    ),
+                )
+            )
+        return conditions
+
+    async def list_moods(
+        self,
+        user_id: str,
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        filters: MoodFilters | None = None,
+    ) -> Page[Mood]:
+        rows = await self._page_rows(
+            user_id,
+            offset,
+            limit,
+            cursor,
+            filters or MoodFilters(),
+            select(MoodModel)
+            .options(*self.loader_options)
+            # Children rewritten by update() in this session are reloaded, not served stale
+            .execution_options(populate_existing=True),
+            select(ArchivedMoodModel),
+        )
+        return build_page([row[0] for row in rows], limit, self._row_to_entity)
+
+    async def list_mood_documents(
+        self,
+        user_id: str,
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        filters: MoodFilters | None = None,
+    ) -> Page[str]:
+        rows = await self._page_rows(
+            user_id,
+            offset,
+            limit,
+            cursor,
+            filters or MoodFilters(),
+            select(
+                MoodModel.created_at,
+                MoodModel.id,
+                mood_document(MoodModel, *self._document_children()),
+            ),
+            select(
+                ArchivedMoodModel.created_at,
+                ArchivedMoodModel.id,
+                mood_document(
+                    ArchivedMoodModel,
+                    ArchivedMoodModel.emotions,
+                    names_to_json(ArchivedMoodModel.triggers),
+                ),
+            ),
+        )
+        return build_page(rows, limit, attrgetter('document'))
+
+    async def _page_rows(
+        self,
+        user_id: str,
+        offset: int,
+        limit: int,
+        cursor: str | None,
+        filters: MoodFilters,
+        hot: Select,
+        archived: Select,
+    ) -> list[Row]:
+        """Busca até limit + 1 linhas da página, dos humores quentes e depois dos arquivados"""
+        position = decode_cursor(cursor) if cursor is not None else None
+        conditions = [
+            MoodModel.user_id == user_id,
+            *column_conditions(MoodModel, filters),
+            *self._children_conditions(filters),
+        ]
+        if position is not None:
+            conditions.append(tuple_(MoodModel.created_at, MoodModel.id) < position)
+
+        # Newest first; keyset on (created_at, id) walks ix_moods_user_id_created_at_id backwards
+        result = await self.session.execute(
+            hot.where(*conditions)
+            .order_by(MoodModel.created_at.desc(), MoodModel.id.desc())
+            .offset(offset)
+            .limit(limit + 1)
+        )
+        rows = list(result.all())
+        if len(rows) > limit:
+            return rows
+
+        # Archived moods are older than every hot one, so a short page carries on there
+        archive_offset = 0
+        if not rows and offset:
+            hot_rows = select(MoodModel.id).where(*conditions).limit(offset).subquery()
+            archive_offset = offset - await self.session.scalar(
+                select(func.count()).select_from(hot_rows)
+            )
+        archived = archived.where(
+            ArchivedMoodModel.user_id == user_id,
+            *column_conditions(ArchivedMoodModel, filters),
+            *inline_children_conditions(
+                ArchivedMoodModel.emotions, ArchivedMoodModel.triggers, filters
+            ),
+        )
+        if position is not None:
+            archived = archived.where(
+                tuple_(ArchivedMoodModel.created_at, ArchivedMoodModel.id) < position
+            )
+        result = await self.session.execute(
+            archived.order_by(ArchivedMoodModel.created_at.desc(), ArchivedMoodModel.id.desc())
+            .offset(archive_offset)
+            .limit(limit + 1 - len(rows))
+        )
+        return rows + list(result.all())
 
     async def find_mood_by_id(self, mood_id: str, user_id: str) -> Mood | None:
         result = await self.session.scalar(
-            select(MoodModel).where(MoodModel.id == mood_id, MoodModel.user_id == user_id)
+            select(MoodModel)
+            .options(*self.loader_options)
+            .where(MoodModel.id == mood_id, MoodModel.user_id == user_id)
+            .execution_options(populate_existing=True)
         )
         if result:
             return self._model_to_entity(result)
+
+        archived = await self.session.scalar(
+            select(ArchivedMoodModel).where(
+                ArchivedMoodModel.id == mood_id, ArchivedMoodModel.user_id == user_id
+            )
+        )
+        if archived:
+            return self._archived_to_entity(archived)
         raise EntityNotFoundError('Mood not found')
 
     async def update(self, mood: Mood) -> Mood:
         mood_db = await self.session.scalar(
-            select(MoodModel).where(MoodModel.id == mood.id, MoodModel.user_id == mood.user_id)
+            select(MoodModel)
+            .options(*MOOD_CHILDREN_LOADER)
+            .where(MoodModel.id == mood.id, MoodModel.user_id == mood.user_id)
         )
         if not mood_db:
             raise EntityNotFoundError('Mood not found')
 
         mood_db.visual_scale = mood.visual_scale.value
-        mood_db.associated_emotions = (
-            SQLAlchemyMoodRepository._convert_associated_emotions_to_model(
-                mood.associated_emotions, mood.id
-            )
+        mood_db.description = mood.description
+        # Marks the inline copy as stale so the next backfill rebuilds it from the child rows
+        mood_db.inline_emotions = None
+        mood_db.inline_triggers = None
+        self._sync_children(
+            mood_db.associated_emotions,
+            ('name', 'intensity'),
+            [(emotion.name, emotion.intensity) for emotion in mood.associated_emotions],
+            partial(AssociatedEmotionsModel, mood_id=mood.id),
         )
-        mood_db.triggers = SQLAlchemyMoodRepository._convert_triggers_to_model(
-            mood.triggers, mood.id
+        trigger_name_ids = await self._trigger_name_ids({trigger.name for trigger in mood.triggers})
+        self._sync_children(
+            mood_db.triggers,
+            ('trigger_name_id',),
+            [(trigger_name_ids[trigger.name],) for trigger in mood.triggers],
+            partial(EmotionalTriggerModel, mood_id=mood.id),
         )
-        mood_db.description = mood.description
 
         try:
-            await self.session.commit()
-            await self.session.refresh(mood_db)
-            return self._model_to_entity(mood_db)
+            await self.session.flush()
         except IntegrityError as e:
-            await self.session.rollback()
             raise IntegrityConstraintViolationError(f'Integrity constraint violated: {e}')
+        # The rewritten children still point at their old trigger_name, so the entity is
+        # built from the request rather than from mood_db
+        return mood.model_copy(deep=True)
 
     async def delete(self, mood_id: str, user_id: str) -> None:
-        mood_db = await self.session.scalar(
-            select(MoodModel).where(MoodModel.id == mood_id, MoodModel.user_id == user_id)
-        )
-        if not mood_db:
+        # The children go with it through ON DELETE CASCADE, so this is one round trip
+        try:
+            deleted_id = await self.session.scalar(
+                delete(MoodModel)
+                .where(MoodModel.id == mood_id, MoodModel.user_id == user_id)
+                .returning(MoodModel.id)
+                .execution_options(synchronize_session=False)
+            )
+        except IntegrityError as e:
+            raise IntegrityConstraintViolationError(f'Integrity constraint violated: {e}')
+
+        if deleted_id is None:
             raise EntityNotFoundError('Mood not found')
 
+    async def archive(self, older_than: timedelta, batch_size: int) -> int:
+        """Move até batch_size humores com mais de older_than de idade para archived_moods"""
+        batch = (
+            select(MoodModel.id, MoodModel.created_at)
+            # Measured against the database clock, the same one that set created_at
+            .where(MoodModel.created_at < func.now() - older_than)
+            # Oldest first, so the archive always holds the oldest moods of each user
+            .order_by(MoodModel.created_at, MoodModel.id)
+            .limit(batch_size)
+            .with_for_update()
+            .cte('batch')
+        )
+        batch_keys = select(batch.c.id, batch.c.created_at)
+        deleted_emotions = (
+            delete(AssociatedEmotionsModel)
+            .where(
+                tuple_(
+                    AssociatedEmotionsModel.mood_id, AssociatedEmotionsModel.mood_created_at
+                ).in_(batch_keys)
+            )
+            .returning(
+                AssociatedEmotionsModel.id,
+                AssociatedEmotionsModel.mood_id,
+                AssociatedEmotionsModel.name,
+                AssociatedEmotionsModel.intensity,
+            )
+            .cte('deleted_emotions')
+        )
+        deleted_triggers = (
+            delete(EmotionalTriggerModel)
+            .where(
+                tuple_(EmotionalTriggerModel.mood_id, EmotionalTriggerModel.mood_created_at).in_(
+                    batch_keys
+                )
+            )
+            .returning(
+                EmotionalTriggerModel.id,
+                EmotionalTriggerModel.mood_id,
+                EmotionalTriggerModel.trigger_name_id,
+            )
+            .cte('deleted_triggers')
+        )
+        deleted_moods = (
+            delete(MoodModel)
+            .where(tuple_(MoodModel.id, MoodModel.created_at).in_(batch_keys))
+            .returning(
+                MoodModel.id,
+                MoodModel.user_id,
+                MoodModel.visual_scale,
+                MoodModel.registry_type,
+                MoodModel.description,
+                MoodModel.created_at,
+                MoodModel.updated_at,
+                MoodModel.inline_emotions,
+                MoodModel.inline_triggers,
+            )
+            .cte('deleted_moods')
+        )
+
+        emotions = (
+            select(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object(
+                            'name',
+                            deleted_emotions.c.name,
+                            'intensity',
+                            deleted_emotions.c.intensity,
+                        ),
+                        deleted_emotions.c.id,
+                    )
+                )
+            )
+            .where(deleted_emotions.c.mood_id == deleted_moods.c.id)
+            .scalar_subquery()
+        )
+        triggers = (
+            select(func.array_agg(aggregate_order_by(TriggerNameModel.name, deleted_triggers.c.id)))
+            .join_from(
+                deleted_triggers,
+                TriggerNameModel,
+                TriggerNameModel.id == deleted_triggers.c.trigger_name_id,
+            )
+            .where(deleted_triggers.c.mood_id == deleted_moods.c.id)
+            .scalar_subquery()
+        )
+        # The inline copy, when present, is what the inline layout reads; moods written by
+        # that layout have no child rows at all
+        archived = (
+            insert(ArchivedMoodModel)
+            .from_select(
+                [
+                    'id',
+                    'user_id',
+                    'visual_scale',
+                    'registry_type',
+                    'description',
+                    'emotions',
+                    'triggers',
+                    'created_at',
+                    'updated_at',
+                ],
+                select(
+                    deleted_moods.c.id,
+                    deleted_moods.c.user_id,
+                    deleted_moods.c.visual_scale,
+                    deleted_moods.c.registry_type,
+                    deleted_moods.c.description,
+                    func.coalesce(deleted_moods.c.inline_emotions, emotions, cast([], JSONB)),
+                    func.coalesce(deleted_moods.c.inline_triggers, triggers, cast([], ARRAY(Text))),
+                    deleted_moods.c.created_at,
+                    deleted_moods.c.updated_at,
+                ),
+            )
+            .returning(ArchivedMoodModel.id)
+        )
+
         try:
-            await self.session.delete(mood_db)
-            await self.session.commit()
+            result = await self.session.scalars(archived)
         except IntegrityError as e:
-            await self.session.rollback()
             raise IntegrityConstraintViolationError(f'Integrity constraint violated: {e}')
+        return len(result.all())
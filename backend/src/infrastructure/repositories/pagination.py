@@ -0,0 +1,37 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Sequence, TypeVar
+
+from src.application.dto.pagination import Page
+from src.application.exceptions.sql_database import InvalidCursorError
+
+T = TypeVar('T')
+
+
+def encode_cursor(created_at: datetime, entity_id: str) -> str:
+    """Codifica a posição (created_at, id) de uma linha em um cursor opaco"""
+    payload = json.dumps([created_at.isoformat(), entity_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decodifica um cursor gerado por encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, entity_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # Ids are UUIDs; a malformed one would otherwise match nothing and end the listing
+        return datetime.fromisoformat(created_at), str(uuid.UUID(entity_id))
+    except (AttributeError, binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError('Invalid pagination cursor') from e
+
+
+def build_page(rows: Sequence[Any], limit: int, to_entity: Callable[[Any], T]) -> Page[T]:
+    """Monta a página a partir de até limit + 1 linhas, gerando o cursor se houver mais"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return Page(items=[to_entity(row) for row in rows], next_cursor=next_cursor)
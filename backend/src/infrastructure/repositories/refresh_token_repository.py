@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.ports.repositories.refresh_token_repository import RefreshTokenRepository
+from src.domain.entities.refresh_token import RefreshToken
+from src.infrastructure.database.orm import RefreshTokenModel
+
+
+class SQLAlchemyRefreshTokenRepository(RefreshTokenRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    @staticmethod
+    def _model_to_entity(refresh_token_model: RefreshTokenModel) -> RefreshToken:
+        return RefreshToken(
+            token_hash=refresh_token_model.token_hash,
+            user_id=refresh_token_model.user_id,
+            family_id=refresh_token_model.family_id,
+            expires_at=refresh_token_model.expires_at,
+            revoked=refresh_token_model.revoked,
+        )
+
+    @staticmethod
+    def _entity_to_model(refresh_token: RefreshToken) -> RefreshTokenModel:
+        return RefreshTokenModel(
+            token_hash=refresh_token.token_hash,
+            user_id=refresh_token.user_id,
+            family_id=refresh_token.family_id,
+            expires_at=refresh_token.expires_at,
+            revoked=refresh_token.revoked,
+        )
+
+    async def save(self, refresh_token: RefreshToken) -> None:
+        self._session.add(self._entity_to_model(refresh_token))
+
+    async def find_by_token_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        result = await self._session.scalar(
+            select(RefreshTokenModel).where(RefreshTokenModel.token_hash == token_hash)
+        )
+        if result:
+            return self._model_to_entity(result)
+        return None
+
+    async def revoke(self, token_hash: str) -> bool:
+        result = await self._session.scalar(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.token_hash == token_hash, RefreshTokenModel.revoked.is_(False))
+            .values(revoked=True)
+            .returning(RefreshTokenModel.token_hash)
+            .execution_options(synchronize_session=False)
+        )
+        return result is not None
+
+    async def revoke_family(self, family_id: str) -> None:
+        await self._session.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.family_id == family_id)
+            .values(revoked=True)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def delete_expired(self, user_id: str) -> int:
+        # Past expires_at a token is refused anyway, so its row no longer serves reuse detection
+        result = await self._session.execute(
+            delete(RefreshTokenModel)
+            .where(
+                RefreshTokenModel.user_id == user_id,
+                RefreshTokenModel.expires_at <= datetime.now(tz=ZoneInfo('UTC')),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
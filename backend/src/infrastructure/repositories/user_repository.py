@@ -1,18 +1,24 @@
-from typing import List, Optional
+from functools import partial
+from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.application.dto.pagination import Page
 from src.application.exceptions.sql_database import EntityAlreadyExistsError, EntityNotFoundError
+from src.application.ports.cache.principal_cache import PrincipalCache
 from src.application.ports.repositories.user_repository import UserRepository
 from src.domain.entities.user import User
 from src.infrastructure.database.orm import UserModel
+from src.infrastructure.database.unit_of_work import after_commit
+from src.infrastructure.repositories.pagination import build_page, decode_cursor
 
 
 class SQLAlchemyUserRepository(UserRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, principal_cache: Optional[PrincipalCache] = None):
         self._session = session
+        self._principal_cache = principal_cache
 
     @staticmethod
     def _model_to_entity(user_model: UserModel) -> User:
@@ -25,30 +31,30 @@ class SQLAlchemyUserRepository(UserRepository):
             last_name=user_model.last_name,
             is_admin=user_model.is_admin,
             is_active=user_model.is_active,
+            token_version=user_model.token_version,
         )
 
     @staticmethod
-    def _entity_to_model(user: User) -> UserModel:
-        return UserModel(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            password=user.password,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            is_admin=user.is_admin,
-            is_active=user.is_active,
-        )
+    def _entity_to_row(user: User) -> dict:
+        return {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'password': user.password,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_admin': user.is_admin,
+            'is_active': user.is_active,
+            'token_version': user.token_version,
+        }
 
     async def save(self, user: User) -> User:
-        user_model = self._entity_to_model(user)
         try:
-            self._session.add(user_model)
-            await self._session.commit()
-            await self._session.refresh(user_model)
+            user_model = await self._session.scalar(
+                insert(UserModel).returning(UserModel), [self._entity_to_row(user)]
+            )
             return self._model_to_entity(user_model)
         except IntegrityError:
-            await self._session.rollback()
             raise EntityAlreadyExistsError('User with this email or username already exists')
 
     async def find_by_email(self, email: str) -> Optional[User]:
@@ -57,36 +63,64 @@ class SQLAlchemyUserRepository(UserRepository):
             return self._model_to_entity(result)
         raise EntityNotFoundError('User not found')
 
-    async def find_by_id(self, user_id: str) -> Optional[User]:
-        result = await self._session.scalar(select(UserModel).where(UserModel.id == user_id))
+    async def find_by_id(self, user_id: str, for_update: bool = False) -> Optional[User]:
+        query = select(UserModel).where(UserModel.id == user_id)
+        if for_update:
+            query = query.with_for_update()
+        result = await self._session.scalar(query)
         if result:
             return self._model_to_entity(result)
         raise EntityNotFoundError('User not found')
 
-    async def find_all(self, offset: int = 0, limit: int = 10) -> List[User]:
-        result = await self._session.scalars(select(UserModel).offset(offset).limit(limit))
-        return [self._model_to_entity(user_model) for user_model in result.all()]
-
-    async def update(self, user: User) -> User:
-        existing_model = await self._session.scalar(
-            select(UserModel).where(UserModel.id == user.id)
+    async def get_token_version(self, user_id: str) -> int:
+        result = await self._session.scalar(
+            select(UserModel.token_version).where(UserModel.id == user_id)
         )
+        if result is not None:
+            return result
+        raise EntityNotFoundError('User not found')
 
-        if not existing_model:
-            raise ValueError(f'User with id {user.id} not found')
+    async def find_all(
+        self, offset: int = 0, limit: int = 10, cursor: Optional[str] = None
+    ) -> Page[User]:
+        query = select(UserModel).order_by(UserModel.created_at, UserModel.id)
+        if cursor is not None:
+            created_at, user_id = decode_cursor(cursor)
+            query = query.where(tuple_(UserModel.created_at, UserModel.id) > (created_at, user_id))
 
-        existing_model.username = user.username
-        existing_model.email = user.email
-        existing_model.password = user.password
-        existing_model.first_name = user.first_name
-        existing_model.last_name = user.last_name
-        existing_model.is_admin = user.is_admin
-        existing_model.is_active = user.is_active
+        result = await self._session.scalars(query.offset(offset).limit(limit + 1))
+        return build_page(result.all(), limit, self._model_to_entity)
 
+    async def update(self, user: User) -> User:
+        row = self._entity_to_row(user)
+        del row['id']
+        # An entity read before a concurrent revocation would otherwise hand back the
+        # tokens it revoked
+        row['token_version'] = func.greatest(UserModel.token_version, user.token_version)
         try:
-            await self._session.commit()
-            await self._session.refresh(existing_model)
-            return self._model_to_entity(existing_model)
+            user_model = await self._session.scalar(
+                update(UserModel)
+                .where(UserModel.id == user.id)
+                .values(**row)
+                .returning(UserModel)
+                # Refreshes the instance already in the identity map, if any
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
         except IntegrityError:
-            await self._session.rollback()
             raise EntityAlreadyExistsError('User with this email or username already exists')
+
+        if user_model is None:
+            raise EntityNotFoundError('User not found')
+
+        self._invalidate_principal(user.id)
+        return self._model_to_entity(user_model)
+
+    async def update_password(self, user_id: str, password: str) -> None:
+        await self._session.execute(
+            update(UserModel).where(UserModel.id == user_id).values(password=password)
+        )
+        self._invalidate_principal(user_id)
+
+    def _invalidate_principal(self, user_id: str) -> None:
+        if self._principal_cache is not None:
+            after_commit(self._session, partial(self._principal_cache.invalidate, user_id))
@@ -0,0 +1,69 @@
+"""
+Move os humores antigos das tabelas quentes para archived_moods.
+
+Uso:
+    python -m src.interfaces.cli.archive_moods --older-than-days 365 --batch-size 1000
+    python -m src.interfaces.cli.archive_moods --poll-seconds 3600
+
+Sem --older-than-days usa MOOD_ARCHIVE_AFTER_DAYS. Cada lote move os humores mais antigos em
+uma transação curta, então o comando pode ser interrompido e executado de novo. Depois de
+arquivados, os humores continuam aparecendo na listagem, mas não podem mais ser editados. Com
+--poll-seconds o comando não termina: roda como worker, arquivando a cada intervalo os humores
+que envelheceram desde a última passada.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.infrastructure.database.session import create_engine
+from src.infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.mood_repository import SQLAlchemyMoodRepository
+from src.settings import Settings
+
+
+async def archive(engine: AsyncEngine, older_than: timedelta, batch_size: int) -> int:
+    """Arquiva em lotes os humores com mais de older_than de idade, retornando quantos foram"""
+    total = 0
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repository = SQLAlchemyMoodRepository(session)
+        unit_of_work = SQLAlchemyUnitOfWork(session)
+        while archived := await repository.archive(older_than, batch_size):
+            await unit_of_work.commit()
+            total += archived
+            sys.stderr.write(f'Archived {total} moods\n')
+    return total
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Arquiva os humores antigos')
+    parser.add_argument('--older-than-days', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--poll-seconds', type=float, default=None)
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    if args.older_than_days is None:
+        args.older_than_days = settings.MOOD_ARCHIVE_AFTER_DAYS
+    older_than = timedelta(days=args.older_than_days)
+
+    async def run():
+        engine = create_engine(settings)
+        try:
+            total = await archive(engine, older_than, args.batch_size)
+            while args.poll_seconds is not None:
+                await asyncio.sleep(args.poll_seconds)
+                total += await archive(engine, older_than, args.batch_size)
+            return total
+        finally:
+            await engine.dispose()
+
+    total = asyncio.run(run())
+    sys.stdout.write(f'{total} moods archived\n')
+
+
+if __name__ == '__main__':
+    main()
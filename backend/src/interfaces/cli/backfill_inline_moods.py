@@ -0,0 +1,60 @@
+"""
+Preenche as colunas inline dos humores a partir das tabelas de emoções e gatilhos.
+
+Uso:
+    python -m src.interfaces.cli.backfill_inline_moods --batch-size 1000
+
+Rode antes de trocar MOOD_STORAGE para inline e mais uma vez depois da troca, para copiar
+os humores gravados ou editados pelo layout normalizado nesse meio tempo. Cada lote é uma
+transação curta, então o comando pode ser interrompido e executado de novo.
+
+A troca só vai em um sentido: no modo inline as emoções e gatilhos são gravados apenas nas
+colunas inline, e não há cópia de volta para as tabelas normalizadas. Voltar MOOD_STORAGE
+para normalized depois disso esconde os filhos dos humores criados ou editados no modo inline.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.infrastructure.database.session import create_engine
+from src.infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.inline_mood_repository import SQLAlchemyInlineMoodRepository
+from src.settings import Settings
+
+
+async def backfill(engine: AsyncEngine, batch_size: int) -> int:
+    """Copia todos os humores pendentes em lotes, retornando quantos foram preenchidos"""
+    total = 0
+    after_id = None
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repository = SQLAlchemyInlineMoodRepository(session)
+        unit_of_work = SQLAlchemyUnitOfWork(session)
+        while mood_ids := await repository.backfill(batch_size, after_id):
+            await unit_of_work.commit()
+            total += len(mood_ids)
+            after_id = mood_ids[-1]
+            sys.stderr.write(f'Backfilled {total} moods\n')
+    return total
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Preenche as colunas inline dos humores')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    async def run():
+        engine = create_engine(Settings())
+        try:
+            return await backfill(engine, args.batch_size)
+        finally:
+            await engine.dispose()
+
+    total = asyncio.run(run())
+    sys.stdout.write(f'{total} moods backfilled\n')
+
+
+if __name__ == '__main__':
+    main()
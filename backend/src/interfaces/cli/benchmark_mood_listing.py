@@ -0,0 +1,146 @@
+"""
+Compara a listagem de humores pelas entidades e pelos documentos JSON montados no banco.
+
+Uso:
+    python -m src.interfaces.cli.benchmark_mood_listing --moods 1000 --page-size 100
+
+Cria um usuário temporário por layout, grava os humores e percorre todas as páginas pelos
+dois caminhos, medindo da consulta até o corpo da resposta serializado. Remove tudo ao final,
+mas use um banco de desenvolvimento, pois o comando escreve dados de verdade.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.domain.services.id_generator import new_id
+from src.infrastructure.database.orm import MoodModel, UserModel
+from src.infrastructure.database.session import create_engine
+from src.interfaces.cli.benchmark_mood_storage import LAYOUTS, sample_mood
+from src.interfaces.http.schemas.mood_schemas import ListMoodsResponse, MoodResponse
+from src.settings import Settings
+
+
+@dataclass(frozen=True)
+class ListingResult:
+    """Medianas, em milissegundos, de uma página por caminho de leitura de um layout"""
+
+    layout: str
+    pages: int
+    entities_ms: float
+    documents_ms: float
+
+
+async def _entities_page(repository, user_id: str, page_size: int, cursor: str | None):
+    # What the endpoint used to do: ORM rows, entities, response models, then JSON
+    page = await repository.list_moods(user_id, 0, page_size, cursor)
+    body = ListMoodsResponse(
+        moods=[MoodResponse.from_entity(mood) for mood in page.items],
+        next_cursor=page.next_cursor,
+    ).model_dump_json()
+    return body, page.next_cursor
+
+
+async def _documents_page(repository, user_id: str, page_size: int, cursor: str | None):
+    page = await repository.list_mood_documents(user_id, 0, page_size, cursor)
+    return ListMoodsResponse.render(page), page.next_cursor
+
+
+async def _walk_pages(session: AsyncSession, read_page, repository, user_id, page_size):
+    timings = []
+    cursor = None
+    while True:
+        # Without this the identity map would serve the entity path from memory
+        session.expunge_all()
+        start = time.perf_counter()
+        _, cursor = await read_page(repository, user_id, page_size, cursor)
+        timings.append((time.perf_counter() - start) * 1000)
+        if cursor is None:
+            return timings
+
+
+async def benchmark_listing(
+    session: AsyncSession, layout: str, moods: int, page_size: int, rounds: int
+) -> ListingResult:
+    """Mede as duas formas de listar os humores de um layout com um usuário temporário"""
+    repository = LAYOUTS[layout](session)
+    user_id = new_id()
+    session.add(
+        UserModel(
+            id=user_id,
+            username=f'benchmark-{user_id}',
+            email=f'benchmark-{user_id}@example.com',
+            password='not-a-password-hash',
+        )
+    )
+    await session.commit()
+    for start in range(0, moods, page_size):
+        await repository.save_many([
+            sample_mood(user_id, index) for index in range(start, min(start + page_size, moods))
+        ])
+        await session.commit()
+
+    entities_timings, documents_timings = [], []
+    for _ in range(rounds):
+        # Alternated, so neither path always runs against the warmer cache
+        entities_timings += await _walk_pages(
+            session, _entities_page, repository, user_id, page_size
+        )
+        documents_timings += await _walk_pages(
+            session, _documents_page, repository, user_id, page_size
+        )
+
+    await session.execute(delete(MoodModel).where(MoodModel.user_id == user_id))
+    await session.execute(delete(UserModel).where(UserModel.id == user_id))
+    await session.commit()
+
+    return ListingResult(
+        layout=layout,
+        pages=len(entities_timings) // rounds,
+        entities_ms=statistics.median(entities_timings),
+        documents_ms=statistics.median(documents_timings),
+    )
+
+
+async def benchmark(
+    engine: AsyncEngine, moods: int, page_size: int, rounds: int
+) -> list[ListingResult]:
+    results = []
+    for layout in LAYOUTS:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            results.append(await benchmark_listing(session, layout, moods, page_size, rounds))
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Compara os caminhos de listagem de humores')
+    parser.add_argument('--moods', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    async def run():
+        engine = create_engine(Settings())
+        try:
+            return await benchmark(engine, args.moods, args.page_size, args.rounds)
+        finally:
+            await engine.dispose()
+
+    results = asyncio.run(run())
+
+    sys.stdout.write(f'{"layout":<12}{"pages":>8}{"entities ms":>14}{"documents ms":>14}\n')
+    for result in results:
+        sys.stdout.write(
+            f'{result.layout:<12}{result.pages:>8}{result.entities_ms:>14.2f}'
+            f'{result.documents_ms:>14.2f}\n'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Compara o layout normalizado e o inline dos humores no banco configurado em DATABASE_URL.
+
+Uso:
+    python -m src.interfaces.cli.benchmark_mood_storage --moods 1000 --reads 200
+
+Cria um usuário temporário por layout, grava e lê humores com cada repositório e remove
+tudo ao final. Use um banco de desenvolvimento, pois o comando escreve dados de verdade.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.domain.entities.mood import Mood
+from src.domain.services.id_generator import new_id
+from src.infrastructure.database.orm import (
+    AssociatedEmotionsModel,
+    EmotionalTriggerModel,
+    MoodModel,
+    UserModel,
+)
+from src.infrastructure.database.session import create_engine
+from src.infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.inline_mood_repository import SQLAlchemyInlineMoodRepository
+from src.infrastructure.repositories.mood_repository import SQLAlchemyMoodRepository
+from src.settings import Settings
+
+LAYOUTS = {
+    'normalized': SQLAlchemyMoodRepository,
+    'inline': SQLAlchemyInlineMoodRepository,
+}
+
+
+@dataclass(frozen=True)
+class LayoutResult:
+    """Medianas, em milissegundos, e tamanho médio em bytes de um layout"""
+
+    layout: str
+    write_ms: float
+    read_ms: float
+    page_ms: float
+    statements_per_read: int
+    bytes_per_mood: float
+
+
+def sample_mood(user_id: str, index: int) -> Mood:
+    return Mood(
+        user_id=user_id,
+        registry_type='daily',
+        visual_scale=index % 5 + 1,
+        associated_emotions=[
+            {'name': 'joy', 'intensity': index % 10 + 1},
+            {'name': 'fear', 'intensity': 3},
+        ],
+        triggers=[{'name': f'trigger {index}'}, {'name': 'work'}],
+        description=f'Benchmark mood {index}',
+    )
+
+
+async def _elapsed_ms(coroutine) -> float:
+    start = time.perf_counter()
+    await coroutine
+    return (time.perf_counter() - start) * 1000
+
+
+async def _save(repository, unit_of_work: SQLAlchemyUnitOfWork, mood: Mood) -> None:
+    await repository.save(mood)
+    await unit_of_work.commit()
+
+
+async def _bytes_per_mood(session: AsyncSession, user_id: str, moods: int) -> float:
+    mood_ids = select(MoodModel.id).where(MoodModel.user_id == user_id)
+    total = 0
+    for model, where in (
+        (MoodModel, MoodModel.user_id == user_id),
+        (AssociatedEmotionsModel, AssociatedEmotionsModel.mood_id.in_(mood_ids)),
+        (EmotionalTriggerModel, EmotionalTriggerModel.mood_id.in_(mood_ids)),
+    ):
+        table = model.__table__
+        total += await session.scalar(
+            select(func.coalesce(func.sum(func.pg_column_size(table.table_valued())), 0))
+            .select_from(table)
+            .where(where)
+        )
+    return total / moods
+
+
+async def benchmark_layout(
+    session: AsyncSession, layout: str, moods: int, reads: int, page_size: int
+) -> LayoutResult:
+    """Mede escrita, leitura por id e paginação de um layout com um usuário temporário"""
+    repository = LAYOUTS[layout](session)
+    unit_of_work = SQLAlchemyUnitOfWork(session)
+    user_id = new_id()
+    session.add(
+        UserModel(
+            id=user_id,
+            username=f'benchmark-{user_id}',
+            email=f'benchmark-{user_id}@example.com',
+            password='not-a-password-hash',
+        )
+    )
+    await session.commit()
+
+    write_timings = []
+    mood_ids = []
+    for index in range(moods):
+        mood = sample_mood(user_id, index)
+        write_timings.append(await _elapsed_ms(_save(repository, unit_of_work, mood)))
+        mood_ids.append(mood.id)
+
+    statements = []
+
+    def count_hook(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    read_timings = []
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', count_hook)
+    for mood_id in random.sample(mood_ids, min(reads, moods)):
+        # Without this the identity map would skip the child loads of the normalized layout
+        session.expunge_all()
+        read_timings.append(await _elapsed_ms(repository.find_mood_by_id(mood_id, user_id)))
+    event.remove(sync_engine, 'before_cursor_execute', count_hook)
+
+    page_timings = []
+    cursor = None
+    while True:
+        session.expunge_all()
+        start = time.perf_counter()
+        page = await repository.list_moods(user_id, 0, page_size, cursor)
+        page_timings.append((time.perf_counter() - start) * 1000)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    bytes_per_mood = await _bytes_per_mood(session, user_id, moods)
+    await _cleanup(session, user_id)
+
+    return LayoutResult(
+        layout=layout,
+        write_ms=statistics.median(write_timings),
+        read_ms=statistics.median(read_timings),
+        page_ms=statistics.median(page_timings),
+        statements_per_read=len(statements) // len(read_timings),
+        bytes_per_mood=bytes_per_mood,
+    )
+
+
+async def _cleanup(session: AsyncSession, user_id: str) -> None:
+    mood_ids = select(MoodModel.id).where(MoodModel.user_id == user_id)
+    await session.execute(
+        delete(AssociatedEmotionsModel).where(AssociatedEmotionsModel.mood_id.in_(mood_ids))
+    )
+    await session.execute(
+        delete(EmotionalTriggerModel).where(EmotionalTriggerModel.mood_id.in_(mood_ids))
+    )
+    await session.execute(delete(MoodModel).where(MoodModel.user_id == user_id))
+    await session.execute(delete(UserModel).where(UserModel.id == user_id))
+    await session.commit()
+
+
+async def benchmark(
+    engine: AsyncEngine, moods: int, reads: int, page_size: int
+) -> list[LayoutResult]:
+    results = []
+    for layout in LAYOUTS:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            results.append(await benchmark_layout(session, layout, moods, reads, page_size))
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Compara os layouts de armazenamento de humores')
+    parser.add_argument('--moods', type=int, default=1000)
+    parser.add_argument('--reads', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    async def run():
+        engine = create_engine(Settings())
+        try:
+            return await benchmark(engine, args.moods, args.reads, args.page_size)
+        finally:
+            await engine.dispose()
+
+    results = asyncio.run(run())
+
+    sys.stdout.write(
+        f'{"layout":<12}{"write ms":>10}{"read ms":>10}{"page ms":>10}'
+        f'{"stmts/read":>12}{"bytes/mood":>12}\n'
+    )
+    for result in results:
+        sys.stdout.write(
+            f'{result.layout:<12}{result.write_ms:>10.2f}{result.read_ms:>10.2f}'
+            f'{result.page_ms:>10.2f}{result.statements_per_read:>12}'
+            f'{result.bytes_per_mood:>12.0f}\n'
+        )
+
+
+if __name__ == '__main__':
+    main()
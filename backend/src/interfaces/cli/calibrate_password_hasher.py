@@ -0,0 +1,86 @@
+"""
+Calibra os parâmetros do Argon2 para uma latência alvo no host atual.
+
+Uso:
+    python -m src.interfaces.cli.calibrate_password_hasher --target-ms 250
+
+A saída pode ser copiada para o arquivo .env. Hashes gerados com parâmetros antigos
+são refeitos de forma transparente no próximo login de cada usuário.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from src.domain.services.password import Argon2Parameters, PasswordService
+
+MIN_MEMORY_COST = 19456
+MAX_TIME_COST = 10
+
+
+def benchmark(parameters: Argon2Parameters, samples: int) -> float:
+    """Retorna a mediana, em milissegundos, do tempo de hashing com os parâmetros"""
+    password_service = PasswordService(parameters)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        password_service.hash_password('calibration-Password123')
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target_ms: float, max_memory_cost: int, parallelism: int, samples: int
+) -> tuple[Argon2Parameters, float]:
+    """
+    Busca os parâmetros mais custosos cujo hashing ainda cabe na latência alvo.
+
+    Primeiro reduz a memória até que uma única iteração caiba no alvo, depois aumenta
+    o número de iterações enquanto a latência medida continuar abaixo do alvo.
+    """
+    memory_cost = max_memory_cost
+    parameters = Argon2Parameters(time_cost=1, memory_cost=memory_cost, parallelism=parallelism)
+    elapsed = benchmark(parameters, samples)
+    while elapsed > target_ms and memory_cost > MIN_MEMORY_COST:
+        memory_cost = max(memory_cost // 2, MIN_MEMORY_COST)
+        parameters = Argon2Parameters(time_cost=1, memory_cost=memory_cost, parallelism=parallelism)
+        elapsed = benchmark(parameters, samples)
+
+    while parameters.time_cost < MAX_TIME_COST:
+        candidate = Argon2Parameters(
+            time_cost=parameters.time_cost + 1, memory_cost=memory_cost, parallelism=parallelism
+        )
+        candidate_elapsed = benchmark(candidate, samples)
+        if candidate_elapsed > target_ms:
+            break
+        parameters, elapsed = candidate, candidate_elapsed
+
+    return parameters, elapsed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Calibra os parâmetros do Argon2')
+    parser.add_argument('--target-ms', type=float, default=250.0)
+    parser.add_argument('--max-memory-cost', type=int, default=65536, help='Memória em KiB')
+    parser.add_argument('--parallelism', type=int, default=4)
+    parser.add_argument('--samples', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    parameters, elapsed = calibrate(
+        target_ms=args.target_ms,
+        max_memory_cost=args.max_memory_cost,
+        parallelism=args.parallelism,
+        samples=args.samples,
+    )
+
+    sys.stderr.write(f'Median hashing time: {elapsed:.1f} ms (target {args.target_ms} ms)\n')
+    sys.stdout.write(
+        f'ARGON2_TIME_COST={parameters.time_cost}\n'
+        f'ARGON2_MEMORY_COST={parameters.memory_cost}\n'
+        f'ARGON2_PARALLELISM={parameters.parallelism}\n'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Cria as partições mensais de moods, associated_emotions e emotional_triggers.
+
+Uso:
+    python -m src.interfaces.cli.create_mood_partitions --months-ahead 3
+    python -m src.interfaces.cli.create_mood_partitions --poll-seconds 3600
+
+Roda a cada subida do container, antes da API, e com --poll-seconds não termina: roda como
+worker, criando as partições que faltarem a cada intervalo, para que uma API que fica no ar por
+meses não passe das partições criadas na subida. As partições são criadas com antecedência
+porque um mês sem partição cai na partição padrão, e uma partição mensal não pode ser criada
+depois que a padrão já tem linhas daquele mês. O comando é idempotente e seguro para rodar em
+paralelo.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.database.partitions import create_mood_partitions
+from src.infrastructure.database.session import create_engine
+from src.settings import Settings
+
+
+async def create_partitions(engine: AsyncEngine, months_ahead: int) -> list[str]:
+    """Cria as partições que faltam até months_ahead meses à frente, retornando seus nomes"""
+    async with engine.begin() as connection:
+        return await create_mood_partitions(connection, date.today(), months_ahead)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Cria as partições mensais dos humores')
+    parser.add_argument('--months-ahead', type=int, default=3)
+    parser.add_argument('--poll-seconds', type=float, default=None)
+    args = parser.parse_args(argv)
+
+    async def create_and_report(engine: AsyncEngine) -> int:
+        created = await create_partitions(engine, args.months_ahead)
+        for name in created:
+            sys.stdout.write(f'Created partition {name}\n')
+        return len(created)
+
+    async def run():
+        engine = create_engine(Settings())
+        try:
+            total = await create_and_report(engine)
+            while args.poll_seconds is not None:
+                await asyncio.sleep(args.poll_seconds)
+                total += await create_and_report(engine)
+            return total
+        finally:
+            await engine.dispose()
+
+    total = asyncio.run(run())
+    sys.stdout.write(f'{total} partitions created\n')
+
+
+if __name__ == '__main__':
+    main()
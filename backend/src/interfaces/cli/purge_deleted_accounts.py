@@ -0,0 +1,70 @@
+"""
+Remove os dados das contas excluídas, em lotes, até a fila de exclusões esvaziar.
+
+Uso:
+    python -m src.interfaces.cli.purge_deleted_accounts --batch-size 500
+    python -m src.interfaces.cli.purge_deleted_accounts --poll-seconds 30
+
+Cada lote remove até --batch-size humores de uma conta em uma transação curta e grava o
+progresso junto, então o comando pode ser interrompido e retoma de onde parou. Com
+--poll-seconds o comando não termina: roda como worker, voltando a olhar a fila a cada
+intervalo quando ela estiver vazia.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.application.use_cases.users import purge_deleted_account
+from src.infrastructure.database.session import create_engine
+from src.infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.account_deletion_repository import (
+    SQLAlchemyAccountDeletionRepository,
+)
+from src.settings import Settings
+
+
+async def purge(engine: AsyncEngine, batch_size: int) -> int:
+    """Processa a fila de exclusões até ela esvaziar, retornando quantas contas foram removidas"""
+    completed = 0
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repository = SQLAlchemyAccountDeletionRepository(session)
+        unit_of_work = SQLAlchemyUnitOfWork(session)
+        while progress := await purge_deleted_account(unit_of_work, repository, batch_size):
+            if progress.completed:
+                completed += 1
+                sys.stderr.write(
+                    f'Purged user {progress.user_id} ({progress.moods_purged} moods)\n'
+                )
+    return completed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Remove os dados das contas excluídas')
+    parser.add_argument('--batch-size', type=int, default=None)
+    parser.add_argument('--poll-seconds', type=float, default=None)
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    if args.batch_size is None:
+        args.batch_size = settings.ACCOUNT_PURGE_BATCH_SIZE
+
+    async def run():
+        engine = create_engine(settings)
+        try:
+            total = await purge(engine, args.batch_size)
+            while args.poll_seconds is not None:
+                await asyncio.sleep(args.poll_seconds)
+                total += await purge(engine, args.batch_size)
+            return total
+        finally:
+            await engine.dispose()
+
+    total = asyncio.run(run())
+    sys.stdout.write(f'{total} accounts purged\n')
+
+
+if __name__ == '__main__':
+    main()
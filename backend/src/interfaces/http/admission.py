@@ -0,0 +1,201 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from src.settings import Settings
+
+
+class AdmissionRejectedError(Exception):
+    """Exceção para requisições rejeitadas pelo controle de admissão"""
+
+    def __init__(self, retry_after: float):
+        super().__init__('Server is busy, try again later')
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Limita as requisições simultâneas de uma rota, com fila de espera limitada"""
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self._max_concurrency = max_concurrency
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self):
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self._max_concurrency and not self._waiters:
+            self._in_flight += 1
+            return
+
+        if len(self._waiters) >= self._max_queue:
+            raise AdmissionRejectedError(retry_after=self._queue_timeout)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self._queue_timeout)
+        except BaseException as e:
+            # Timed out or cancelled: a slot handed over meanwhile goes to the next waiter,
+            # otherwise the waiter leaves the queue, so no slot is left held by nobody
+            if waiter.done():
+                self._release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                raise AdmissionRejectedError(retry_after=self._queue_timeout)
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+
+class TokenBucketLimiter:
+    """Rate limiter por chave usando token bucket, com número limitado de chaves"""
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int):
+        self._capacity = capacity
+        self._refill_per_second = refill_per_second
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def consume(self, key: str) -> float:
+        """Consome um token da chave, retornando 0 se admitido ou os segundos até o próximo"""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (self._capacity, now))
+        tokens = min(self._capacity, tokens + (now - updated_at) * self._refill_per_second)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / self._refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+
+        return retry_after
+
+
+class AuthAdmission:
+    """Controle de admissão das rotas de autenticação"""
+
+    def __init__(
+        self,
+        login_limiter: ConcurrencyLimiter,
+        signup_limiter: ConcurrencyLimiter,
+        ip_rate_limiter: TokenBucketLimiter,
+        account_rate_limiter: TokenBucketLimiter,
+    ):
+        self.login_limiter = login_limiter
+        self.signup_limiter = signup_limiter
+        self.ip_rate_limiter = ip_rate_limiter
+        self.account_rate_limiter = account_rate_limiter
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'AuthAdmission':
+        def concurrency_limiter() -> ConcurrencyLimiter:
+            return ConcurrencyLimiter(
+                max_concurrency=settings.AUTH_MAX_CONCURRENCY,
+                max_queue=settings.AUTH_MAX_QUEUE,
+                queue_timeout=settings.AUTH_QUEUE_TIMEOUT_SECONDS,
+            )
+
+        return cls(
+            login_limiter=concurrency_limiter(),
+            signup_limiter=concurrency_limiter(),
+            ip_rate_limiter=TokenBucketLimiter(
+                capacity=settings.LOGIN_IP_BUCKET_CAPACITY,
+                refill_per_second=settings.LOGIN_IP_BUCKET_REFILL_PER_SECOND,
+                max_keys=settings.RATE_LIMIT_MAX_KEYS,
+            ),
+            account_rate_limiter=TokenBucketLimiter(
+                capacity=settings.LOGIN_ACCOUNT_BUCKET_CAPACITY,
+                refill_per_second=settings.LOGIN_ACCOUNT_BUCKET_REFILL_PER_SECOND,
+                max_keys=settings.RATE_LIMIT_MAX_KEYS,
+            ),
+        )
+
+
+auth_admission = AuthAdmission.from_settings(Settings())
+
+
+def get_auth_admission() -> AuthAdmission:
+    return auth_admission
+
+
+AuthAdmissionDependency = Annotated[AuthAdmission, Depends(get_auth_admission)]
+OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
+
+
+def _retry_after_header(retry_after: float) -> dict[str, str]:
+    return {'Retry-After': str(max(math.ceil(retry_after), 1))}
+
+
+@asynccontextmanager
+async def _admit(limiter: ConcurrencyLimiter):
+    try:
+        async with limiter.slot():
+            yield
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers=_retry_after_header(e.retry_after),
+        )
+
+
+async def login_admission(
+    request: Request, form_data: OAuth2Form, admission: AuthAdmissionDependency
+):
+    """Dependency que aplica rate limit por IP e por conta e limita logins simultâneos"""
+    client_ip = request.client.host if request.client else 'unknown'
+    for limiter, key in (
+        (admission.ip_rate_limiter, client_ip),
+        (admission.account_rate_limiter, form_data.username.lower()),
+    ):
+        retry_after = limiter.consume(key)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail='Too many login attempts',
+                headers=_retry_after_header(retry_after),
+            )
+
+    async with _admit(admission.login_limiter):
+        yield
+
+
+async def signup_admission(admission: AuthAdmissionDependency):
+    """Dependency que limita cadastros simultâneos"""
+    async with _admit(admission.signup_limiter):
+        yield
@@ -3,17 +3,24 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from src.application.dto.user_dto import CreateUserCommand, LoginCommand
-from src.application.exceptions import EntityAlreadyExistsError
-from src.application.use_cases import create_user, get_access_token
+from src.application.dto.user_dto import CreateUserCommand, LoginCommand, RefreshTokenCommand
+from src.application.exceptions import EntityAlreadyExistsError, EntityNotFoundError
+from src.application.use_cases import create_user, refresh_access_token
+from src.application.use_cases import login as login_uc
 from src.domain.exceptions.user_exceptions import (
     InactiveUserError,
     InvalidCredentialsError,
     UserDomainError,
     UserNotFoundError,
 )
-from src.interfaces.http.dependencies import UserRepositoryDependency
+from src.interfaces.http.admission import login_admission, signup_admission
+from src.interfaces.http.dependencies import (
+    RefreshTokenRepositoryDependency,
+    UnitOfWorkDependency,
+    UserRepositoryDependency,
+)
 from src.interfaces.http.schemas.user_schemas import (
+    RefreshTokenRequest,
     TokenResponse,
     UserRegisterRequest,
     UserResponse,
@@ -24,8 +31,17 @@ router = APIRouter(prefix='/auth', tags=['auth'])
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
 
 
-@router.post('/signup', status_code=status.HTTP_201_CREATED, response_model=UserResponse)
-async def signup(request: UserRegisterRequest, user_repository: UserRepositoryDependency):
+@router.post(
+    '/signup',
+    status_code=status.HTTP_201_CREATED,
+    response_model=UserResponse,
+    dependencies=[Depends(signup_admission)],
+)
+async def signup(
+    request: UserRegisterRequest,
+    unit_of_work: UnitOfWorkDependency,
+    user_repository: UserRepositoryDependency,
+):
     try:
         command = CreateUserCommand(
             username=request.username,
@@ -34,7 +50,7 @@ async def signup(request: UserRegisterRequest, user_repository: UserRepositoryDe
             first_name=request.first_name,
             last_name=request.last_name,
         )
-        user = await create_user(user_repository, command)
+        user = await create_user(unit_of_work, user_repository, command)
         return UserResponse.from_entity(user)
 
     except UserDomainError as e:
@@ -44,13 +60,18 @@ async def signup(request: UserRegisterRequest, user_repository: UserRepositoryDe
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
-@router.post('/login', response_model=TokenResponse)
-async def login(form_data: OAuth2Form, user_repository: UserRepositoryDependency):
+@router.post('/login', response_model=TokenResponse, dependencies=[Depends(login_admission)])
+async def login(
+    form_data: OAuth2Form,
+    unit_of_work: UnitOfWorkDependency,
+    user_repository: UserRepositoryDependency,
+    refresh_token_repository: RefreshTokenRepositoryDependency,
+):
     """Endpoint para autenticação e obtenção de token"""
     try:
         command = LoginCommand(email=form_data.username, password=form_data.password)
-        access_token = await get_access_token(user_repository, command)
-        return TokenResponse(access_token=access_token)
+        tokens = await login_uc(unit_of_work, user_repository, refresh_token_repository, command)
+        return TokenResponse(access_token=tokens.access_token, refresh_token=tokens.refresh_token)
 
     except (InvalidCredentialsError, UserNotFoundError):
         raise HTTPException(
@@ -64,3 +85,32 @@ async def login(form_data: OAuth2Form, user_repository: UserRepositoryDependency
             detail=str(e),
             headers={'WWW-Authenticate': 'Bearer'},
         )
+
+
+@router.post('/refresh_token', response_model=TokenResponse)
+async def refresh_token(
+    request: RefreshTokenRequest,
+    unit_of_work: UnitOfWorkDependency,
+    user_repository: UserRepositoryDependency,
+    refresh_token_repository: RefreshTokenRepositoryDependency,
+):
+    """Endpoint para renovação do token de acesso com rotação do refresh token"""
+    try:
+        command = RefreshTokenCommand(refresh_token=request.refresh_token)
+        tokens = await refresh_access_token(
+            unit_of_work, user_repository, refresh_token_repository, command
+        )
+        return TokenResponse(access_token=tokens.access_token, refresh_token=tokens.refresh_token)
+
+    except (InvalidCredentialsError, EntityNotFoundError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+    except InactiveUserError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e),
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from src.interfaces.http.dependencies import DatabaseDependency, PasswordServiceDependency
+from src.interfaces.http.schemas.health_schemas import (
+    DatabasePoolResponse,
+    PasswordHasherResponse,
+)
+
+router = APIRouter(prefix='/health', tags=['health'])
+
+
+@router.get('/database', response_model=DatabasePoolResponse)
+async def get_database_pool(database: DatabaseDependency):
+    return DatabasePoolResponse.from_metrics(database.pool_metrics())
+
+
+@router.get('/password_hasher', response_model=PasswordHasherResponse)
+async def get_password_hasher(password_service: PasswordServiceDependency):
+    return PasswordHasherResponse.from_metrics(password_service.metrics())
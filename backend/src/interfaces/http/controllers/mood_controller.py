@@ -1,19 +1,37 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import ValidationError
 
 from src.application.dto.mood_dto import GetMoodsCommand, RegisterMoodCommand
-from src.application.use_cases.mood import list_moods, register_mood
-from src.application.use_cases.users import get_current_user
-from src.domain.exceptions.user_exceptions import InsufficientPermissionsError
-from src.interfaces.http.dependencies import MoodRepositoryDependency, UserRepositoryDependency
+from src.application.exceptions import EntityNotFoundError, InvalidCursorError
+from src.application.ports.cache.principal_cache import PrincipalCache
+from src.application.ports.repositories.user_repository import UserRepository
+from src.application.use_cases.mood import list_mood_documents, register_mood, register_moods
+from src.application.use_cases.users import get_current_principal
+from src.domain.entities.principal import Principal
+from src.domain.entities.user import User
+from src.domain.exceptions.user_exceptions import (
+    InactiveUserError,
+    InsufficientPermissionsError,
+    InvalidCredentialsError,
+)
+from src.interfaces.http.dependencies import (
+    MoodRepositoryDependency,
+    PrincipalCacheDependency,
+    ReadMoodRepositoryDependency,
+    UnitOfWorkDependency,
+    UserRepositoryDependency,
+)
 from src.interfaces.http.schemas.mood_schemas import (
     FilterQueryMoods,
     ListMoodsResponse,
     MoodResponse,
     RegisterMoodRequest,
+    RegisterMoodResultResponse,
+    RegisterMoodsBatchRequest,
+    RegisterMoodsBatchResponse,
 )
 
 router = APIRouter(prefix='/users/{user_id}/moods', tags=['moods'])
@@ -21,26 +39,49 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login', refreshUrl='/auth/r
 TokenDependency = Annotated[str, Depends(oauth2_scheme)]
 
 
+async def _authenticate(
+    token: str, user_repository: UserRepository, principal_cache: PrincipalCache
+) -> User | Principal:
+    # On the primary: a lagging replica would hand a revoked token's old version to the cache
+    try:
+        return await get_current_principal(user_repository, token, principal_cache)
+    except (InvalidCredentialsError, InactiveUserError, EntityNotFoundError) as e:
+        # EntityNotFoundError: the token outlived its account, already purged
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+
+
 @router.get('/', response_model=ListMoodsResponse)
 async def get_moods(
     user_id: str,
     token: TokenDependency,
     user_repository: UserRepositoryDependency,
-    mood_repository: MoodRepositoryDependency,
+    principal_cache: PrincipalCacheDependency,
+    mood_repository: ReadMoodRepositoryDependency,
     filter_query: Annotated[FilterQueryMoods, Query()],
 ):
-    current_user = await get_current_user(user_repository, token)
+    current_user = await _authenticate(token, user_repository, principal_cache)
 
     try:
         command = GetMoodsCommand(
-            user_id=user_id, offset=filter_query.offset, limit=filter_query.limit
+            user_id=user_id,
+            offset=filter_query.offset,
+            limit=filter_query.limit,
+            cursor=filter_query.cursor,
+            filters=filter_query.to_filters(),
         )
 
-        moods = await list_moods(mood_repository, command, current_user)
+        page = await list_mood_documents(mood_repository, command, current_user)
 
-        return ListMoodsResponse(moods=[MoodResponse.from_entity(mood) for mood in moods])
+        # The database already built each mood as JSON, so the body skips the response model
+        return Response(content=ListMoodsResponse.render(page), media_type='application/json')
     except InsufficientPermissionsError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post('/', response_model=MoodResponse, status_code=status.HTTP_201_CREATED)
@@ -49,9 +90,11 @@ async def create_mood(
     mood: RegisterMoodRequest,
     token: TokenDependency,
     user_repository: UserRepositoryDependency,
+    principal_cache: PrincipalCacheDependency,
+    unit_of_work: UnitOfWorkDependency,
     mood_repository: MoodRepositoryDependency,
 ):
-    current_user = await get_current_user(user_repository, token)
+    current_user = await _authenticate(token, user_repository, principal_cache)
 
     try:
         command = RegisterMoodCommand(
@@ -63,7 +106,7 @@ async def create_mood(
             description=mood.description,
         )
 
-        created_mood = await register_mood(mood_repository, command, current_user)
+        created_mood = await register_mood(unit_of_work, mood_repository, command, current_user)
 
         return MoodResponse.from_entity(created_mood)
 
@@ -71,3 +114,40 @@ async def create_mood(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    '/batch', response_model=RegisterMoodsBatchResponse, status_code=status.HTTP_207_MULTI_STATUS
+)
+async def create_moods_batch(
+    user_id: str,
+    batch: RegisterMoodsBatchRequest,
+    token: TokenDependency,
+    user_repository: UserRepositoryDependency,
+    principal_cache: PrincipalCacheDependency,
+    unit_of_work: UnitOfWorkDependency,
+    mood_repository: MoodRepositoryDependency,
+):
+    current_user = await _authenticate(token, user_repository, principal_cache)
+
+    try:
+        commands = [
+            RegisterMoodCommand(
+                user_id=user_id,
+                registry_type=mood.registry_type,
+                visual_scale=mood.visual_scale,
+                associated_emotions=mood.associated_emotions,
+                triggers=mood.triggers,
+                description=mood.description,
+            )
+            for mood in batch.moods
+        ]
+
+        results = await register_moods(unit_of_work, mood_repository, commands, current_user)
+
+        return RegisterMoodsBatchResponse(
+            results=[RegisterMoodResultResponse.from_result(result) for result in results]
+        )
+
+    except InsufficientPermissionsError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
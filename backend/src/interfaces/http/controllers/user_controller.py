@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from typing_extensions import Annotated
 
-from src.application.dto.user_dto import GetUsersCommand, UpdateUserCommand
-from src.application.exceptions import EntityAlreadyExistsError, EntityNotFoundError
+from src.application.dto.user_dto import DeleteUserCommand, GetUsersCommand, UpdateUserCommand
+from src.application.exceptions import (
+    EntityAlreadyExistsError,
+    EntityNotFoundError,
+    InvalidCursorError,
+)
+from src.application.ports.cache.principal_cache import PrincipalCache
+from src.application.ports.repositories.user_repository import UserRepository
+from src.application.use_cases import delete_user as delete_user_uc
 from src.application.use_cases import get_current_user, list_users
 from src.application.use_cases import update_user as update_user_uc
+from src.domain.entities.user import User
 from src.domain.exceptions.user_exceptions import InsufficientPermissionsError
-from src.interfaces.http.dependencies import UserRepositoryDependency
+from src.interfaces.http.dependencies import (
+    AccountDeletionRepositoryDependency,
+    PrincipalCacheDependency,
+    ReadUserRepositoryDependency,
+    UnitOfWorkDependency,
+    UserRepositoryDependency,
+)
 from src.interfaces.http.schemas.user_schemas import (
     UserListResponse,
     UserResponse,
@@ -19,35 +35,61 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login', refreshUrl='/auth/r
 TokenDependency = Annotated[str, Depends(oauth2_scheme)]
 
 
+async def _authenticate(
+    token: str, user_repository: UserRepository, principal_cache: PrincipalCache
+) -> User:
+    # On the primary: a lagging replica would hand a revoked user's old state to the cache
+    try:
+        return await get_current_user(user_repository, token, principal_cache)
+    except EntityNotFoundError as e:
+        # The token outlived its account, already purged
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+
+
 @router.get('/', response_model=UserListResponse)
 async def get_users(
     user_repository: UserRepositoryDependency,
+    read_user_repository: ReadUserRepositoryDependency,
+    principal_cache: PrincipalCacheDependency,
     token: TokenDependency,
-    offset=Query(0, ge=0),
-    limit=Query(10, ge=1, le=100),
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Annotated[Optional[str], Query()] = None,
 ):
     try:
-        current_user = await get_current_user(user_repository, token)
+        current_user = await _authenticate(token, user_repository, principal_cache)
         command = GetUsersCommand(
             offset=offset,
             limit=limit,
+            cursor=cursor,
             is_admin=current_user.is_admin,
             is_active=current_user.is_active,
         )
-        users = await list_users(user_repository, command)
-        return UserListResponse(users=[UserResponse.from_entity(user) for user in users])
+        page = await list_users(read_user_repository, command)
+        return UserListResponse(
+            users=[UserResponse.from_entity(user) for user in page.items],
+            next_cursor=page.next_cursor,
+        )
     except InsufficientPermissionsError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.put('/{user_id}', response_model=UserResponse)
 async def update_user(
     user_id: str,
+    unit_of_work: UnitOfWorkDependency,
     user_repository: UserRepositoryDependency,
+    principal_cache: PrincipalCacheDependency,
     request: UserUpdateRequest,
     token: TokenDependency,
 ):
-    current_user = await get_current_user(user_repository, token)
+    current_user = await _authenticate(token, user_repository, principal_cache)
     try:
         command = UpdateUserCommand(
             user_id=user_id,
@@ -55,7 +97,7 @@ async def update_user(
             first_name=request.first_name,
             last_name=request.last_name,
         )
-        user = await update_user_uc(user_repository, command, current_user)
+        user = await update_user_uc(unit_of_work, user_repository, command, current_user)
         return UserResponse.from_entity(user)
 
     except EntityNotFoundError as e:
@@ -64,3 +106,27 @@ async def update_user(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except EntityAlreadyExistsError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.delete('/{user_id}', status_code=status.HTTP_202_ACCEPTED)
+async def delete_user(
+    user_id: str,
+    unit_of_work: UnitOfWorkDependency,
+    user_repository: UserRepositoryDependency,
+    account_deletion_repository: AccountDeletionRepositoryDependency,
+    principal_cache: PrincipalCacheDependency,
+    token: TokenDependency,
+):
+    current_user = await _authenticate(token, user_repository, principal_cache)
+    try:
+        command = DeleteUserCommand(user_id=user_id)
+        await delete_user_uc(
+            unit_of_work, user_repository, account_deletion_repository, command, current_user
+        )
+        # Accepted: the account is closed now, its moods are purged in the background
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+
+    except EntityNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except InsufficientPermissionsError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
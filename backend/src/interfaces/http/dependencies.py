@@ -1,26 +1,158 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from src.application.ports.cache.principal_cache import PrincipalCache
+from src.application.ports.database.unit_of_work import UnitOfWork
+from src.application.ports.repositories.account_deletion_repository import (
+    AccountDeletionRepository,
+)
 from src.application.ports.repositories.mood_repository import MoodRepository
+from src.application.ports.repositories.refresh_token_repository import RefreshTokenRepository
 from src.application.ports.repositories.user_repository import UserRepository
-from src.infrastructure.database.session import get_session
+from src.domain.services.jwt_token import JWTTokenService
+from src.domain.services.password import AsyncPasswordService, async_password_service
+from src.infrastructure.cache.principal_cache import get_principal_cache
+from src.infrastructure.cache.recent_writers import RecentWriters, get_recent_writers
+from src.infrastructure.cache.trigger_vocabulary import TriggerVocabulary, get_trigger_vocabulary
+from src.infrastructure.database.session import (
+    Database,
+    get_database,
+    get_replica_session,
+    get_session,
+)
+from src.infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.account_deletion_repository import (
+    SQLAlchemyAccountDeletionRepository,
+)
+from src.infrastructure.repositories.inline_mood_repository import SQLAlchemyInlineMoodRepository
 from src.infrastructure.repositories.mood_repository import SQLAlchemyMoodRepository
+from src.infrastructure.repositories.refresh_token_repository import (
+    SQLAlchemyRefreshTokenRepository,
+)
 from src.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from src.settings import Settings
 
-AsyncSessionDependency = Annotated[AsyncSession, Depends(get_session)]
+MOOD_REPOSITORIES = {
+    'normalized': SQLAlchemyMoodRepository,
+    'inline': SQLAlchemyInlineMoodRepository,
+}
 
+DatabaseDependency = Annotated[Database, Depends(get_database)]
+PrincipalCacheDependency = Annotated[PrincipalCache, Depends(get_principal_cache)]
+RecentWritersDependency = Annotated[RecentWriters, Depends(get_recent_writers)]
+TriggerVocabularyDependency = Annotated[TriggerVocabulary, Depends(get_trigger_vocabulary)]
 
-def user_repository(session: AsyncSessionDependency) -> UserRepository:
+
+def password_service() -> AsyncPasswordService:
+    """Dependency para o serviço de senhas compartilhado pelo processo"""
+    return async_password_service
+
+
+PasswordServiceDependency = Annotated[AsyncPasswordService, Depends(password_service)]
+
+
+def _token_subject(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    try:
+        return JWTTokenService().decode_token(token).get('sub')
+    except Exception:
+        return None
+
+
+@event.listens_for(Session, 'after_commit')
+def _record_writer(session: Session) -> None:
+    recent_writers, subject = session.info.get('read_your_writes', (None, None))
+    if subject is not None:
+        recent_writers.record(subject)
+
+
+def primary_session(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    recent_writers: RecentWritersDependency,
+) -> AsyncSession:
+    """Dependency para a sessão no primário, que registra o autor de cada commit"""
+    session.info['read_your_writes'] = (recent_writers, _token_subject(request))
+    return session
+
+
+AsyncSessionDependency = Annotated[AsyncSession, Depends(primary_session)]
+
+
+def read_session(
+    primary: AsyncSessionDependency,
+    replica: Annotated[AsyncSession, Depends(get_replica_session)],
+    recent_writers: RecentWritersDependency,
+) -> AsyncSession:
+    """Dependency para leituras, na réplica salvo logo após uma escrita do próprio usuário"""
+    _, subject = primary.info['read_your_writes']
+    if subject is not None and recent_writers.wrote_recently(subject):
+        return primary
+    return replica
+
+
+ReadSessionDependency = Annotated[AsyncSession, Depends(read_session)]
+
+
+def unit_of_work(session: AsyncSessionDependency) -> UnitOfWork:
+    """Dependency para a transação dos repositórios de escrita da requisição"""
+    return SQLAlchemyUnitOfWork(session)
+
+
+UnitOfWorkDependency = Annotated[UnitOfWork, Depends(unit_of_work)]
+
+
+def user_repository(
+    session: AsyncSessionDependency, principal_cache: PrincipalCacheDependency
+) -> UserRepository:
     """Dependency para repositório de usuários"""
-    return SQLAlchemyUserRepository(session)
+    return SQLAlchemyUserRepository(session, principal_cache)
+
+
+def read_user_repository(
+    session: ReadSessionDependency, principal_cache: PrincipalCacheDependency
+) -> UserRepository:
+    """Dependency para repositório de usuários somente leitura"""
+    return SQLAlchemyUserRepository(session, principal_cache)
+
+
+def mood_repository(
+    session: AsyncSessionDependency, trigger_vocabulary: TriggerVocabularyDependency
+) -> MoodRepository:
+    """Dependency para repositório de humores, no layout escolhido em MOOD_STORAGE"""
+    return MOOD_REPOSITORIES[Settings().MOOD_STORAGE](session, trigger_vocabulary)
+
+
+def read_mood_repository(
+    session: ReadSessionDependency, trigger_vocabulary: TriggerVocabularyDependency
+) -> MoodRepository:
+    """Dependency para repositório de humores somente leitura"""
+    return MOOD_REPOSITORIES[Settings().MOOD_STORAGE](session, trigger_vocabulary)
+
+
+def refresh_token_repository(session: AsyncSessionDependency) -> RefreshTokenRepository:
+    """Dependency para repositório de refresh tokens"""
+    return SQLAlchemyRefreshTokenRepository(session)
 
 
-def mood_repository(session: AsyncSessionDependency) -> MoodRepository:
-    """Dependency para repositório de humores"""
-    return SQLAlchemyMoodRepository(session)
+def account_deletion_repository(session: AsyncSessionDependency) -> AccountDeletionRepository:
+    """Dependency para a fila de exclusões de contas"""
+    return SQLAlchemyAccountDeletionRepository(session)
 
 
 UserRepositoryDependency = Annotated[UserRepository, Depends(user_repository)]
+ReadUserRepositoryDependency = Annotated[UserRepository, Depends(read_user_repository)]
 MoodRepositoryDependency = Annotated[MoodRepository, Depends(mood_repository)]
+ReadMoodRepositoryDependency = Annotated[MoodRepository, Depends(read_mood_repository)]
+RefreshTokenRepositoryDependency = Annotated[
+    RefreshTokenRepository, Depends(refresh_token_repository)
+]
+AccountDeletionRepositoryDependency = Annotated[
+    AccountDeletionRepository, Depends(account_deletion_repository)
+]
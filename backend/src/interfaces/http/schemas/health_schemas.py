@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+
+from src.domain.services.password import PasswordServiceMetrics
+from src.infrastructure.database.session import PoolMetrics
+
+
+class DatabasePoolResponse(BaseModel):
+    """Schema para resposta com as métricas do pool de conexões"""
+
+    size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    average_wait_seconds: float
+    max_wait_seconds: float
+    connects: int
+    average_connect_seconds: float
+
+    @classmethod
+    def from_metrics(cls, metrics: PoolMetrics) -> 'DatabasePoolResponse':
+        """Converte as métricas do pool para schema de resposta"""
+        return cls(
+            size=metrics.size,
+            max_overflow=metrics.max_overflow,
+            checked_out=metrics.checked_out,
+            idle=metrics.idle,
+            overflow=metrics.overflow,
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            average_wait_seconds=metrics.wait_seconds_total / max(metrics.checkouts, 1),
+            max_wait_seconds=metrics.max_wait_seconds,
+            connects=metrics.connects,
+            average_connect_seconds=metrics.connect_seconds_total / max(metrics.connects, 1),
+        )
+
+
+class PasswordHasherResponse(BaseModel):
+    """Schema para resposta com a ocupação do pool de hashing de senhas"""
+
+    max_workers: int
+    in_flight: int
+    queued: int
+
+    @classmethod
+    def from_metrics(cls, metrics: PasswordServiceMetrics) -> 'PasswordHasherResponse':
+        """Converte as métricas do pool de hashing para schema de resposta"""
+        return cls(
+            max_workers=metrics.max_workers,
+            in_flight=metrics.in_flight,
+            queued=metrics.queued,
+        )
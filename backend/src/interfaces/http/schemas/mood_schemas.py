@@ -1,6 +1,13 @@
-from pydantic import BaseModel, ConfigDict, Field
+import json
+from datetime import datetime, timezone
+from typing import Literal
 
-from src.domain.entities.mood import Mood
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from src.application.dto.mood_dto import MoodFilters, RegisterMoodResult
+from src.application.dto.pagination import Page
+from src.domain.entities.associated_emotion import AssociatedEmotionEnum
+from src.domain.entities.mood import Mood, RegistryType
 
 
 class MoodResponse(BaseModel):
@@ -34,6 +41,12 @@ class MoodResponse(BaseModel):
 
 class ListMoodsResponse(BaseModel):
     moods: list[MoodResponse]
+    next_cursor: str | None = None
+
+    @staticmethod
+    def render(page: Page[str]) -> str:
+        """Monta o corpo da resposta a partir dos humores já serializados pelo banco"""
+        return f'{{"moods":[{",".join(page.items)}],"next_cursor":{json.dumps(page.next_cursor)}}}'
 
 
 class RegisterMoodRequest(BaseModel):
@@ -44,6 +57,71 @@ class RegisterMoodRequest(BaseModel):
     description: str
 
 
+class RegisterMoodsBatchRequest(BaseModel):
+    moods: list[RegisterMoodRequest] = Field(..., min_length=1, max_length=100)
+
+
+class RegisterMoodResultResponse(BaseModel):
+    index: int
+    status: Literal['created', 'invalid']
+    mood: MoodResponse | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_result(cls, result: RegisterMoodResult) -> 'RegisterMoodResultResponse':
+        """Converte o resultado de um item do lote para schema de resposta"""
+        if result.error is not None:
+            return cls(index=result.index, status='invalid', error=result.error)
+        return cls(index=result.index, status='created', mood=MoodResponse.from_entity(result.mood))
+
+
+class RegisterMoodsBatchResponse(BaseModel):
+    results: list[RegisterMoodResultResponse]
+
+
 class FilterQueryMoods(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(10, gt=0, le=100)
+    cursor: str | None = None
+    created_from: datetime | None = Field(None, validation_alias='from')
+    created_to: datetime | None = Field(None, validation_alias='to')
+    registry_type: RegistryType | None = None
+    visual_scale_min: int | None = Field(None, ge=1, le=5)
+    visual_scale_max: int | None = Field(None, ge=1, le=5)
+    emotion: AssociatedEmotionEnum | None = None
+    emotion_intensity_min: int | None = Field(None, ge=1, le=10)
+    emotion_intensity_max: int | None = Field(None, ge=1, le=10)
+    trigger: list[str] = Field(default_factory=list)
+
+    @field_validator('created_from', 'created_to')
+    @classmethod
+    def to_utc(cls, value: datetime | None) -> datetime | None:
+        """Converte para UTC sem fuso, como created_at é gravado"""
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @model_validator(mode='after')
+    def validate_ranges(self) -> 'FilterQueryMoods':
+        for lower, upper, name in (
+            (self.created_from, self.created_to, 'from/to'),
+            (self.visual_scale_min, self.visual_scale_max, 'visual_scale'),
+            (self.emotion_intensity_min, self.emotion_intensity_max, 'emotion_intensity'),
+        ):
+            if lower is not None and upper is not None and lower > upper:
+                raise ValueError(f'Invalid {name} range')
+        return self
+
+    def to_filters(self) -> MoodFilters:
+        """Converte os filtros da query para o DTO da aplicação"""
+        return MoodFilters(
+            created_from=self.created_from,
+            created_to=self.created_to,
+            registry_type=self.registry_type,
+            visual_scale_min=self.visual_scale_min,
+            visual_scale_max=self.visual_scale_max,
+            emotion=self.emotion,
+            emotion_intensity_min=self.emotion_intensity_min,
+            emotion_intensity_max=self.emotion_intensity_max,
+            triggers=self.trigger,
+        )
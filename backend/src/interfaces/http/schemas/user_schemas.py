@@ -55,6 +55,7 @@ class UserListResponse(BaseModel):
     """Schema para resposta de lista de usuários"""
 
     users: list[UserResponse]
+    next_cursor: Optional[str] = None
 
 
 class LoginRequest(BaseModel):
@@ -64,8 +65,15 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class RefreshTokenRequest(BaseModel):
+    """Schema para requisição de renovação de token"""
+
+    refresh_token: str
+
+
 class TokenResponse(BaseModel):
     """Schema para resposta de token"""
 
     access_token: str
     token_type: str = 'bearer'
+    refresh_token: Optional[str] = None
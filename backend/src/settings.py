@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +7,44 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore')
 
     DATABASE_URL: str
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30.0
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 30_000
+    DATABASE_PREPARED_STATEMENTS: bool = True
+    DATABASE_PREPARE_THRESHOLD: int = 5
+    DATABASE_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    READ_YOUR_WRITES_MAX_SUBJECTS: int = 100_000
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int
+    JWT_SELF_CONTAINED_CLAIMS: bool = False
+    JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+
+    PASSWORD_HASHER_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASHER_MAX_WORKERS: int = 2
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    AUTH_MAX_CONCURRENCY: int = 4
+    AUTH_MAX_QUEUE: int = 32
+    AUTH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    LOGIN_IP_BUCKET_CAPACITY: int = 20
+    LOGIN_IP_BUCKET_REFILL_PER_SECOND: float = 1.0
+    LOGIN_ACCOUNT_BUCKET_CAPACITY: int = 5
+    LOGIN_ACCOUNT_BUCKET_REFILL_PER_SECOND: float = 0.1
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    # One-way: inline writes never reach the normalized tables, so switching back hides the
+    # children written meanwhile (see src/interfaces/cli/backfill_inline_moods.py)
+    MOOD_STORAGE: Literal['normalized', 'inline'] = 'normalized'
+    TRIGGER_VOCABULARY_CACHE_SIZE: int = 10_000
+    MOOD_ARCHIVE_AFTER_DAYS: int = 365
+    ACCOUNT_PURGE_BATCH_SIZE: int = 500
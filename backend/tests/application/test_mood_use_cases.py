@@ -6,7 +6,13 @@ from src.application.dto.mood_dto import (
     RegisterMoodCommand,
     UpdateMoodCommand,
 )
-from src.application.use_cases.mood import delete_mood, list_moods, register_mood, update_mood
+from src.application.use_cases.mood import (
+    delete_mood,
+    list_moods,
+    register_mood,
+    register_moods,
+    update_mood,
+)
 from src.domain.entities.associated_emotion import AssociatedEmotion
 from src.domain.entities.emotional_trigger import EmotionalTrigger
 from src.domain.exceptions.user_exceptions import InsufficientPermissionsError
@@ -14,7 +20,7 @@ from src.domain.exceptions.user_exceptions import InsufficientPermissionsError
 
 class TestRegisterMood:
     @pytest.mark.asyncio
-    async def test_register_valid_mood(self, mood_repository, user):
+    async def test_register_valid_mood(self, unit_of_work, mood_repository, user):
         command = RegisterMoodCommand(
             user_id=user.id,
             visual_scale=5,
@@ -23,11 +29,11 @@ class TestRegisterMood:
             associated_emotions=[{'name': 'joy', 'intensity': 8}],
             triggers=[{'name': 'saw a rainbow'}],
         )
-        mood = await register_mood(mood_repository, command, user)
+        mood = await register_mood(unit_of_work, mood_repository, command, user)
         assert mood.id is not None
 
     @pytest.mark.asyncio
-    async def test_register_mood_with_unauthorized_user(self, mood_repository, user):
+    async def test_register_mood_with_unauthorized_user(self, unit_of_work, mood_repository, user):
         command = RegisterMoodCommand(
             user_id='invalid_user_id',
             visual_scale=5,
@@ -37,22 +43,69 @@ class TestRegisterMood:
             triggers=[{'name': 'saw a rainbow'}],
         )
         with pytest.raises(InsufficientPermissionsError, match='Not enough permissions'):
-            await register_mood(mood_repository, command, user)
+            await register_mood(unit_of_work, mood_repository, command, user)
+
+
+class TestRegisterMoods:
+    @pytest.mark.asyncio
+    async def test_register_moods_reports_each_item(self, unit_of_work, mood_repository, user):
+        commands = [
+            RegisterMoodCommand(
+                user_id=user.id,
+                visual_scale=visual_scale,
+                registry_type='event',
+                associated_emotions=[{'name': 'joy', 'intensity': 8}],
+            )
+            for visual_scale in (5, 0, 3)
+        ]
+
+        results = await register_moods(unit_of_work, mood_repository, commands, user)
+
+        assert [result.index for result in results] == [0, 1, 2]
+        assert results[0].mood.visual_scale.value == 5
+        assert results[1].mood is None
+        assert results[1].error is not None
+        assert results[2].mood.visual_scale.value == 3
+        page = await list_moods(mood_repository, GetMoodsCommand(user_id=user.id), user)
+        assert {mood.id for mood in page.items} == {results[0].mood.id, results[2].mood.id}
+
+    @pytest.mark.asyncio
+    async def test_register_moods_with_unauthorized_user(self, unit_of_work, mood_repository, user):
+        commands = [
+            RegisterMoodCommand(
+                user_id=user.id,
+                visual_scale=5,
+                registry_type='daily',
+                associated_emotions=[{'name': 'joy', 'intensity': 8}],
+            ),
+            RegisterMoodCommand(
+                user_id='invalid_user_id',
+                visual_scale=5,
+                registry_type='daily',
+                associated_emotions=[{'name': 'joy', 'intensity': 8}],
+            ),
+        ]
+
+        with pytest.raises(InsufficientPermissionsError, match='Not enough permissions'):
+            await register_moods(unit_of_work, mood_repository, commands, user)
+
+        page = await list_moods(mood_repository, GetMoodsCommand(user_id=user.id), user)
+        assert page.items == []
 
 
 class TestListMoods:
     @pytest.mark.asyncio
     async def test_list_moods_as_owner(self, mood_repository, user_with_moods):
         command = GetMoodsCommand(user_id=user_with_moods.id)
-        moods = await list_moods(mood_repository, command, user_with_moods)
-        assert len(moods) == 10
+        page = await list_moods(mood_repository, command, user_with_moods)
+        assert len(page.items) == 10
 
     @pytest.mark.asyncio
     async def test_list_moods_as_admin(self, mood_repository, admin_user, user_with_moods):
         current_user = admin_user
         command = GetMoodsCommand(user_id=user_with_moods.id)
-        moods = await list_moods(mood_repository, command, current_user)
-        assert len(moods) == 10
+        page = await list_moods(mood_repository, command, current_user)
+        assert len(page.items) == 10
 
     @pytest.mark.asyncio
     async def test_list_moods_with_insufficient_permissions(self, mood_repository, user):
@@ -63,7 +116,7 @@ class TestListMoods:
 
 class TestUpdateMood:
     @pytest.mark.asyncio
-    async def test_update_mood_as_owner(self, mood_repository, user_with_moods):
+    async def test_update_mood_as_owner(self, unit_of_work, mood_repository, user_with_moods):
         current_user = user_with_moods
         moods = current_user.moods
         mood_to_update = mood_repository._model_to_entity(moods[0])
@@ -77,14 +130,18 @@ class TestUpdateMood:
             description='Feeling surprised',
         )
 
-        updated_mood = await update_mood(mood_repository, update_command, current_user)
+        updated_mood = await update_mood(
+            unit_of_work, mood_repository, update_command, current_user
+        )
         assert updated_mood.visual_scale.value != mood_to_update.visual_scale.value
         assert updated_mood.associated_emotions == [AssociatedEmotion(name='surprise', intensity=5)]
         assert updated_mood.triggers == [EmotionalTrigger(name='unexpected event')]
         assert updated_mood.description == 'Feeling surprised'
 
     @pytest.mark.asyncio
-    async def test_update_mood_as_admin(self, mood_repository, admin_user, user_with_moods):
+    async def test_update_mood_as_admin(
+        self, unit_of_work, mood_repository, admin_user, user_with_moods
+    ):
         current_user = admin_user
         moods = user_with_moods.moods
         mood_to_update = mood_repository._model_to_entity(moods[0])
@@ -98,14 +155,18 @@ class TestUpdateMood:
             description='Feeling angry',
         )
 
-        updated_mood = await update_mood(mood_repository, update_command, current_user)
+        updated_mood = await update_mood(
+            unit_of_work, mood_repository, update_command, current_user
+        )
         assert updated_mood.visual_scale.value != mood_to_update.visual_scale.value
         assert updated_mood.associated_emotions == [AssociatedEmotion(name='anger', intensity=7)]
         assert updated_mood.triggers == [EmotionalTrigger(name='frustrating event')]
         assert updated_mood.description == 'Feeling angry'
 
     @pytest.mark.asyncio
-    async def test_update_mood_with_insufficient_permissions(self, mood_repository, other_user):
+    async def test_update_mood_with_insufficient_permissions(
+        self, unit_of_work, mood_repository, other_user
+    ):
         current_user = other_user
         # Assuming there's a mood with this ID for testing purposes
         mood_id = 'some_mood_id'
@@ -120,19 +181,19 @@ class TestUpdateMood:
         )
 
         with pytest.raises(InsufficientPermissionsError, match='Not enough permissions'):
-            await update_mood(mood_repository, update_command, current_user)
+            await update_mood(unit_of_work, mood_repository, update_command, current_user)
 
 
 class TestDeleteMood:
     @pytest.mark.asyncio
-    async def test_delete_mood_as_owner(self, mood_repository, user_with_moods):
+    async def test_delete_mood_as_owner(self, unit_of_work, mood_repository, user_with_moods):
         current_user = user_with_moods
         moods = current_user.moods
         mood_to_delete = mood_repository._model_to_entity(moods[0])
 
         command = DeleteMoodCommand(user_id=current_user.id, mood_id=mood_to_delete.id)
 
-        await delete_mood(mood_repository, command, current_user)
+        await delete_mood(unit_of_work, mood_repository, command, current_user)
 
         with pytest.raises(
             Exception,
@@ -141,14 +202,16 @@ class TestDeleteMood:
             await mood_repository.find_mood_by_id(mood_to_delete.id, current_user.id)
 
     @pytest.mark.asyncio
-    async def test_delete_mood_as_admin(self, mood_repository, admin_user, user_with_moods):
+    async def test_delete_mood_as_admin(
+        self, unit_of_work, mood_repository, admin_user, user_with_moods
+    ):
         current_user = admin_user
         moods = user_with_moods.moods
         mood_to_delete = mood_repository._model_to_entity(moods[0])
 
         command = DeleteMoodCommand(user_id=user_with_moods.id, mood_id=mood_to_delete.id)
 
-        await delete_mood(mood_repository, command, current_user)
+        await delete_mood(unit_of_work, mood_repository, command, current_user)
 
         with pytest.raises(
             Exception,
@@ -157,7 +220,9 @@ class TestDeleteMood:
             await mood_repository.find_mood_by_id(mood_to_delete.id, user_with_moods.id)
 
     @pytest.mark.asyncio
-    async def test_delete_mood_with_insufficient_permissions(self, mood_repository, other_user):
+    async def test_delete_mood_with_insufficient_permissions(
+        self, unit_of_work, mood_repository, other_user
+    ):
         current_user = other_user
         # Assuming there's a mood with this ID for testing purposes
         mood_id = 'some_mood_id'
@@ -166,4 +231,4 @@ class TestDeleteMood:
         command = DeleteMoodCommand(user_id=user_id, mood_id=mood_id)
 
         with pytest.raises(InsufficientPermissionsError, match='Not enough permissions'):
-            await delete_mood(mood_repository, command, current_user)
+            await delete_mood(unit_of_work, mood_repository, command, current_user)
@@ -1,19 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from freezegun import freeze_time
+from sqlalchemy import event, func, select
 
 from src.application.dto.user_dto import (
+    AccountPurgeProgress,
     CreateUserCommand,
+    DeleteUserCommand,
     GetUsersCommand,
     LoginCommand,
+    RefreshTokenCommand,
     UpdateUserCommand,
 )
 from src.application.exceptions.sql_database import EntityAlreadyExistsError, EntityNotFoundError
 from src.application.use_cases.users import (
     create_user,
-    get_access_token,
+    delete_user,
+    get_current_principal,
     get_current_user,
     list_users,
+    login,
+    purge_deleted_account,
+    refresh_access_token,
     update_user,
 )
+from src.domain.entities import Principal, User
 from src.domain.exceptions.user_exceptions import (
     InactiveUserError,
     InsufficientPermissionsError,
@@ -22,11 +34,19 @@ from src.domain.exceptions.user_exceptions import (
     InvalidUsernameError,
 )
 from src.domain.services.jwt_token import JWTTokenService
+from src.domain.services.password import Argon2Parameters, AsyncPasswordService, PasswordService
+from src.domain.services.refresh_token import RefreshTokenService
+from src.infrastructure.database.orm import (
+    AccountDeletionModel,
+    AssociatedEmotionsModel,
+    MoodModel,
+    RefreshTokenModel,
+)
 
 
 class TestCreateUser:
     @pytest.mark.asyncio
-    async def test_create_user(self, user_repository):
+    async def test_create_user(self, unit_of_work, user_repository):
         user_command = CreateUserCommand(
             username='testuser',
             email='testuser@example.com',
@@ -35,7 +55,7 @@ class TestCreateUser:
             last_name='User',
         )
 
-        await create_user(user_repository, user_command)
+        await create_user(unit_of_work, user_repository, user_command)
 
         user = await user_repository.find_by_email(user_command.email)
 
@@ -49,7 +69,7 @@ class TestCreateUser:
         assert user.is_admin is False
 
     @pytest.mark.asyncio
-    async def test_create_user_with_invalid_username(self, user_repository):
+    async def test_create_user_with_invalid_username(self, unit_of_work, user_repository):
         user_command = CreateUserCommand(
             username='',
             email='testuser@example.com',
@@ -59,10 +79,10 @@ class TestCreateUser:
         )
 
         with pytest.raises(InvalidUsernameError, match='Username cannot be empty'):
-            await create_user(user_repository, user_command)
+            await create_user(unit_of_work, user_repository, user_command)
 
     @pytest.mark.asyncio
-    async def test_create_user_with_short_password(self, user_repository):
+    async def test_create_user_with_short_password(self, unit_of_work, user_repository):
         user_command = CreateUserCommand(
             username='testuser',
             email='testuser@example.com',
@@ -74,10 +94,10 @@ class TestCreateUser:
         with pytest.raises(
             InvalidPasswordError, match='Password must be at least 8 characters long'
         ):
-            await create_user(user_repository, user_command)
+            await create_user(unit_of_work, user_repository, user_command)
 
     @pytest.mark.asyncio
-    async def test_create_user_with_existing_email(self, user_repository):
+    async def test_create_user_with_existing_email(self, unit_of_work, user_repository):
         user_command = CreateUserCommand(
             username='testuser',
             email='testuser@example.com',
@@ -94,13 +114,13 @@ class TestCreateUser:
             last_name='User',
         )
 
-        await create_user(user_repository, user_command)
+        await create_user(unit_of_work, user_repository, user_command)
 
         with pytest.raises(EntityAlreadyExistsError):
-            await create_user(user_repository, user_command_duplicate)
+            await create_user(unit_of_work, user_repository, user_command_duplicate)
 
     @pytest.mark.asyncio
-    async def test_create_user_with_existing_username(self, user_repository):
+    async def test_create_user_with_existing_username(self, unit_of_work, user_repository):
         user_command = CreateUserCommand(
             username='testuser',
             email='testuser@example.com',
@@ -117,10 +137,10 @@ class TestCreateUser:
             last_name='User',
         )
 
-        await create_user(user_repository, user_command)
+        await create_user(unit_of_work, user_repository, user_command)
 
         with pytest.raises(EntityAlreadyExistsError):
-            await create_user(user_repository, user_command_duplicate)
+            await create_user(unit_of_work, user_repository, user_command_duplicate)
 
 
 class TestGetCurrentUser:
@@ -144,6 +164,33 @@ class TestGetCurrentUser:
         with pytest.raises(ValueError, match='Invalid token'):
             await get_current_user(user_repository, invalid_token)
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_uses_principal_cache(
+        self, engine, count_queries, user_repository, principal_cache, user
+    ):
+        user_token = JWTTokenService().create_access_token({'sub': user.email})
+        await get_current_user(user_repository, user_token, principal_cache)
+
+        with count_queries(engine=engine) as statements:
+            current_user = await get_current_user(user_repository, user_token, principal_cache)
+
+        assert current_user.id == user.id
+        assert statements == []
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_after_update_is_not_stale(
+        self, unit_of_work, user_repository, principal_cache, user
+    ):
+        user_token = JWTTokenService().create_access_token({'sub': user.email})
+        current_user = await get_current_user(user_repository, user_token, principal_cache)
+
+        current_user.make_admin()
+        await user_repository.update(current_user)
+        await unit_of_work.commit()
+
+        current_user = await get_current_user(user_repository, user_token, principal_cache)
+        assert current_user.is_admin is True
+
     @pytest.mark.asyncio
     async def test_get_current_user_nonexistent_user(self, user_repository):
         data = {'sub': 'nonexistent@example.com'}
@@ -153,27 +200,90 @@ class TestGetCurrentUser:
             await get_current_user(user_repository, user_token)
 
 
+class TestGetCurrentPrincipal:
+    @pytest.fixture(autouse=True)
+    def self_contained_claims(self, monkeypatch):
+        monkeypatch.setenv('JWT_SELF_CONTAINED_CLAIMS', 'true')
+
+    @pytest.mark.asyncio
+    async def test_get_current_principal_from_claims(
+        self, engine, count_queries, user_repository, principal_cache, user
+    ):
+        user_domain = user_repository._model_to_entity(user)
+        user_token = JWTTokenService().create_user_access_token(user_domain)
+
+        with count_queries(engine=engine) as statements:
+            principal = await get_current_principal(user_repository, user_token, principal_cache)
+            await get_current_principal(user_repository, user_token, principal_cache)
+
+        assert principal == Principal(
+            id=user.id,
+            email=user.email,
+            is_admin=False,
+            is_active=True,
+            token_version=0,
+        )
+        assert len(statements) == 1
+        assert 'token_version' in statements[0]
+
+    @pytest.mark.asyncio
+    async def test_get_current_principal_with_revoked_token(
+        self, unit_of_work, user_repository, principal_cache, user
+    ):
+        user_domain = user_repository._model_to_entity(user)
+        user_token = JWTTokenService().create_user_access_token(user_domain)
+        await get_current_principal(user_repository, user_token, principal_cache)
+
+        user_domain.make_admin()
+        await user_repository.update(user_domain)
+        await unit_of_work.commit()
+
+        with pytest.raises(InvalidCredentialsError, match='Token has been revoked'):
+            await get_current_principal(user_repository, user_token, principal_cache)
+
+    @pytest.mark.asyncio
+    async def test_get_current_principal_without_claims(self, user_repository, user):
+        user_token = JWTTokenService().create_access_token({'sub': user.email})
+
+        current_user = await get_current_principal(user_repository, user_token)
+
+        assert isinstance(current_user, User)
+        assert current_user.id == user.id
+
+    @pytest.mark.asyncio
+    async def test_get_current_principal_without_claims_when_inactive(
+        self, session, user_repository, user
+    ):
+        user.is_active = False
+        await session.commit()
+        user_token = JWTTokenService().create_access_token({'sub': user.email})
+
+        with pytest.raises(InactiveUserError, match='User account is inactive'):
+            await get_current_principal(user_repository, user_token)
+
+
 class TestListUsers:
     @pytest.mark.asyncio
     async def test_list_users(self, user_repository, user, other_user):
         get_users_command = GetUsersCommand(offset=0, limit=10, is_active=True, is_admin=True)
 
-        users = await list_users(user_repository, get_users_command)
+        page = await list_users(user_repository, get_users_command)
         user_domain = user_repository._model_to_entity(user)
         other_user_domain = user_repository._model_to_entity(other_user)
 
-        assert len(users) == 2
-        assert users == [user_domain, other_user_domain]
+        assert len(page.items) == 2
+        assert page.items == [user_domain, other_user_domain]
+        assert page.next_cursor is None
 
     @pytest.mark.asyncio
     async def test_list_users_with_offset(self, user_repository, user, other_user):
         get_users_command = GetUsersCommand(offset=1, limit=10, is_active=True, is_admin=True)
 
-        users = await list_users(user_repository, get_users_command)
+        page = await list_users(user_repository, get_users_command)
         other_user_domain = user_repository._model_to_entity(other_user)
 
-        assert len(users) == 1
-        assert users == [other_user_domain]
+        assert len(page.items) == 1
+        assert page.items == [other_user_domain]
 
     @pytest.mark.asyncio
     async def test_list_users_when_user_is_not_admin(self, user_repository, user, other_user):
@@ -192,46 +302,151 @@ class TestListUsers:
             await list_users(user_repository, get_users_command)
 
 
-class TestGetAccessToken:
+class TestLogin:
     @pytest.mark.asyncio
-    async def test_get_access_token_user(self, user_repository, user):
+    async def test_login_user(self, unit_of_work, user_repository, refresh_token_repository, user):
         login_command = LoginCommand(email=user.email, password=user.clean_password)
 
-        result = await get_access_token(user_repository, login_command)
+        result = await login(unit_of_work, user_repository, refresh_token_repository, login_command)
 
-        jwt_token_service = JWTTokenService()
+        assert JWTTokenService().decode_token(result.access_token)
+        assert result.refresh_token
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_outdated_password(
+        self, unit_of_work, user_repository, refresh_token_repository, user
+    ):
+        low_cost_service = PasswordService(
+            Argon2Parameters(time_cost=1, memory_cost=8192, parallelism=1)
+        )
+        executor = ThreadPoolExecutor(max_workers=1)
+        password_service = AsyncPasswordService(executor, 1, low_cost_service)
+        login_command = LoginCommand(email=user.email, password=user.clean_password)
+
+        await login(
+            unit_of_work, user_repository, refresh_token_repository, login_command, password_service
+        )
+        executor.shutdown()
 
-        assert result is not None
-        assert jwt_token_service.decode_token(result)
+        updated_user = await user_repository.find_by_id(user.id)
+        assert '$m=8192,t=1,p=1$' in updated_user.password
+        assert low_cost_service.verify_password(user.clean_password, updated_user.password)
 
     @pytest.mark.asyncio
-    async def test_get_access_token_user_with_invalid_email(self, user_repository, user):
+    async def test_login_user_with_invalid_email(
+        self, unit_of_work, user_repository, refresh_token_repository, user
+    ):
         login_command = LoginCommand(email='invalid@example.com', password=user.clean_password)
 
         with pytest.raises(EntityNotFoundError, match='User not found'):
-            await get_access_token(user_repository, login_command)
+            await login(unit_of_work, user_repository, refresh_token_repository, login_command)
 
     @pytest.mark.asyncio
-    async def test_get_access_token_user_with_invalid_password(self, user_repository, user):
+    async def test_login_user_with_invalid_password(
+        self, unit_of_work, user_repository, refresh_token_repository, user
+    ):
         login_command = LoginCommand(email=user.email, password='wrongpassword')
 
         with pytest.raises(InvalidCredentialsError, match='Incorrect username or password'):
-            await get_access_token(user_repository, login_command)
+            await login(unit_of_work, user_repository, refresh_token_repository, login_command)
 
     @pytest.mark.asyncio
-    async def test_get_access_token_user_with_inactive_account(self, user_repository, user):
+    async def test_login_user_with_inactive_account(
+        self, unit_of_work, user_repository, refresh_token_repository, user
+    ):
         user.is_active = False
         await user_repository.update(user)
 
         login_command = LoginCommand(email=user.email, password=user.clean_password)
 
         with pytest.raises(InactiveUserError, match='User account is inactive'):
-            await get_access_token(user_repository, login_command)
+            await login(unit_of_work, user_repository, refresh_token_repository, login_command)
+
+
+class TestRefreshAccessToken:
+    @pytest.mark.asyncio
+    async def test_refresh_access_token(
+        self, unit_of_work, user_repository, refresh_token_repository, user
+    ):
+        login_command = LoginCommand(email=user.email, password=user.clean_password)
+        tokens = await login(unit_of_work, user_repository, refresh_token_repository, login_command)
+
+        refresh_command = RefreshTokenCommand(refresh_token=tokens.refresh_token)
+        new_tokens = await refresh_access_token(
+            unit_of_work, user_repository, refresh_token_repository, refresh_command
+        )
+
+        assert JWTTokenService().decode_token(new_tokens.access_token)['sub'] == user.email
+        assert new_tokens.refresh_token != tokens.refresh_token
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_reuse_revokes_family(
+        self, unit_of_work, user_repository, refresh_token_repository, user
+    ):
+        login_command = LoginCommand(email=user.email, password=user.clean_password)
+        tokens = await login(unit_of_work, user_repository, refresh_token_repository, login_command)
+        refresh_command = RefreshTokenCommand(refresh_token=tokens.refresh_token)
+        new_tokens = await refresh_access_token(
+            unit_of_work, user_repository, refresh_token_repository, refresh_command
+        )
+
+        with pytest.raises(InvalidCredentialsError, match='Refresh token has already been used'):
+            await refresh_access_token(
+                unit_of_work, user_repository, refresh_token_repository, refresh_command
+            )
+
+        with pytest.raises(InvalidCredentialsError, match='Refresh token has already been used'):
+            await refresh_access_token(
+                unit_of_work,
+                user_repository,
+                refresh_token_repository,
+                RefreshTokenCommand(refresh_token=new_tokens.refresh_token),
+            )
+
+    @pytest.mark.asyncio
+    async def test_refresh_access_token_with_expired_token(
+        self, unit_of_work, user_repository, refresh_token_repository, user
+    ):
+        login_command = LoginCommand(email=user.email, password=user.clean_password)
+        with freeze_time('2025-01-01'):
+            tokens = await login(
+                unit_of_work, user_repository, refresh_token_repository, login_command
+            )
+
+        refresh_command = RefreshTokenCommand(refresh_token=tokens.refresh_token)
+        with pytest.raises(InvalidCredentialsError, match='Refresh token has expired'):
+            await refresh_access_token(
+                unit_of_work, user_repository, refresh_token_repository, refresh_command
+            )
+
+    @pytest.mark.asyncio
+    async def test_issuing_tokens_deletes_expired_ones(
+        self, session, unit_of_work, user_repository, refresh_token_repository, user
+    ):
+        login_command = LoginCommand(email=user.email, password=user.clean_password)
+        with freeze_time('2025-01-01'):
+            await login(unit_of_work, user_repository, refresh_token_repository, login_command)
+
+        tokens = await login(unit_of_work, user_repository, refresh_token_repository, login_command)
+
+        hashes = await session.scalars(select(RefreshTokenModel.token_hash))
+        assert hashes.all() == [RefreshTokenService.hash_token(tokens.refresh_token)]
+
+    @pytest.mark.asyncio
+    async def test_refresh_access_token_with_unknown_token(
+        self, unit_of_work, user_repository, refresh_token_repository
+    ):
+        refresh_command = RefreshTokenCommand(refresh_token='unknown-token')
+
+        with pytest.raises(InvalidCredentialsError, match='Invalid refresh token'):
+            await refresh_access_token(
+                unit_of_work, user_repository, refresh_token_repository, refresh_command
+            )
 
 
 class TestUpdateUser:
     @pytest.mark.asyncio
-    async def test_update_user_when_is_admin(self, user_repository, user, other_user):
+    async def test_update_user_when_is_admin(self, unit_of_work, user_repository, user, other_user):
         user_command = UpdateUserCommand(
             user_id=user.id, username='newusername', first_name='New', last_name='Name'
         )
@@ -239,7 +454,7 @@ class TestUpdateUser:
         current_user = user_repository._model_to_entity(other_user)
         current_user.is_admin = True
 
-        await update_user(user_repository, user_command, current_user)
+        await update_user(unit_of_work, user_repository, user_command, current_user)
 
         updated_user = await user_repository.find_by_email(user.email)
 
@@ -248,14 +463,14 @@ class TestUpdateUser:
         assert updated_user.last_name == user_command.last_name
 
     @pytest.mark.asyncio
-    async def test_update_user_when_is_same_user(self, user_repository, user):
+    async def test_update_user_when_is_same_user(self, unit_of_work, user_repository, user):
         user_command = UpdateUserCommand(
             user_id=user.id, username='newusername', first_name='New', last_name='Name'
         )
 
         current_user = user_repository._model_to_entity(user)
 
-        await update_user(user_repository, user_command, current_user)
+        await update_user(unit_of_work, user_repository, user_command, current_user)
 
         updated_user = await user_repository.find_by_email(user.email)
 
@@ -264,19 +479,163 @@ class TestUpdateUser:
         assert updated_user.last_name == user_command.last_name
 
     @pytest.mark.asyncio
-    async def test_update_different_id(self, user_repository, user):
+    async def test_update_different_id(self, unit_of_work, user_repository, user):
         user_command = UpdateUserCommand(user_id='nonexistent-id', username='newusername')
 
         user_domain = user_repository._model_to_entity(user)
 
         with pytest.raises(InsufficientPermissionsError):
-            await update_user(user_repository, user_command, user_domain)
+            await update_user(unit_of_work, user_repository, user_command, user_domain)
 
     @pytest.mark.asyncio
-    async def test_update_username_already_exists(self, user_repository, user, other_user):
+    async def test_update_username_already_exists(
+        self, unit_of_work, user_repository, user, other_user
+    ):
         user_domain = user_repository._model_to_entity(user)
 
         user_command = UpdateUserCommand(user_id=user_domain.id, username=other_user.username)
 
         with pytest.raises(EntityAlreadyExistsError):
-            await update_user(user_repository, user_command, user_domain)
+            await update_user(unit_of_work, user_repository, user_command, user_domain)
+
+        assert (await user_repository.find_by_id(user_domain.id)).username == user_domain.username
+
+    @pytest.mark.asyncio
+    async def test_update_user_commits_once(
+        self, engine, count_queries, unit_of_work, user_repository, user
+    ):
+        user_command = UpdateUserCommand(user_id=user.id, first_name='New')
+        current_user = user_repository._model_to_entity(user)
+        commits = []
+
+        def commit_hook(conn):
+            commits.append(conn)
+
+        event.listen(engine.sync_engine, 'commit', commit_hook)
+        with count_queries(engine=engine) as statements:
+            await update_user(unit_of_work, user_repository, user_command, current_user)
+        event.remove(engine.sync_engine, 'commit', commit_hook)
+
+        assert [statement.split()[0] for statement in statements] == ['SELECT', 'UPDATE']
+        assert len(commits) == 1
+
+
+class TestDeleteUser:
+    @pytest.mark.asyncio
+    async def test_delete_user_deactivates_and_schedules_purge(
+        self, session, unit_of_work, user_repository, account_deletion_repository, user_with_moods
+    ):
+        current_user = user_repository._model_to_entity(user_with_moods)
+
+        await delete_user(
+            unit_of_work,
+            user_repository,
+            account_deletion_repository,
+            DeleteUserCommand(user_id=current_user.id),
+            current_user,
+        )
+
+        deleted_user = await user_repository.find_by_id(current_user.id)
+        assert deleted_user.is_active is False
+        assert deleted_user.token_version == current_user.token_version + 1
+        deletion = await session.scalar(select(AccountDeletionModel))
+        assert deletion.user_id == current_user.id
+        assert deletion.completed_at is None
+        # The moods are left to the purge
+        assert await session.scalar(select(func.count()).select_from(MoodModel)) == 10
+
+    @pytest.mark.asyncio
+    async def test_delete_user_when_is_admin(
+        self, unit_of_work, user_repository, account_deletion_repository, user, admin_user
+    ):
+        current_user = user_repository._model_to_entity(admin_user)
+
+        await delete_user(
+            unit_of_work,
+            user_repository,
+            account_deletion_repository,
+            DeleteUserCommand(user_id=user.id),
+            current_user,
+        )
+
+        assert (await user_repository.find_by_id(user.id)).is_active is False
+
+    @pytest.mark.asyncio
+    async def test_delete_other_user(
+        self, unit_of_work, user_repository, account_deletion_repository, user, other_user
+    ):
+        current_user = user_repository._model_to_entity(other_user)
+
+        with pytest.raises(InsufficientPermissionsError):
+            await delete_user(
+                unit_of_work,
+                user_repository,
+                account_deletion_repository,
+                DeleteUserCommand(user_id=user.id),
+                current_user,
+            )
+
+    @pytest.mark.asyncio
+    async def test_delete_user_that_does_not_exist(
+        self, unit_of_work, user_repository, account_deletion_repository, admin_user
+    ):
+        current_user = user_repository._model_to_entity(admin_user)
+
+        with pytest.raises(EntityNotFoundError):
+            await delete_user(
+                unit_of_work,
+                user_repository,
+                account_deletion_repository,
+                DeleteUserCommand(user_id='nonexistent-id'),
+                current_user,
+            )
+
+
+class TestPurgeDeletedAccount:
+    @pytest.mark.asyncio
+    async def test_purge_runs_in_batches_until_the_user_is_gone(
+        self, session, unit_of_work, user_repository, account_deletion_repository, user_with_moods
+    ):
+        user_id = user_with_moods.id
+        await account_deletion_repository.schedule(user_id)
+        await unit_of_work.commit()
+
+        progress = []
+        while batch := await purge_deleted_account(
+            unit_of_work, account_deletion_repository, batch_size=4
+        ):
+            progress.append(batch)
+
+        assert progress == [
+            AccountPurgeProgress(user_id=user_id, moods_purged=4, completed=False),
+            AccountPurgeProgress(user_id=user_id, moods_purged=8, completed=False),
+            AccountPurgeProgress(user_id=user_id, moods_purged=10, completed=False),
+            AccountPurgeProgress(user_id=user_id, moods_purged=10, completed=True),
+        ]
+        assert await session.scalar(select(func.count()).select_from(MoodModel)) == 0
+        assert await session.scalar(select(func.count()).select_from(AssociatedEmotionsModel)) == 0
+        with pytest.raises(EntityNotFoundError):
+            await user_repository.find_by_id(user_id)
+        deletion = await session.scalar(select(AccountDeletionModel))
+        assert deletion.completed_at is not None
+
+    @pytest.mark.asyncio
+    async def test_purge_resumes_from_the_persisted_progress(
+        self, session, unit_of_work, account_deletion_repository, user_with_moods
+    ):
+        await account_deletion_repository.schedule(user_with_moods.id)
+        await unit_of_work.commit()
+        await purge_deleted_account(unit_of_work, account_deletion_repository, batch_size=6)
+
+        # A worker restarted with a fresh session picks the purge up where it stopped
+        session.expunge_all()
+        progress = await purge_deleted_account(
+            unit_of_work, account_deletion_repository, batch_size=6
+        )
+
+        assert progress.moods_purged == 10
+        assert progress.completed is False
+
+    @pytest.mark.asyncio
+    async def test_purge_without_pending_deletions(self, unit_of_work, account_deletion_repository):
+        assert await purge_deleted_account(unit_of_work, account_deletion_repository, 10) is None
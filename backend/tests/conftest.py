@@ -7,22 +7,39 @@ import factory
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy import event
+from sqlalchemy import event, func, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from testcontainers.postgres import PostgresContainer
 
 from src.api import app
+from src.domain.entities.associated_emotion import AssociatedEmotionEnum
+from src.domain.entities.mood import Mood, RegistryType
+from src.domain.services.id_generator import new_id
 from src.domain.services.password import PasswordService
+from src.infrastructure.cache.principal_cache import InMemoryPrincipalCache, get_principal_cache
+from src.infrastructure.cache.recent_writers import RecentWriters, get_recent_writers
+from src.infrastructure.cache.trigger_vocabulary import TriggerVocabulary, get_trigger_vocabulary
 from src.infrastructure.database.orm import (
     AssociatedEmotionsModel,
     EmotionalTriggerModel,
     MoodModel,
+    TriggerNameModel,
     UserModel,
     table_registry,
 )
-from src.infrastructure.database.session import get_session
+from src.infrastructure.database.session import get_replica_session, get_session
+from src.infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.account_deletion_repository import (
+    SQLAlchemyAccountDeletionRepository,
+)
+from src.infrastructure.repositories.inline_mood_repository import SQLAlchemyInlineMoodRepository
 from src.infrastructure.repositories.mood_repository import SQLAlchemyMoodRepository
+from src.infrastructure.repositories.refresh_token_repository import (
+    SQLAlchemyRefreshTokenRepository,
+)
 from src.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from src.interfaces.http.admission import AuthAdmission, get_auth_admission
+from src.settings import Settings
 
 
 @pytest.fixture(scope='session')
@@ -62,13 +79,84 @@ def mock_db_time():
     return _mock_db_time
 
 
+@contextmanager
+def _count_queries(*, engine):
+    statements = []
+
+    def count_hook(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_hook)
+    yield statements
+    event.remove(engine.sync_engine, 'before_cursor_execute', count_hook)
+
+
+@pytest.fixture
+def count_queries():
+    return _count_queries
+
+
+# Plain helpers rather than fixtures, so the repository tests can import them without
+# adding to their fixture lists
+def make_mood(user_id: str, index: int = 0) -> Mood:
+    return Mood(
+        user_id=user_id,
+        registry_type='daily',
+        visual_scale=index % 5 + 1,
+        associated_emotions=[{'name': 'joy', 'intensity': 8}, {'name': 'fear', 'intensity': 2}],
+        triggers=[{'name': f'trigger {index}'}, {'name': 'work'}],
+        description=f'Mood {index}',
+    )
+
+
+async def count_rows(session, model) -> int:
+    return await session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.fixture
+def principal_cache():
+    return InMemoryPrincipalCache(max_size=128, ttl_seconds=60)
+
+
+@pytest.fixture
+def recent_writers():
+    return RecentWriters(max_size=128, window_seconds=60)
+
+
+@pytest.fixture
+def trigger_vocabulary():
+    return TriggerVocabulary(max_size=128)
+
+
 @pytest.fixture
-def client(session):
+def auth_admission():
+    return AuthAdmission.from_settings(Settings())
+
+
+@pytest.fixture
+def client(session, principal_cache, recent_writers, trigger_vocabulary, auth_admission):
     def get_session_override():
         return session
 
+    def get_recent_writers_override():
+        return recent_writers
+
+    def get_trigger_vocabulary_override():
+        return trigger_vocabulary
+
+    def get_principal_cache_override():
+        return principal_cache
+
+    def get_auth_admission_override():
+        return auth_admission
+
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_replica_session] = get_session_override
+        app.dependency_overrides[get_recent_writers] = get_recent_writers_override
+        app.dependency_overrides[get_trigger_vocabulary] = get_trigger_vocabulary_override
+        app.dependency_overrides[get_principal_cache] = get_principal_cache_override
+        app.dependency_overrides[get_auth_admission] = get_auth_admission_override
         yield client
 
     app.dependency_overrides.clear()
@@ -80,13 +168,33 @@ def password_service():
 
 
 @pytest.fixture
-def user_repository(session):
-    return SQLAlchemyUserRepository(session)
+def unit_of_work(session):
+    return SQLAlchemyUnitOfWork(session)
 
 
 @pytest.fixture
-def mood_repository(session):
-    return SQLAlchemyMoodRepository(session)
+def user_repository(session, principal_cache):
+    return SQLAlchemyUserRepository(session, principal_cache)
+
+
+@pytest.fixture
+def mood_repository(session, trigger_vocabulary):
+    return SQLAlchemyMoodRepository(session, trigger_vocabulary)
+
+
+@pytest.fixture
+def inline_mood_repository(session, trigger_vocabulary):
+    return SQLAlchemyInlineMoodRepository(session, trigger_vocabulary)
+
+
+@pytest.fixture
+def refresh_token_repository(session):
+    return SQLAlchemyRefreshTokenRepository(session)
+
+
+@pytest.fixture
+def account_deletion_repository(session):
+    return SQLAlchemyAccountDeletionRepository(session)
 
 
 @pytest_asyncio.fixture(scope='function')
@@ -121,7 +229,7 @@ async def user_with_moods(session, user):
     moods = MoodFactory.create_batch(10, user_id=user.id)
     session.add_all(moods)
     await session.commit()
-    await session.refresh(user)
+    await session.refresh(user, attribute_names=['moods'])
     return user
 
 
@@ -152,7 +260,7 @@ class AssociatedEmotionsFactory(factory.Factory):
         model = AssociatedEmotionsModel
 
     mood_id: str = ''
-    name = factory.Iterator(['joy', 'sadness', 'anger', 'fear', 'surprise'])
+    name = factory.Iterator(list(AssociatedEmotionEnum))
     intensity = factory.Faker('random_int', min=1, max=10)
 
 
@@ -161,7 +269,10 @@ class TriggersFactory(factory.Factory):
         model = EmotionalTriggerModel
 
     mood_id: str = ''
-    name = factory.Faker('word')
+
+    @factory.post_generation
+    def trigger_name(obj, create, extracted, **kwargs):
+        obj.trigger_name = TriggerNameModel(name=extracted or f'trigger {uuid.uuid4().hex}')
 
 
 class MoodFactory(factory.Factory):
@@ -169,9 +280,9 @@ class MoodFactory(factory.Factory):
         model = MoodModel
 
     user_id: str = ''
-    id = factory.LazyAttribute(lambda x: str(uuid.uuid4()))
+    id = factory.LazyFunction(new_id)
     visual_scale = factory.Faker('random_int', min=1, max=5)
-    registry_type = factory.Iterator(['daily', 'event'])
+    registry_type = factory.Iterator(list(RegistryType))
     description = factory.Faker('sentence')
     associated_emotions = factory.LazyAttribute(
         lambda o: AssociatedEmotionsFactory.create_batch(2, mood_id=o.id)
@@ -183,7 +294,7 @@ class UserFactory(factory.Factory):
     class Meta:
         model = UserModel
 
-    id = factory.LazyAttribute(lambda x: str(uuid.uuid4()))
+    id = factory.LazyFunction(new_id)
     username = factory.LazyFunction(lambda: f'user{random.randint(1, 10000)}')
     email = factory.LazyAttribute(lambda obj: f'{obj.username}@example.com')
     password = factory.LazyAttribute(lambda obj: f'{obj.username}_secret')
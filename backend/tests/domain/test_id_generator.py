@@ -0,0 +1,45 @@
+import uuid
+
+from src.domain.entities import Mood, User
+from src.domain.services.id_generator import UUID7Generator, new_id
+
+
+def test_new_id_is_a_uuid7():
+    generated = uuid.UUID(new_id())
+
+    assert generated.version == 7
+    assert generated.variant == uuid.RFC_4122
+
+
+def test_ids_embed_the_creation_time():
+    generator = UUID7Generator(clock=lambda: 1_700_000_000_123_456_789)
+
+    generated = generator.generate()
+
+    assert generated.int >> 80 == 1_700_000_000_123
+
+
+def test_ids_are_ordered_within_the_same_millisecond():
+    generator = UUID7Generator(clock=lambda: 1_700_000_000_000_000_000)
+
+    ids = [generator.generate() for _ in range(10_000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_ids_do_not_go_backwards_with_the_clock():
+    timestamps = iter([2_000_000_000, 1_000_000_000])
+    generator = UUID7Generator(clock=lambda: next(timestamps))
+
+    first, second = generator.generate(), generator.generate()
+
+    assert first < second
+
+
+def test_entities_default_to_time_ordered_ids():
+    user = User(username='johndoe', email='john@example.com', password='Password@123')
+    mood = Mood(user_id=user.id, registry_type='daily', visual_scale=3, associated_emotions=[])
+
+    assert uuid.UUID(user.id).version == 7
+    assert uuid.UUID(user.id) < uuid.UUID(mood.id)
@@ -0,0 +1,84 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.domain.services.password import (
+    Argon2Parameters,
+    AsyncPasswordService,
+    PasswordService,
+)
+
+LOW_COST_PARAMETERS = Argon2Parameters(time_cost=1, memory_cost=8192, parallelism=1)
+
+
+@pytest.fixture
+def async_password_service():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield AsyncPasswordService(executor, max_workers=1)
+    executor.shutdown()
+
+
+class TestPasswordService:
+    def test_hash_password_uses_configured_parameters(self):
+        hashed = PasswordService(LOW_COST_PARAMETERS).hash_password('Password123')
+
+        assert '$m=8192,t=1,p=1$' in hashed
+
+    def test_verify_and_update_rehashes_outdated_hash(self):
+        outdated_hash = PasswordService().hash_password('Password123')
+        password_service = PasswordService(LOW_COST_PARAMETERS)
+
+        verified, updated_hash = password_service.verify_and_update('Password123', outdated_hash)
+
+        assert verified is True
+        assert '$m=8192,t=1,p=1$' in updated_hash
+
+    def test_verify_and_update_keeps_current_hash(self):
+        password_service = PasswordService(LOW_COST_PARAMETERS)
+        current_hash = password_service.hash_password('Password123')
+
+        assert password_service.verify_and_update('Password123', current_hash) == (True, None)
+        assert password_service.verify_and_update('wrong-password', current_hash) == (False, None)
+
+
+class TestAsyncPasswordService:
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_password(self, async_password_service):
+        hashed = await async_password_service.hash_password('Password123')
+
+        assert hashed != 'Password123'
+        assert await async_password_service.verify_password('Password123', hashed) is True
+        assert await async_password_service.verify_password('wrong-password', hashed) is False
+
+    @pytest.mark.asyncio
+    async def test_metrics_report_queue_depth(self, async_password_service):
+        tasks = [
+            asyncio.create_task(async_password_service.hash_password('Password123'))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        metrics = async_password_service.metrics()
+        await asyncio.gather(*tasks)
+
+        assert metrics.max_workers == 1
+        assert metrics.in_flight == 1
+        assert metrics.queued == 2
+        assert async_password_service.metrics().in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_hashing_does_not_block_event_loop(self, async_password_service):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker_task = asyncio.create_task(ticker())
+        await async_password_service.hash_password('Password123')
+        ticker_task.cancel()
+
+        assert ticks > 1
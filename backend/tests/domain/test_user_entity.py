@@ -153,3 +153,28 @@ def test_remove_admin():
     user.remove_admin()
 
     assert user.is_admin is False
+
+
+def test_revoke_tokens():
+    user = User(
+        username='testuser',
+        email='testuser@example.com',
+        password='Password123',
+    )
+
+    user.revoke_tokens()
+
+    assert user.token_version == 1
+
+
+def test_role_changes_revoke_tokens():
+    user = User(
+        username='testuser',
+        email='testuser@example.com',
+        password='Password123',
+    )
+
+    user.make_admin()
+    user.deactivate()
+
+    assert user.token_version == 2
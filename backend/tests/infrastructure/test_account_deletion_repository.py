@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+import pytest
+from conftest import count_rows, make_mood
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.database.orm import (
+    AccountDeletionModel,
+    ArchivedMoodModel,
+    MoodModel,
+    RefreshTokenModel,
+    UserModel,
+)
+from src.infrastructure.repositories.account_deletion_repository import (
+    SQLAlchemyAccountDeletionRepository,
+)
+from src.interfaces.cli.purge_deleted_accounts import purge
+
+
+class TestAccountDeletionRepository:
+    @pytest.mark.asyncio
+    async def test_schedule_twice_keeps_one_deletion(
+        self, session, account_deletion_repository, user
+    ):
+        await account_deletion_repository.schedule(user.id)
+        await account_deletion_repository.schedule(user.id)
+
+        assert await count_rows(session, AccountDeletionModel) == 1
+
+    @pytest.mark.asyncio
+    async def test_purge_moods_removes_hot_moods_before_archived_ones(
+        self, session, mood_repository, account_deletion_repository, user
+    ):
+        for index in range(3):
+            await mood_repository.save(make_mood(user.id, index))
+            await session.commit()
+        await mood_repository.archive(timedelta(0), batch_size=1)
+        await session.commit()
+
+        assert await account_deletion_repository.purge_moods(user.id, batch_size=10) == 2
+        assert await count_rows(session, ArchivedMoodModel) == 1
+        assert await account_deletion_repository.purge_moods(user.id, batch_size=10) == 1
+        assert await account_deletion_repository.purge_moods(user.id, batch_size=10) == 0
+
+    @pytest.mark.asyncio
+    async def test_purge_moods_is_a_single_bounded_delete(
+        self, engine, count_queries, account_deletion_repository, user_with_moods
+    ):
+        with count_queries(engine=engine) as statements:
+            purged = await account_deletion_repository.purge_moods(user_with_moods.id, 4)
+
+        assert purged == 4
+        # One bounded delete; the moods are never selected into the session
+        assert [statement.split()[0] for statement in statements] == ['DELETE']
+
+    @pytest.mark.asyncio
+    async def test_complete_waits_for_remaining_moods(
+        self, session, account_deletion_repository, user_with_moods
+    ):
+        await account_deletion_repository.schedule(user_with_moods.id)
+
+        assert await account_deletion_repository.complete(user_with_moods.id) is False
+        assert await count_rows(session, UserModel) == 1
+
+    @pytest.mark.asyncio
+    async def test_complete_removes_user_and_refresh_tokens(
+        self, session, client, account_deletion_repository, user
+    ):
+        client.post('/auth/login', data={'username': user.email, 'password': user.clean_password})
+        assert await count_rows(session, RefreshTokenModel) == 1
+        await account_deletion_repository.schedule(user.id)
+
+        assert await account_deletion_repository.complete(user.id) is True
+        await session.commit()
+
+        assert await count_rows(session, UserModel) == 0
+        assert await count_rows(session, RefreshTokenModel) == 0
+        deletion = await session.scalar(select(AccountDeletionModel))
+        assert deletion.completed_at is not None
+
+    @pytest.mark.asyncio
+    async def test_claim_skips_deletions_held_by_another_worker(
+        self, session, engine, account_deletion_repository, user, other_user
+    ):
+        await account_deletion_repository.schedule(user.id)
+        await account_deletion_repository.schedule(other_user.id)
+        await session.commit()
+
+        async with AsyncSession(engine) as other_session:
+            other_worker = SQLAlchemyAccountDeletionRepository(other_session)
+            claimed = await other_worker.claim_next()
+
+            assert await account_deletion_repository.claim_next() not in {claimed, None}
+            await other_session.rollback()
+
+    @pytest.mark.asyncio
+    async def test_purge_command_drains_the_queue(
+        self, session, engine, account_deletion_repository, user_with_moods, other_user
+    ):
+        await account_deletion_repository.schedule(user_with_moods.id)
+        await account_deletion_repository.schedule(other_user.id)
+        await session.commit()
+
+        assert await purge(engine, batch_size=3) == 2
+        assert await purge(engine, batch_size=3) == 0
+        assert await count_rows(session, MoodModel) == 0
+        assert await count_rows(session, UserModel) == 0
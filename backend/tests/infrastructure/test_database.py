@@ -0,0 +1,129 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.api import app
+from src.infrastructure.database.session import Database, create_engine, database
+from src.settings import Settings
+
+
+@pytest.fixture
+def database_settings(engine):
+    def make_settings(**overrides):
+        return Settings(DATABASE_URL=engine.url.render_as_string(hide_password=False), **overrides)
+
+    return make_settings
+
+
+class TestCreateEngine:
+    @pytest.mark.asyncio
+    async def test_connection_options_come_from_settings(self, database_settings):
+        engine = create_engine(
+            database_settings(DATABASE_STATEMENT_TIMEOUT_MS=1500, DATABASE_PREPARE_THRESHOLD=2)
+        )
+
+        async with engine.connect() as conn:
+            statement_timeout = await conn.scalar(text('SHOW statement_timeout'))
+            raw_connection = await conn.get_raw_connection()
+            prepare_threshold = raw_connection.driver_connection.prepare_threshold
+        await engine.dispose()
+
+        assert statement_timeout == '1500ms'
+        assert prepare_threshold == 2
+        assert engine.pool.size() == Settings().DATABASE_POOL_SIZE
+        assert engine.pool._pre_ping is True
+
+    @pytest.mark.asyncio
+    async def test_prepared_statements_can_be_disabled(self, database_settings):
+        engine = create_engine(database_settings(DATABASE_PREPARED_STATEMENTS=False))
+
+        async with engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            prepare_threshold = raw_connection.driver_connection.prepare_threshold
+        await engine.dispose()
+
+        assert prepare_threshold is None
+
+
+class TestPoolMetrics:
+    @pytest.mark.asyncio
+    async def test_metrics_track_checkouts_and_timeouts(self, database_settings):
+        db = Database()
+        db.connect(
+            database_settings(
+                DATABASE_POOL_SIZE=1, DATABASE_MAX_OVERFLOW=0, DATABASE_POOL_TIMEOUT_SECONDS=0.1
+            )
+        )
+
+        async with db.engine.connect():
+            metrics = db.pool_metrics()
+            assert (metrics.checked_out, metrics.idle) == (1, 0)
+
+            with pytest.raises(PoolTimeoutError):
+                async with db.engine.connect():
+                    pass
+
+        metrics = db.pool_metrics()
+        await db.dispose()
+
+        assert (metrics.checked_out, metrics.idle, metrics.overflow) == (0, 1, 0)
+        assert metrics.checkouts == 2
+        assert metrics.timeouts == 1
+        assert metrics.max_wait_seconds >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_connect_time_is_not_counted_as_wait(self, database_settings):
+        db = Database()
+        db.connect(database_settings(DATABASE_POOL_SIZE=1, DATABASE_MAX_OVERFLOW=0))
+        # Stands in for a slow handshake on the only connection the pool will open
+        event.listen(db.engine.sync_engine, 'connect', lambda *args: time.sleep(0.2))
+
+        async with db.engine.connect():
+            pass
+        async with db.engine.connect():
+            pass
+
+        metrics = db.pool_metrics()
+        await db.dispose()
+
+        assert metrics.checkouts == 2
+        assert metrics.connects == 1
+        assert metrics.connect_seconds_total >= 0.2
+        assert metrics.max_wait_seconds < 0.2
+
+
+class TestReplicaEngine:
+    @pytest.mark.asyncio
+    async def test_replica_falls_back_to_primary(self, database_settings):
+        db = Database()
+        db.connect(database_settings())
+
+        assert db.replica_engine is db.engine
+        await db.dispose()
+
+    @pytest.mark.asyncio
+    async def test_replica_has_its_own_pool(self, database_settings):
+        url = database_settings().DATABASE_URL
+        db = Database()
+        db.connect(database_settings(DATABASE_REPLICA_URL=url, DATABASE_POOL_SIZE=2))
+
+        assert db.replica_engine is not db.engine
+        async with db.replica_engine.connect():
+            replica_metrics = db.pool_metrics(replica=True)
+            primary_metrics = db.pool_metrics()
+        await db.dispose()
+
+        assert replica_metrics.checked_out == 1
+        assert primary_metrics.checked_out == 0
+
+
+class TestDatabaseLifespan:
+    def test_engine_is_owned_by_the_app_lifespan(self):
+        with TestClient(app):
+            assert database.engine is not None
+
+        with pytest.raises(RuntimeError, match='Database is not connected'):
+            database.engine
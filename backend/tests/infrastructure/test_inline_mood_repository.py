@@ -0,0 +1,145 @@
+import re
+
+import pytest
+from conftest import make_mood
+from sqlalchemy import event, text
+
+from src.application.exceptions import EntityNotFoundError
+from src.interfaces.cli.backfill_inline_moods import backfill
+
+
+class TestSQLAlchemyInlineMoodRepository:
+    @pytest.mark.asyncio
+    async def test_save_and_read_single_row(
+        self, session, engine, count_queries, inline_mood_repository, user
+    ):
+        mood = make_mood(user.id)
+
+        with count_queries(engine=engine) as statements:
+            await inline_mood_repository.save(mood)
+            session.expunge_all()
+            stored = await inline_mood_repository.find_mood_by_id(mood.id, user.id)
+
+        assert stored == mood
+        assert len(statements) == 2
+        assert all('associated_emotions' not in statement for statement in statements)
+
+    @pytest.mark.asyncio
+    async def test_list_moods_is_a_single_query(
+        self, session, engine, count_queries, inline_mood_repository, user
+    ):
+        moods = [make_mood(user.id) for _ in range(3)]
+        await inline_mood_repository.save_many(moods)
+        session.expunge_all()
+
+        with count_queries(engine=engine) as statements:
+            page = await inline_mood_repository.list_moods(user.id, 0, 2)
+            next_page = await inline_mood_repository.list_moods(user.id, 0, 2, page.next_cursor)
+
+        # One query per page, plus the archive lookup once the hot moods run out
+        assert len(statements) == 3
+        assert 'archived_moods' in statements[-1]
+        assert all('associated_emotions' not in statement for statement in statements)
+        assert {mood.id for mood in page.items + next_page.items} == {mood.id for mood in moods}
+        assert next_page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_update_is_a_single_statement(
+        self, session, engine, count_queries, inline_mood_repository, user
+    ):
+        mood = make_mood(user.id)
+        await inline_mood_repository.save(mood)
+        mood.update_triggers([{'name': 'rain'}])
+        mood.update_description('Changed')
+
+        with count_queries(engine=engine) as statements:
+            await inline_mood_repository.update(mood)
+
+        assert len(statements) == 1
+        session.expunge_all()
+        assert await inline_mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+    @pytest.mark.asyncio
+    async def test_update_missing_mood(self, inline_mood_repository, user):
+        with pytest.raises(EntityNotFoundError, match='Mood not found'):
+            await inline_mood_repository.update(make_mood(user.id))
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_legacy_child_rows(
+        self, session, mood_repository, inline_mood_repository, user
+    ):
+        mood = make_mood(user.id)
+        await mood_repository.save(mood)
+
+        await inline_mood_repository.delete(mood.id, user.id)
+
+        with pytest.raises(EntityNotFoundError, match='Mood not found'):
+            await mood_repository.find_mood_by_id(mood.id, user.id)
+
+    @pytest.mark.asyncio
+    async def test_delete_only_owned_mood(self, inline_mood_repository, user, other_user):
+        mood = make_mood(user.id)
+        await inline_mood_repository.save(mood)
+
+        with pytest.raises(EntityNotFoundError, match='Mood not found'):
+            await inline_mood_repository.delete(mood.id, other_user.id)
+
+        assert await inline_mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+
+class TestBackfill:
+    @pytest.mark.asyncio
+    async def test_backfill_copies_child_rows(
+        self, session, engine, mood_repository, inline_mood_repository, user_with_moods
+    ):
+        normalized = await mood_repository.list_moods(user_with_moods.id, 0, 10)
+
+        assert await backfill(engine, batch_size=3) == 10
+        assert await backfill(engine, batch_size=3) == 0
+
+        session.expunge_all()
+        inline = await inline_mood_repository.list_moods(user_with_moods.id, 0, 10)
+        assert inline.items == normalized.items
+
+    @pytest.mark.asyncio
+    async def test_normalized_update_marks_inline_copy_stale(
+        self, session, engine, mood_repository, inline_mood_repository, user_with_moods
+    ):
+        await backfill(engine, batch_size=100)
+        session.expunge_all()
+        mood = await mood_repository.find_mood_by_id(
+            user_with_moods.moods[0].id, user_with_moods.id
+        )
+        mood.update_triggers([{'name': 'edited before the switch'}])
+        await mood_repository.update(mood)
+        await session.commit()
+
+        assert await backfill(engine, batch_size=100) == 1
+        session.expunge_all()
+        assert await inline_mood_repository.find_mood_by_id(mood.id, mood.user_id) == mood
+
+    @pytest.mark.asyncio
+    async def test_backfill_reads_children_by_partition(
+        self, session, engine, inline_mood_repository, user_with_moods
+    ):
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, *args):
+            captured.append((statement, parameters))
+
+        event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+        await inline_mood_repository.backfill(batch_size=5)
+        event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+        await session.rollback()
+
+        connection = await session.connection()
+        await connection.execute(text('SET LOCAL enable_seqscan = off'))
+        statement, parameters = captured[0]
+        result = await connection.exec_driver_sql(f'EXPLAIN {statement}', parameters)
+        plan = '\n'.join(row[0] for row in result)
+        await session.rollback()
+
+        # Each child lookup seeks the (mood_id, mood_created_at) index of the mood's partition
+        for table in ('associated_emotions', 'emotional_triggers'):
+            assert f'{table}_default_mood_id_mood_created_at_' in plan
+        assert len(re.findall(r'mood_created_at = moods\w*\.created_at', plan)) == 2
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+from conftest import count_rows, make_mood
+from sqlalchemy import select
+
+from src.application.exceptions import EntityNotFoundError
+from src.infrastructure.database.orm import (
+    ArchivedMoodModel,
+    AssociatedEmotionsModel,
+    EmotionalTriggerModel,
+    MoodModel,
+)
+from src.interfaces.cli.archive_moods import archive
+
+
+async def save_one_by_one(session, repository, user_id, moods=5):
+    # Separate transactions, so each mood gets its own created_at
+    saved = []
+    for index in range(moods):
+        saved.append(await repository.save(make_mood(user_id, index)))
+        await session.commit()
+    return saved
+
+
+class TestArchiveMoods:
+    @pytest.mark.asyncio
+    async def test_archive_moves_oldest_moods_with_children(self, session, mood_repository, user):
+        moods = await save_one_by_one(session, mood_repository, user.id)
+
+        assert await mood_repository.archive(timedelta(0), batch_size=3) == 3
+        await session.commit()
+
+        archived_ids = set(await session.scalars(select(ArchivedMoodModel.id)))
+        assert archived_ids == {mood.id for mood in moods[:3]}
+        assert await count_rows(session, MoodModel) == 2
+        assert await count_rows(session, AssociatedEmotionsModel) == 4
+        assert await count_rows(session, EmotionalTriggerModel) == 4
+        for mood in moods:
+            assert await mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+    @pytest.mark.asyncio
+    async def test_recent_moods_stay_hot(self, session, mood_repository, user):
+        await save_one_by_one(session, mood_repository, user.id, moods=2)
+
+        assert await mood_repository.archive(timedelta(days=1), batch_size=10) == 0
+        assert await count_rows(session, ArchivedMoodModel) == 0
+
+    @pytest.mark.asyncio
+    async def test_archive_keeps_inline_layout_children(
+        self, session, inline_mood_repository, user
+    ):
+        (mood,) = await save_one_by_one(session, inline_mood_repository, user.id, moods=1)
+
+        assert await inline_mood_repository.archive(timedelta(0), batch_size=10) == 1
+        await session.commit()
+
+        assert await inline_mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+    @pytest.mark.asyncio
+    async def test_archive_command_runs_in_batches(self, session, engine, mood_repository, user):
+        await save_one_by_one(session, mood_repository, user.id)
+
+        assert await archive(engine, timedelta(0), batch_size=2) == 5
+        assert await archive(engine, timedelta(0), batch_size=2) == 0
+        assert await count_rows(session, MoodModel) == 0
+        assert await count_rows(session, ArchivedMoodModel) == 5
+
+
+class TestArchivedMoodsReads:
+    @pytest.mark.asyncio
+    async def test_list_moods_continues_into_the_archive(self, session, mood_repository, user):
+        moods = await save_one_by_one(session, mood_repository, user.id)
+        await mood_repository.archive(timedelta(0), batch_size=3)
+        await session.commit()
+        await mood_repository.save(make_mood(user.id, 5))
+        await session.commit()
+
+        listed, cursor = [], None
+        while True:
+            page = await mood_repository.list_moods(user.id, 0, 2, cursor)
+            listed += page.items
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert [mood.description for mood in listed] == [f'Mood {i}' for i in range(5, -1, -1)]
+        assert listed[-3:] == moods[2::-1]
+
+    @pytest.mark.asyncio
+    async def test_list_moods_offset_past_the_hot_moods(self, session, mood_repository, user):
+        await save_one_by_one(session, mood_repository, user.id)
+        await mood_repository.archive(timedelta(0), batch_size=3)
+        await session.commit()
+
+        page = await mood_repository.list_moods(user.id, 3, 10)
+
+        assert [mood.description for mood in page.items] == ['Mood 1', 'Mood 0']
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_archived_moods_are_read_only(self, session, mood_repository, user):
+        (mood,) = await save_one_by_one(session, mood_repository, user.id, moods=1)
+        await mood_repository.archive(timedelta(0), batch_size=10)
+        await session.commit()
+        mood.update_description('Changed')
+
+        with pytest.raises(EntityNotFoundError, match='Mood not found'):
+            await mood_repository.update(mood)
+        with pytest.raises(EntityNotFoundError, match='Mood not found'):
+            await mood_repository.delete(mood.id, user.id)
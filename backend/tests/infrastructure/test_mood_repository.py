@@ -0,0 +1,551 @@
+import json
+import re
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select, text
+
+from src.application.dto.mood_dto import MoodFilters
+from src.application.exceptions import (
+    EntityNotFoundError,
+    IntegrityConstraintViolationError,
+    InvalidCursorError,
+)
+from src.domain.entities.mood import Mood
+from src.infrastructure.database.orm import MoodModel, TriggerNameModel
+from src.infrastructure.repositories.pagination import encode_cursor
+from src.interfaces.http.schemas.mood_schemas import MoodResponse
+
+
+async def explain_repository_queries(session, engine, query):
+    captured = []
+
+    def capture_hook(conn, cursor, statement, parameters, *args):
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture_hook)
+    await query()
+    event.remove(engine.sync_engine, 'before_cursor_execute', capture_hook)
+
+    connection = await session.connection()
+    await connection.execute(text('SET LOCAL enable_seqscan = off'))
+    plans = []
+    for statement, parameters in captured:
+        result = await connection.exec_driver_sql(f'EXPLAIN {statement}', parameters)
+        plans.append('\n'.join(row[0] for row in result))
+    await session.rollback()
+    return plans
+
+
+class TestMoodQueryPlans:
+    @pytest.mark.asyncio
+    async def test_list_moods_uses_indexes(self, session, engine, mood_repository, user_with_moods):
+        plans = await explain_repository_queries(
+            session, engine, lambda: mood_repository.list_moods(user_with_moods.id, 0, 10)
+        )
+
+        assert 'moods_default_user_id_created_at_id_idx' in plans[0]
+        assert 'associated_emotions_default_mood_id_mood_created_at_name_in_idx' in '\n'.join(plans)
+        assert 'emotional_triggers_default_mood_id_mood_created_at_trigger__idx' in '\n'.join(plans)
+        assert all('Seq Scan' not in plan for plan in plans)
+
+    @pytest.mark.asyncio
+    async def test_list_moods_with_cursor_uses_indexes(
+        self, session, engine, mood_repository, user_with_moods
+    ):
+        page = await mood_repository.list_moods(user_with_moods.id, 0, 5)
+        plans = await explain_repository_queries(
+            session,
+            engine,
+            lambda: mood_repository.list_moods(user_with_moods.id, 0, 5, page.next_cursor),
+        )
+
+        assert 'moods_default_user_id_created_at_id_idx' in plans[0]
+        assert 'Sort' not in plans[0]
+        assert all('Seq Scan' not in plan for plan in plans)
+
+    @pytest.mark.asyncio
+    async def test_find_mood_by_id_uses_indexes(
+        self, session, engine, mood_repository, user_with_moods
+    ):
+        mood_id = user_with_moods.moods[0].id
+        plans = await explain_repository_queries(
+            session, engine, lambda: mood_repository.find_mood_by_id(mood_id, user_with_moods.id)
+        )
+
+        assert 'associated_emotions_default_mood_id_mood_created_at_name_in_idx' in '\n'.join(plans)
+        assert 'emotional_triggers_default_mood_id_mood_created_at_trigger__idx' in '\n'.join(plans)
+        assert all('Seq Scan' not in plan for plan in plans)
+
+
+class TestListMoodsPagination:
+    @pytest.mark.asyncio
+    async def test_cursor_walks_every_mood_once(self, mood_repository, user_with_moods):
+        # The fixture inserts every mood in one transaction, so created_at ties on all rows
+        mood_ids = []
+        cursor = None
+        while True:
+            page = await mood_repository.list_moods(user_with_moods.id, 0, 3, cursor)
+            mood_ids += [mood.id for mood in page.items]
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert len(mood_ids) == 10
+        assert sorted(mood_ids) == sorted(mood.id for mood in user_with_moods.moods)
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, mood_repository, user_with_moods):
+        page = await mood_repository.list_moods(user_with_moods.id, 0, 10)
+
+        assert len(page.items) == 10
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, mood_repository, user_with_moods):
+        with pytest.raises(InvalidCursorError, match='Invalid pagination cursor'):
+            await mood_repository.list_moods(user_with_moods.id, 0, 10, 'bm9wZQ')
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('entity_id', ['not-a-uuid', 42])
+    async def test_cursor_with_malformed_id(self, mood_repository, user_with_moods, entity_id):
+        cursor = encode_cursor(datetime(2025, 1, 1, tzinfo=UTC), entity_id)
+
+        with pytest.raises(InvalidCursorError, match='Invalid pagination cursor'):
+            await mood_repository.list_moods(user_with_moods.id, 0, 10, cursor)
+
+
+def as_responses(page):
+    return [MoodResponse.from_entity(mood).model_dump(mode='json') for mood in page.items]
+
+
+class TestListMoodDocuments:
+    @pytest.mark.asyncio
+    async def test_documents_match_the_entity_path(self, mood_repository, user_with_moods):
+        cursor = None
+        while True:
+            page = await mood_repository.list_moods(user_with_moods.id, 0, 4, cursor)
+            documents = await mood_repository.list_mood_documents(user_with_moods.id, 0, 4, cursor)
+
+            assert [json.loads(document) for document in documents.items] == as_responses(page)
+            assert documents.next_cursor == page.next_cursor
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+    @pytest.mark.asyncio
+    async def test_documents_of_archived_moods(self, session, mood_repository, user_with_moods):
+        await mood_repository.archive(timedelta(0), batch_size=4)
+        await session.commit()
+
+        page = await mood_repository.list_moods(user_with_moods.id, 0, 10)
+        documents = await mood_repository.list_mood_documents(user_with_moods.id, 0, 10)
+
+        assert [json.loads(document) for document in documents.items] == as_responses(page)
+
+    @pytest.mark.asyncio
+    async def test_documents_of_the_inline_layout(self, inline_mood_repository, user_with_moods):
+        await inline_mood_repository.backfill(batch_size=5)
+
+        page = await inline_mood_repository.list_moods(user_with_moods.id, 0, 10)
+        documents = await inline_mood_repository.list_mood_documents(user_with_moods.id, 0, 10)
+
+        assert [json.loads(document) for document in documents.items] == as_responses(page)
+
+    @pytest.mark.asyncio
+    async def test_a_full_page_is_one_query(
+        self, engine, count_queries, mood_repository, user_with_moods
+    ):
+        with count_queries(engine=engine) as statements:
+            await mood_repository.list_mood_documents(user_with_moods.id, 0, 5)
+
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_list_mood_documents_uses_indexes(
+        self, session, engine, mood_repository, user_with_moods
+    ):
+        plans = await explain_repository_queries(
+            session, engine, lambda: mood_repository.list_mood_documents(user_with_moods.id, 0, 5)
+        )
+
+        assert 'moods_default_user_id_created_at_id_idx' in plans[0]
+        assert 'associated_emotions_default_mood_id_mood_created_at_name_in_idx' in plans[0]
+        # Either trigger index serves the probe; the planner may also start from the trigger side
+        assert re.search(r'emotional_triggers_default_\w+_idx', plans[0])
+        assert 'Seq Scan' not in plans[0]
+
+
+async def save_filter_moods(session, repository, user_id):
+    moods = [
+        Mood(
+            user_id=user_id,
+            registry_type='event' if index % 2 else 'daily',
+            visual_scale=index % 5 + 1,
+            associated_emotions=[
+                {'name': 'joy' if index % 3 else 'fear', 'intensity': index + 1},
+                {'name': 'sadness', 'intensity': 1},
+            ],
+            triggers=[{'name': f'trigger{index % 4}'}, {'name': 'work'}],
+            description=f'Mood {index}',
+        )
+        for index in range(8)
+    ]
+    for mood in moods:
+        await repository.save(mood)
+        # One transaction per mood, so each gets its own created_at
+        await session.commit()
+    rows = await session.execute(select(MoodModel.description, MoodModel.created_at))
+    return dict(rows.all())
+
+
+async def listed(repository, user_id, filters):
+    page = await repository.list_moods(user_id, 0, 10, filters=filters)
+    return sorted(mood.description for mood in page.items)
+
+
+FILTER_CASES = [
+    (MoodFilters(registry_type='event'), ['Mood 1', 'Mood 3', 'Mood 5', 'Mood 7']),
+    (MoodFilters(visual_scale_min=2, visual_scale_max=3), ['Mood 1', 'Mood 2', 'Mood 6', 'Mood 7']),
+    (MoodFilters(emotion='fear'), ['Mood 0', 'Mood 3', 'Mood 6']),
+    # Name and intensity must hold on the same emotion; sadness is always at intensity 1
+    (MoodFilters(emotion='fear', emotion_intensity_min=4), ['Mood 3', 'Mood 6']),
+    (MoodFilters(emotion_intensity_min=7, emotion_intensity_max=7), ['Mood 6']),
+    (MoodFilters(triggers=['trigger1', 'trigger3']), ['Mood 1', 'Mood 3', 'Mood 5', 'Mood 7']),
+    (MoodFilters(registry_type='daily', triggers=['trigger2']), ['Mood 2', 'Mood 6']),
+    (MoodFilters(triggers=['unknown']), []),
+]
+
+
+class TestListMoodsFilters:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(('filters', 'expected'), FILTER_CASES)
+    async def test_filters_on_the_normalized_layout(
+        self, session, mood_repository, user, filters, expected
+    ):
+        await save_filter_moods(session, mood_repository, user.id)
+
+        assert await listed(mood_repository, user.id, filters) == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(('filters', 'expected'), FILTER_CASES)
+    async def test_filters_on_the_inline_layout(
+        self, session, inline_mood_repository, user, filters, expected
+    ):
+        await save_filter_moods(session, inline_mood_repository, user.id)
+
+        assert await listed(inline_mood_repository, user.id, filters) == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(('filters', 'expected'), FILTER_CASES)
+    async def test_filters_on_archived_moods(
+        self, session, mood_repository, user, filters, expected
+    ):
+        await save_filter_moods(session, mood_repository, user.id)
+        await mood_repository.archive(timedelta(0), batch_size=8)
+        await session.commit()
+
+        assert await listed(mood_repository, user.id, filters) == expected
+
+    @pytest.mark.asyncio
+    async def test_created_at_range(self, session, mood_repository, user):
+        created_at = await save_filter_moods(session, mood_repository, user.id)
+        filters = MoodFilters(created_from=created_at['Mood 2'], created_to=created_at['Mood 5'])
+
+        # from is inclusive and to is exclusive, so consecutive ranges never overlap
+        assert await listed(mood_repository, user.id, filters) == ['Mood 2', 'Mood 3', 'Mood 4']
+
+    @pytest.mark.asyncio
+    async def test_documents_are_filtered_like_entities(self, session, mood_repository, user):
+        await save_filter_moods(session, mood_repository, user.id)
+        filters = MoodFilters(emotion='joy', triggers=['trigger1'])
+
+        page = await mood_repository.list_moods(user.id, 0, 10, filters=filters)
+        documents = await mood_repository.list_mood_documents(user.id, 0, 10, filters=filters)
+
+        assert [json.loads(document) for document in documents.items] == as_responses(page)
+
+    @pytest.mark.asyncio
+    async def test_event_filter_uses_the_partial_index(
+        self, session, engine, mood_repository, user
+    ):
+        await save_filter_moods(session, mood_repository, user.id)
+        filters = MoodFilters(registry_type='event')
+        plans = await explain_repository_queries(
+            session, engine, lambda: mood_repository.list_moods(user.id, 0, 5, filters=filters)
+        )
+
+        # Named by Postgres on the partition, so found by its predicate
+        partial_index = await session.scalar(
+            text(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'moods_default' "
+                "AND indexdef LIKE '%registry_type = ''event''%'"
+            )
+        )
+        assert f'using {partial_index} on' in plans[0]
+        assert all('Seq Scan' not in plan for plan in plans)
+
+    @pytest.mark.asyncio
+    async def test_scale_filter_scans_in_listing_order(
+        self, session, engine, mood_repository, user
+    ):
+        await save_filter_moods(session, mood_repository, user.id)
+        filters = MoodFilters(visual_scale_min=2, visual_scale_max=3)
+        # A handful of rows are cheaper to sort, which is not the case this index is for
+        await session.execute(text('SET LOCAL enable_sort = off'))
+        plans = await explain_repository_queries(
+            session, engine, lambda: mood_repository.list_moods(user.id, 0, 5, filters=filters)
+        )
+
+        # Costed the same as a backward walk of the plain listing index, so either may be picked
+        assert re.search(r'Index Scan (Backward )?using moods_default_user_id_created_at', plans[0])
+        # The limit stops the ordered scan early instead of sorting every match
+        assert plans[0].startswith('Limit')
+        assert 'Sort' not in plans[0]
+
+    @pytest.mark.asyncio
+    async def test_child_filters_use_indexes(self, session, engine, mood_repository, user):
+        await save_filter_moods(session, mood_repository, user.id)
+        filters = MoodFilters(emotion='fear', emotion_intensity_min=4, triggers=['trigger2'])
+        plans = await explain_repository_queries(
+            session, engine, lambda: mood_repository.list_moods(user.id, 0, 5, filters=filters)
+        )
+
+        assert 'associated_emotions_default_mood_id_mood_created_at_name_in_idx' in plans[0]
+        # Either trigger index serves the probe; the planner may also start from the trigger side
+        assert re.search(r'emotional_triggers_default_\w+_idx', plans[0])
+        assert all('Seq Scan' not in plan for plan in plans)
+
+
+def child_writes(statements):
+    return [
+        statement
+        for statement in statements
+        if statement.startswith(('INSERT', 'UPDATE', 'DELETE'))
+        and ('associated_emotions' in statement or 'emotional_triggers' in statement)
+    ]
+
+
+class TestUpdateMood:
+    @pytest.mark.asyncio
+    async def test_description_change_does_not_rewrite_children(
+        self, session, engine, count_queries, mood_repository, user_with_moods
+    ):
+        mood = mood_repository._model_to_entity(user_with_moods.moods[0])
+        session.expunge_all()
+        mood.update_description('Only the description changed')
+
+        with count_queries(engine=engine) as statements:
+            updated_mood = await mood_repository.update(mood)
+
+        assert child_writes(statements) == []
+        assert [s for s in statements if s.startswith('UPDATE')] == [
+            next(s for s in statements if s.startswith('UPDATE moods'))
+        ]
+        assert updated_mood == mood
+
+    @pytest.mark.asyncio
+    async def test_only_changed_children_are_written(
+        self, session, engine, count_queries, mood_repository, user_with_moods
+    ):
+        mood = mood_repository._model_to_entity(user_with_moods.moods[0])
+        session.expunge_all()
+        kept_emotion, changed_emotion = mood.associated_emotions
+        mood.update_associated_emotions([
+            kept_emotion.model_dump(),
+            {'name': changed_emotion.name, 'intensity': changed_emotion.intensity % 10 + 1},
+        ])
+        mood.update_triggers([{'name': mood.triggers[0].name}])
+
+        with count_queries(engine=engine) as statements:
+            await mood_repository.update(mood)
+
+        writes = child_writes(statements)
+        assert len(writes) == 2
+        assert writes[0].startswith('UPDATE associated_emotions')
+        assert writes[1].startswith('DELETE FROM emotional_triggers')
+
+        session.expunge_all()
+        stored = await mood_repository.find_mood_by_id(mood.id, mood.user_id)
+        assert sorted(stored.associated_emotions, key=str) == sorted(
+            mood.associated_emotions, key=str
+        )
+        assert stored.triggers == mood.triggers
+
+    @pytest.mark.asyncio
+    async def test_extra_children_are_inserted(self, session, mood_repository, user_with_moods):
+        mood = mood_repository._model_to_entity(user_with_moods.moods[0])
+        session.expunge_all()
+        mood.update_triggers(
+            [trigger.model_dump() for trigger in mood.triggers] + [{'name': 'new'}]
+        )
+
+        updated_mood = await mood_repository.update(mood)
+
+        session.expunge_all()
+        stored = await mood_repository.find_mood_by_id(mood.id, mood.user_id)
+        assert len(stored.triggers) == 3
+        assert sorted(t.name for t in stored.triggers) == sorted(
+            t.name for t in updated_mood.triggers
+        )
+
+
+class TestTriggerVocabulary:
+    @pytest.mark.asyncio
+    async def test_trigger_names_are_stored_once(self, session, mood_repository, user):
+        moods = [
+            Mood(
+                user_id=user.id,
+                registry_type='event',
+                visual_scale=3,
+                associated_emotions=[],
+                triggers=[{'name': 'work'}, {'name': name}],
+            )
+            for name in ('sleep', 'rain', 'work')
+        ]
+
+        await mood_repository.save_many(moods)
+
+        names = await session.scalars(select(TriggerNameModel.name))
+        assert sorted(names) == ['rain', 'sleep', 'work']
+        for mood in moods:
+            assert await mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+    @pytest.mark.asyncio
+    async def test_new_ids_are_cached_only_after_commit(
+        self, session, mood_repository, trigger_vocabulary, user
+    ):
+        user_id = user.id
+
+        def make_mood():
+            return Mood(
+                user_id=user_id,
+                registry_type='event',
+                visual_scale=3,
+                associated_emotions=[],
+                triggers=[{'name': 'rain'}],
+            )
+
+        await mood_repository.save(make_mood())
+        assert trigger_vocabulary.get_many({'rain'}) == {}
+        await session.rollback()
+
+        await mood_repository.save(make_mood())
+        await session.commit()
+
+        trigger_name_id = await session.scalar(
+            select(TriggerNameModel.id).where(TriggerNameModel.name == 'rain')
+        )
+        assert trigger_vocabulary.get_many({'rain'}) == {'rain': trigger_name_id}
+
+
+class TestSaveMood:
+    @pytest.mark.asyncio
+    async def test_save_is_a_single_statement(
+        self, session, engine, count_queries, mood_repository, user
+    ):
+        def make_mood():
+            return Mood(
+                user_id=user.id,
+                registry_type='daily',
+                visual_scale=4,
+                associated_emotions=[
+                    {'name': 'joy', 'intensity': 8},
+                    {'name': 'fear', 'intensity': 2},
+                ],
+                triggers=[{'name': 'sunny day'}],
+                description='Feeling great!',
+            )
+
+        # Interns 'sunny day' in the vocabulary
+        await mood_repository.save(make_mood())
+        await session.commit()
+        mood = make_mood()
+
+        with count_queries(engine=engine) as statements:
+            saved_mood = await mood_repository.save(mood)
+
+        assert len(statements) == 1
+        assert saved_mood == mood
+
+        stored = await mood_repository.find_mood_by_id(mood.id, user.id)
+        assert stored == mood
+
+    @pytest.mark.asyncio
+    async def test_save_without_children(self, mood_repository, user):
+        mood = Mood(user_id=user.id, registry_type='event', visual_scale=3, associated_emotions=[])
+
+        await mood_repository.save(mood)
+
+        assert await mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+    @pytest.mark.asyncio
+    async def test_save_for_unknown_user(self, mood_repository):
+        mood = Mood(
+            user_id='unknown', registry_type='event', visual_scale=3, associated_emotions=[]
+        )
+
+        with pytest.raises(IntegrityConstraintViolationError):
+            await mood_repository.save(mood)
+
+
+class TestDeleteMood:
+    @pytest.mark.asyncio
+    async def test_delete_is_a_single_statement(
+        self, session, engine, count_queries, mood_repository, user
+    ):
+        mood = Mood(
+            user_id=user.id,
+            registry_type='event',
+            visual_scale=3,
+            associated_emotions=[{'name': 'joy', 'intensity': 5}] * 4,
+            triggers=[{'name': 'work'}, {'name': 'rain'}, {'name': 'sleep'}],
+        )
+        await mood_repository.save(mood)
+
+        with count_queries(engine=engine) as statements:
+            await mood_repository.delete(mood.id, user.id)
+
+        assert len(statements) == 1
+        assert statements[0].startswith('DELETE FROM moods')
+        for table in ('associated_emotions', 'emotional_triggers'):
+            remaining = await session.scalar(text(f'SELECT count(*) FROM {table}'))
+            assert remaining == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_only_owned_mood(self, mood_repository, user, other_user):
+        mood = Mood(user_id=user.id, registry_type='event', visual_scale=3, associated_emotions=[])
+        await mood_repository.save(mood)
+
+        with pytest.raises(EntityNotFoundError, match='Mood not found'):
+            await mood_repository.delete(mood.id, other_user.id)
+
+        assert await mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+
+class TestColumnTypes:
+    @pytest.mark.asyncio
+    async def test_columns_use_native_types(self, session, mood_repository, user):
+        mood = Mood(
+            user_id=user.id,
+            registry_type='daily',
+            visual_scale=4,
+            associated_emotions=[{'name': 'joy', 'intensity': 7}],
+        )
+        await mood_repository.save(mood)
+
+        types = await session.execute(
+            text(
+                'SELECT pg_typeof(m.id)::text, pg_typeof(m.registry_type)::text, '
+                'pg_typeof(m.visual_scale)::text, pg_typeof(a.name)::text '
+                'FROM moods m JOIN associated_emotions a ON a.mood_id = m.id'
+            )
+        )
+
+        assert types.one() == ('uuid', 'registry_type', 'smallint', 'emotion_name')
+        assert await mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+    @pytest.mark.asyncio
+    async def test_find_mood_with_malformed_id(self, mood_repository, user):
+        with pytest.raises(EntityNotFoundError, match='Mood not found'):
+            await mood_repository.find_mood_by_id('not-a-uuid', user.id)
@@ -0,0 +1,112 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select, text
+
+from src.domain.entities.mood import Mood
+from src.infrastructure.database.orm import (
+    AssociatedEmotionsModel,
+    EmotionalTriggerModel,
+    MoodModel,
+)
+from src.infrastructure.database.partitions import (
+    add_months,
+    create_mood_partitions,
+    is_partition_name,
+)
+from src.interfaces.cli.create_mood_partitions import create_partitions
+
+
+async def partitions_of(session, table):
+    result = await session.scalars(
+        text(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = CAST(:table AS regclass) ORDER BY 1'
+        ),
+        {'table': table},
+    )
+    return result.all()
+
+
+def test_add_months_across_years():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_names_are_recognised():
+    assert is_partition_name('moods_p2025_09')
+    assert is_partition_name('emotional_triggers_default')
+    assert not is_partition_name('moods')
+    assert not is_partition_name('users_p2025_09')
+
+
+@pytest.mark.asyncio
+async def test_create_mood_partitions_is_idempotent(session, engine):
+    async with engine.begin() as connection:
+        created = await create_mood_partitions(connection, date(2025, 12, 15), months_ahead=1)
+        again = await create_mood_partitions(connection, date(2025, 12, 15), months_ahead=1)
+
+    assert sorted(created) == [
+        'associated_emotions_p2025_12',
+        'associated_emotions_p2026_01',
+        'emotional_triggers_p2025_12',
+        'emotional_triggers_p2026_01',
+        'moods_p2025_12',
+        'moods_p2026_01',
+    ]
+    assert again == []
+    assert await partitions_of(session, 'moods') == [
+        'moods_default',
+        'moods_p2025_12',
+        'moods_p2026_01',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_mood_and_children_share_the_month_partition(session, engine, mood_repository, user):
+    today = await session.scalar(text('SELECT CAST(now() AS date)'))
+    await session.commit()
+    async with engine.begin() as connection:
+        await create_mood_partitions(connection, today, months_ahead=0)
+    mood = Mood(
+        user_id=user.id,
+        registry_type='daily',
+        visual_scale=4,
+        associated_emotions=[{'name': 'joy', 'intensity': 8}],
+        triggers=[{'name': 'sunny day'}],
+    )
+
+    await mood_repository.save(mood)
+
+    suffix = f'_p{today:%Y_%m}'
+    for model in (MoodModel, AssociatedEmotionsModel, EmotionalTriggerModel):
+        partition = await session.scalar(
+            select(text('tableoid::regclass::text')).select_from(model).limit(1)
+        )
+        assert partition == f'{model.__tablename__}{suffix}'
+    assert await mood_repository.find_mood_by_id(mood.id, user.id) == mood
+
+
+@pytest.mark.asyncio
+async def test_recent_moods_query_prunes_old_partitions(session, engine, user):
+    async with engine.begin() as connection:
+        await create_mood_partitions(connection, date(2025, 1, 1), months_ahead=5)
+
+    plan = await session.execute(
+        text('EXPLAIN SELECT * FROM moods WHERE user_id = :user_id AND created_at >= :since'),
+        {'user_id': user.id, 'since': date(2025, 5, 1)},
+    )
+    scanned = '\n'.join(row[0] for row in plan)
+
+    assert 'moods_p2025_05' in scanned
+    assert 'moods_p2025_06' in scanned
+    assert 'moods_p2025_04' not in scanned
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_command(session, engine):
+    created = await create_partitions(engine, months_ahead=2)
+
+    assert len(created) == 9
+    assert await create_partitions(engine, months_ahead=2) == []
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from freezegun import freeze_time
+
+from src.domain.entities import User
+from src.infrastructure.cache.principal_cache import InMemoryPrincipalCache
+
+
+def make_user(index: int) -> User:
+    return User(
+        username=f'testuser{index}',
+        email=f'testuser{index}@example.com',
+        password='HashedPassword123',
+    )
+
+
+class TestInMemoryPrincipalCache:
+    def test_get_returns_cached_user(self):
+        cache = InMemoryPrincipalCache(max_size=10, ttl_seconds=60)
+        user = make_user(0)
+
+        cache.set(user.email, user)
+
+        assert cache.get(user.email) == user
+        assert cache.get('missing@example.com') is None
+
+    def test_get_returns_copy(self):
+        cache = InMemoryPrincipalCache(max_size=10, ttl_seconds=60)
+        user = make_user(0)
+        cache.set(user.email, user)
+
+        cache.get(user.email).is_admin = True
+
+        assert cache.get(user.email).is_admin is False
+
+    def test_entry_expires_after_ttl(self):
+        cache = InMemoryPrincipalCache(max_size=10, ttl_seconds=60)
+        user = make_user(0)
+
+        with freeze_time() as frozen_time:
+            cache.set(user.email, user)
+            frozen_time.tick(timedelta(seconds=59))
+            assert cache.get(user.email) == user
+
+            frozen_time.tick(timedelta(seconds=2))
+            assert cache.get(user.email) is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = InMemoryPrincipalCache(max_size=2, ttl_seconds=60)
+        users = [make_user(i) for i in range(3)]
+
+        cache.set(users[0].email, users[0])
+        cache.set(users[1].email, users[1])
+        cache.get(users[0].email)
+        cache.set(users[2].email, users[2])
+
+        assert cache.get(users[0].email) == users[0]
+        assert cache.get(users[1].email) is None
+        assert cache.get(users[2].email) == users[2]
+
+    def test_invalidate_removes_user_entries(self):
+        cache = InMemoryPrincipalCache(max_size=10, ttl_seconds=60)
+        user, other_user = make_user(0), make_user(1)
+        cache.set(user.email, user)
+        cache.set(other_user.email, other_user)
+
+        cache.invalidate(user.id)
+
+        assert cache.get(user.email) is None
+        assert cache.get(other_user.email) == other_user
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from freezegun import freeze_time
+
+from src.infrastructure.cache.recent_writers import RecentWriters
+
+
+class TestRecentWriters:
+    def test_writer_is_recent_within_window(self):
+        writers = RecentWriters(max_size=10, window_seconds=5)
+
+        with freeze_time() as frozen_time:
+            writers.record('testuser0@example.com')
+            frozen_time.tick(timedelta(seconds=4))
+            assert writers.wrote_recently('testuser0@example.com') is True
+            assert writers.wrote_recently('testuser1@example.com') is False
+
+            frozen_time.tick(timedelta(seconds=2))
+            assert writers.wrote_recently('testuser0@example.com') is False
+
+    def test_new_write_restarts_window(self):
+        writers = RecentWriters(max_size=10, window_seconds=5)
+
+        with freeze_time() as frozen_time:
+            writers.record('testuser0@example.com')
+            frozen_time.tick(timedelta(seconds=4))
+            writers.record('testuser0@example.com')
+            frozen_time.tick(timedelta(seconds=4))
+
+            assert writers.wrote_recently('testuser0@example.com') is True
+
+    def test_oldest_writer_is_evicted(self):
+        writers = RecentWriters(max_size=2, window_seconds=5)
+
+        for i in range(3):
+            writers.record(f'testuser{i}@example.com')
+
+        assert writers.wrote_recently('testuser0@example.com') is False
+        assert writers.wrote_recently('testuser2@example.com') is True
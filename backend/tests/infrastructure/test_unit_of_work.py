@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import select
+
+from src.infrastructure.database.unit_of_work import after_commit
+
+
+class TestUnitOfWork:
+    @pytest.mark.asyncio
+    async def test_repository_writes_are_kept_only_on_commit(
+        self, unit_of_work, user_repository, user
+    ):
+        user_domain = user_repository._model_to_entity(user)
+
+        async with unit_of_work:
+            user_domain.make_admin()
+            await user_repository.update(user_domain)
+
+        assert (await user_repository.find_by_id(user_domain.id)).is_admin is False
+
+        async with unit_of_work:
+            await user_repository.update(user_domain)
+            await unit_of_work.commit()
+
+        assert (await user_repository.find_by_id(user_domain.id)).is_admin is True
+
+    @pytest.mark.asyncio
+    async def test_after_commit_callbacks_run_only_on_commit(self, session, unit_of_work):
+        calls = []
+
+        await session.execute(select(1))
+        after_commit(session, lambda: calls.append('discarded'))
+        await unit_of_work.rollback()
+
+        await session.execute(select(1))
+        after_commit(session, lambda: calls.append('committed'))
+        await unit_of_work.commit()
+        await unit_of_work.commit()
+
+        assert calls == ['committed']
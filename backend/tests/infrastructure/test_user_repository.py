@@ -1,5 +1,6 @@
 import pytest
 
+from src.application.exceptions import EntityAlreadyExistsError
 from src.domain.entities import User
 
 
@@ -19,3 +20,47 @@ class TestSQLAlchemyUserRepository:
         assert fetched_user.id == user.id
         assert fetched_user.email == user.email
         assert fetched_user.password == user.password
+
+    @pytest.mark.asyncio
+    async def test_save_is_a_single_insert(self, engine, count_queries, user_repository):
+        user = User(
+            username='testuser',
+            email='testuser@example.com',
+            password='HashedPassword123',
+        )
+
+        with count_queries(engine=engine) as statements:
+            saved_user = await user_repository.save(user)
+
+        assert len(statements) == 1
+        assert statements[0].startswith('INSERT INTO users')
+        assert saved_user == user
+
+    @pytest.mark.asyncio
+    async def test_save_duplicated_email(self, user_repository, user):
+        duplicated = User(username='another', email=user.email, password='HashedPassword123')
+
+        with pytest.raises(EntityAlreadyExistsError):
+            await user_repository.save(duplicated)
+
+    @pytest.mark.asyncio
+    async def test_find_by_id_for_update_locks_the_row(
+        self, engine, count_queries, user_repository, user
+    ):
+        with count_queries(engine=engine) as statements:
+            await user_repository.find_by_id(user.id, for_update=True)
+
+        assert statements[0].rstrip().endswith('FOR UPDATE')
+
+    @pytest.mark.asyncio
+    async def test_update_with_stale_entity_keeps_revoked_tokens(self, user_repository, user):
+        stale = await user_repository.find_by_id(user.id)
+        revoked = await user_repository.find_by_id(user.id)
+        revoked.revoke_tokens()
+        await user_repository.update(revoked)
+
+        stale.update_profile(first_name='Stale')
+        updated = await user_repository.update(stale)
+
+        assert updated.first_name == 'Stale'
+        assert updated.token_version == revoked.token_version
@@ -0,0 +1,161 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import status
+from freezegun import freeze_time
+
+from src.interfaces.http.admission import (
+    AdmissionRejectedError,
+    ConcurrencyLimiter,
+    TokenBucketLimiter,
+)
+
+
+class TestConcurrencyLimiter:
+    @pytest.mark.asyncio
+    async def test_requests_wait_in_queue_for_a_slot(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=1)
+        release = asyncio.Event()
+
+        async def hold_slot():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold_slot())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold_slot())
+        await asyncio.sleep(0)
+
+        assert limiter.in_flight == 1
+        assert limiter.queued == 1
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_overflow_is_rejected(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=0, queue_timeout=1)
+
+        async with limiter.slot():
+            with pytest.raises(AdmissionRejectedError):
+                async with limiter.slot():
+                    pass
+
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_is_rejected(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=0.01)
+
+        async with limiter.slot():
+            with pytest.raises(AdmissionRejectedError):
+                async with limiter.slot():
+                    pass
+
+            assert limiter.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=1)
+
+        async def wait_for_slot():
+            async with limiter.slot():
+                pass
+
+        async with limiter.slot():
+            waiter = asyncio.create_task(wait_for_slot())
+            await asyncio.sleep(0)
+            assert limiter.queued == 1
+
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+            assert limiter.queued == 0
+
+        assert limiter.in_flight == 0
+
+        # The freed slot is still usable
+        async with limiter.slot():
+            assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_waiter_cancelled_after_handover_passes_the_slot_on(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=1)
+
+        async def wait_for_slot():
+            async with limiter.slot():
+                pass
+
+        async with limiter.slot():
+            waiter = asyncio.create_task(wait_for_slot())
+            await asyncio.sleep(0)
+        # The slot was handed to the waiter, which is cancelled before it resumes
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
+
+
+class TestTokenBucketLimiter:
+    def test_bucket_refills_over_time(self):
+        limiter = TokenBucketLimiter(capacity=2, refill_per_second=0.5, max_keys=10)
+
+        with freeze_time() as frozen_time:
+            assert limiter.consume('key') == 0
+            assert limiter.consume('key') == 0
+            assert limiter.consume('key') == pytest.approx(2)
+            assert limiter.consume('other-key') == 0
+
+            frozen_time.tick(timedelta(seconds=2))
+            assert limiter.consume('key') == 0
+
+
+class TestLoginAdmission:
+    @pytest.fixture(autouse=True)
+    def user_request(self, client):
+        client.post(
+            '/auth/signup',
+            json={
+                'username': 'testuser',
+                'email': 'testuser@example.com',
+                'password': 'Password123',
+                'first_name': 'Test',
+                'last_name': 'User',
+            },
+        )
+
+    def test_login_rate_limited_per_account(self, client, auth_admission):
+        auth_admission.account_rate_limiter = TokenBucketLimiter(
+            capacity=1, refill_per_second=0.1, max_keys=10
+        )
+
+        first_response = client.post(
+            '/auth/login', data={'username': 'testuser@example.com', 'password': 'wrong-password'}
+        )
+        response = client.post(
+            '/auth/login', data={'username': 'testuser@example.com', 'password': 'Password123'}
+        )
+
+        assert first_response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.json() == {'detail': 'Too many login attempts'}
+        assert int(response.headers['Retry-After']) > 0
+
+    def test_login_shed_when_overloaded(self, client, auth_admission):
+        auth_admission.login_limiter = ConcurrencyLimiter(
+            max_concurrency=0, max_queue=0, queue_timeout=2
+        )
+
+        response = client.post(
+            '/auth/login', data={'username': 'testuser@example.com', 'password': 'Password123'}
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers['Retry-After'] == '2'
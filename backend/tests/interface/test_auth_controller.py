@@ -106,3 +106,40 @@ class TestLogin:
         )
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert response.json() == {'detail': 'User account is inactive'}
+
+
+class TestRefreshToken:
+    @pytest.fixture(autouse=True)
+    def user_request(self, client):
+        client.post(
+            '/auth/signup',
+            json={
+                'username': 'testuser',
+                'email': 'testuser@example.com',
+                'password': 'Password123',
+                'first_name': 'Test',
+                'last_name': 'User',
+            },
+        )
+
+    @pytest.fixture
+    def refresh_token(self, client):
+        response = client.post(
+            '/auth/login', data={'username': 'testuser@example.com', 'password': 'Password123'}
+        )
+        return response.json()['refresh_token']
+
+    def test_refresh_token_valid(self, client, refresh_token):
+        response = client.post('/auth/refresh_token', json={'refresh_token': refresh_token})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'access_token' in response.json()
+        assert response.json()['refresh_token'] != refresh_token
+
+    def test_refresh_token_reused(self, client, refresh_token):
+        client.post('/auth/refresh_token', json={'refresh_token': refresh_token})
+
+        response = client.post('/auth/refresh_token', json={'refresh_token': refresh_token})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json() == {'detail': 'Refresh token has already been used'}
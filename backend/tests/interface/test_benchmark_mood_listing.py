@@ -0,0 +1,16 @@
+import pytest
+from sqlalchemy import func, select
+
+from src.infrastructure.database.orm import MoodModel, UserModel
+from src.interfaces.cli.benchmark_mood_listing import benchmark
+
+
+@pytest.mark.asyncio
+async def test_benchmark_compares_both_read_paths_and_cleans_up(session, engine):
+    results = await benchmark(engine, moods=5, page_size=2, rounds=2)
+
+    assert [result.layout for result in results] == ['normalized', 'inline']
+    assert all(result.pages == 3 for result in results)
+    assert all(result.entities_ms > 0 and result.documents_ms > 0 for result in results)
+    assert await session.scalar(select(func.count()).select_from(MoodModel)) == 0
+    assert await session.scalar(select(func.count()).select_from(UserModel)) == 0
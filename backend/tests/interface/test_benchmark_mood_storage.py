@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy import func, select
+
+from src.infrastructure.database.orm import MoodModel, UserModel
+from src.interfaces.cli.benchmark_mood_storage import benchmark
+
+
+@pytest.mark.asyncio
+async def test_benchmark_compares_both_layouts_and_cleans_up(session, engine):
+    results = await benchmark(engine, moods=4, reads=2, page_size=3)
+
+    assert [result.layout for result in results] == ['normalized', 'inline']
+    normalized, inline = results
+    assert normalized.statements_per_read == 3
+    assert inline.statements_per_read == 1
+    assert inline.bytes_per_mood < normalized.bytes_per_mood
+    assert await session.scalar(select(func.count()).select_from(MoodModel)) == 0
+    assert await session.scalar(select(func.count()).select_from(UserModel)) == 0
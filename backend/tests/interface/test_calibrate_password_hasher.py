@@ -0,0 +1,19 @@
+from src.domain.services.password import Argon2Parameters
+from src.interfaces.cli.calibrate_password_hasher import MIN_MEMORY_COST, calibrate, main
+
+
+def test_calibrate_falls_back_to_minimum_cost_when_target_is_unreachable():
+    parameters, elapsed = calibrate(
+        target_ms=0, max_memory_cost=MIN_MEMORY_COST * 2, parallelism=1, samples=1
+    )
+
+    assert parameters == Argon2Parameters(time_cost=1, memory_cost=MIN_MEMORY_COST, parallelism=1)
+    assert elapsed > 0
+
+
+def test_main_prints_settings(capsys):
+    main(['--target-ms', '0', '--max-memory-cost', str(MIN_MEMORY_COST), '--samples', '1'])
+
+    assert capsys.readouterr().out == (
+        f'ARGON2_TIME_COST=1\nARGON2_MEMORY_COST={MIN_MEMORY_COST}\nARGON2_PARALLELISM=4\n'
+    )
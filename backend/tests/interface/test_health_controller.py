@@ -0,0 +1,23 @@
+from fastapi import status
+
+from src.settings import Settings
+
+
+def test_get_database_pool(client):
+    response = client.get('/health/database')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['size'] == Settings().DATABASE_POOL_SIZE
+    assert response.json()['max_overflow'] == Settings().DATABASE_MAX_OVERFLOW
+    assert set(response.json()) >= {'checked_out', 'idle', 'overflow', 'average_wait_seconds'}
+
+
+def test_get_password_hasher(client):
+    response = client.get('/health/password_hasher')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        'max_workers': Settings().PASSWORD_HASHER_MAX_WORKERS,
+        'in_flight': 0,
+        'queued': 0,
+    }
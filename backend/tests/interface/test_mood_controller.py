@@ -2,6 +2,7 @@ import pytest
 import pytest_asyncio
 
 from src.domain.entities.mood import Mood
+from src.interfaces.http.schemas.mood_schemas import ListMoodsResponse, MoodResponse
 
 
 @pytest.fixture
@@ -25,7 +26,7 @@ def token(client):
 
 
 @pytest_asyncio.fixture
-async def create_moods_for_user(user_repository, mood_repository):
+async def create_moods_for_user(token, unit_of_work, user_repository, mood_repository):
     user = await user_repository.find_by_email('testuser0@example.com')
     for i in range(2, 15):
         await mood_repository.save(
@@ -38,10 +39,12 @@ async def create_moods_for_user(user_repository, mood_repository):
                 description=f'Mood entry {i}',
             )
         )
+        # One transaction per mood, so each gets its own created_at
+        await unit_of_work.commit()
 
 
 @pytest_asyncio.fixture
-async def create_moods_for_another_user(user_repository, mood_repository):
+async def create_moods_for_another_user(token, unit_of_work, user_repository, mood_repository):
     user = await user_repository.find_by_email('testuser1@example.com')
     for i in range(2, 15):
         await mood_repository.save(
@@ -54,6 +57,8 @@ async def create_moods_for_another_user(user_repository, mood_repository):
                 description=f'Mood entry {i}',
             )
         )
+        # One transaction per mood, so each gets its own created_at
+        await unit_of_work.commit()
 
 
 class TestCreateMood:
@@ -136,6 +141,90 @@ class TestCreateMood:
         assert response.status_code == 400
 
 
+def batch_item(**overrides):
+    item = {
+        'registry_type': 'daily',
+        'visual_scale': 4,
+        'associated_emotions': [{'name': 'joy', 'intensity': 8}],
+        'triggers': [{'name': 'sunshine'}],
+        'description': 'Feeling great!',
+    }
+    return {**item, **overrides}
+
+
+class TestCreateMoodsBatch:
+    @pytest.mark.asyncio
+    async def test_create_moods_batch_as_owner(
+        self, client, token, user_repository, engine, count_queries
+    ):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        with count_queries(engine=engine) as statements:
+            response = client.post(
+                f'/users/{user.id}/moods/batch',
+                headers={'Authorization': f'Bearer {token}'},
+                json={
+                    'moods': [
+                        batch_item(description='first'),
+                        batch_item(visual_scale=9),
+                        batch_item(description='third', triggers=[]),
+                    ]
+                },
+            )
+
+        assert response.status_code == 207
+        results = response.json()['results']
+        assert [result['status'] for result in results] == ['created', 'invalid', 'created']
+        assert [result['index'] for result in results] == [0, 1, 2]
+        assert results[0]['mood']['description'] == 'first'
+        assert results[1]['mood'] is None
+        assert 'visual_scale' in results[1]['error']
+        assert len([s for s in statements if 'INSERT INTO moods' in s]) == 1
+
+        response = client.get(
+            f'/users/{user.id}/moods', headers={'Authorization': f'Bearer {token}'}
+        )
+        assert sorted(mood['description'] for mood in response.json()['moods']) == [
+            'first',
+            'third',
+        ]
+
+    @pytest.mark.asyncio
+    async def test_create_moods_batch_as_admin(self, client, user_repository, token):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        user.is_admin = True
+        await user_repository.update(user)
+
+        user_1 = await user_repository.find_by_email('testuser1@example.com')
+        response = client.post(
+            f'/users/{user_1.id}/moods/batch',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'moods': [batch_item(), batch_item()]},
+        )
+        assert response.status_code == 207
+        assert all(result['mood']['user_id'] == user_1.id for result in response.json()['results'])
+
+    @pytest.mark.asyncio
+    async def test_create_moods_batch_unauthorized(self, client, user_repository, token):
+        user_1 = await user_repository.find_by_email('testuser1@example.com')
+        response = client.post(
+            f'/users/{user_1.id}/moods/batch',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'moods': [batch_item()]},
+        )
+        assert response.status_code == 403
+        assert response.json()['detail'] == 'Not enough permissions'
+
+    @pytest.mark.asyncio
+    async def test_create_moods_batch_empty(self, client, user_repository, token):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        response = client.post(
+            f'/users/{user.id}/moods/batch',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'moods': []},
+        )
+        assert response.status_code == 422
+
+
 class TestListMoods:
     @pytest.mark.asyncio
     async def test_list_moods_as_owner(self, client, token, user_repository, create_moods_for_user):
@@ -175,6 +264,34 @@ class TestListMoods:
         assert response.status_code == 403
         assert response.json()['detail'] == 'Not enough permissions'
 
+    @pytest.mark.asyncio
+    async def test_list_moods_with_self_contained_token(
+        self, client, monkeypatch, unit_of_work, user_repository, create_moods_for_user
+    ):
+        monkeypatch.setenv('JWT_SELF_CONTAINED_CLAIMS', 'true')
+        self_contained_token = client.post(
+            '/auth/login', data={'username': 'testuser0@example.com', 'password': 'Password123'}
+        ).json()['access_token']
+
+        user = await user_repository.find_by_email('testuser0@example.com')
+        response = client.get(
+            f'/users/{user.id}/moods',
+            headers={'Authorization': f'Bearer {self_contained_token}'},
+        )
+        assert response.status_code == 200
+        assert len(response.json()['moods']) == 10
+
+        user.deactivate()
+        await user_repository.update(user)
+        await unit_of_work.commit()
+
+        response = client.get(
+            f'/users/{user.id}/moods',
+            headers={'Authorization': f'Bearer {self_contained_token}'},
+        )
+        assert response.status_code == 401
+        assert response.json()['detail'] == 'Token has been revoked'
+
     @pytest.mark.asyncio
     async def test_list_moods_pagination(
         self, client, token, user_repository, create_moods_for_user
@@ -187,3 +304,101 @@ class TestListMoods:
         )
         assert response.status_code == 200
         assert len(response.json()['moods']) == 5
+
+    @pytest.mark.asyncio
+    async def test_list_moods_cursor_pagination(
+        self, client, token, user_repository, create_moods_for_user
+    ):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        descriptions = []
+        params = {'limit': 5}
+        while True:
+            response = client.get(
+                f'/users/{user.id}/moods',
+                params=params,
+                headers={'Authorization': f'Bearer {token}'},
+            )
+            assert response.status_code == 200
+            descriptions += [mood['description'] for mood in response.json()['moods']]
+            if response.json()['next_cursor'] is None:
+                break
+            params['cursor'] = response.json()['next_cursor']
+
+        assert descriptions == [f'Mood entry {i}' for i in range(14, 1, -1)]
+
+    @pytest.mark.asyncio
+    async def test_list_moods_body_matches_the_response_model(
+        self, client, token, user_repository, mood_repository, create_moods_for_user
+    ):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        response = client.get(
+            f'/users/{user.id}/moods',
+            params={'limit': 3},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+        page = await mood_repository.list_moods(user.id, 0, 3)
+        assert response.headers['content-type'] == 'application/json'
+        assert response.json() == ListMoodsResponse(
+            moods=[MoodResponse.from_entity(mood) for mood in page.items],
+            next_cursor=page.next_cursor,
+        ).model_dump(mode='json')
+
+    @pytest.mark.asyncio
+    async def test_list_moods_with_invalid_cursor(self, client, token, user_repository):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        response = client.get(
+            f'/users/{user.id}/moods',
+            params={'cursor': 'not-a-cursor'},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        assert response.status_code == 400
+        assert response.json()['detail'] == 'Invalid pagination cursor'
+
+    @pytest.mark.asyncio
+    async def test_list_moods_with_filters(
+        self, client, token, user_repository, create_moods_for_user
+    ):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        response = client.get(
+            f'/users/{user.id}/moods',
+            params={
+                'from': '2000-01-01T00:00:00+03:00',
+                'registry_type': 'daily',
+                'visual_scale_min': 4,
+                'emotion': 'joy',
+                'emotion_intensity_min': 9,
+                'trigger': ['trigger3', 'trigger8', 'trigger13'],
+            },
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        assert response.status_code == 200
+        assert [mood['description'] for mood in response.json()['moods']] == ['Mood entry 8']
+
+    @pytest.mark.asyncio
+    async def test_list_moods_filtered_out(
+        self, client, token, user_repository, create_moods_for_user
+    ):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        for params in (
+            {'registry_type': 'event'},
+            {'from': '2100-01-01T00:00:00Z'},
+            {'to': '2000-01-01T00:00:00-03:00'},
+        ):
+            response = client.get(
+                f'/users/{user.id}/moods',
+                params=params,
+                headers={'Authorization': f'Bearer {token}'},
+            )
+            assert response.status_code == 200
+            assert response.json() == {'moods': [], 'next_cursor': None}
+
+    @pytest.mark.asyncio
+    async def test_list_moods_with_inverted_range(self, client, token, user_repository):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        response = client.get(
+            f'/users/{user.id}/moods',
+            params={'visual_scale_min': 4, 'visual_scale_max': 2},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        assert response.status_code == 422
@@ -0,0 +1,133 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.api import app
+from src.domain.entities.mood import Mood
+from src.infrastructure.cache.principal_cache import InMemoryPrincipalCache
+from src.infrastructure.cache.recent_writers import RecentWriters
+from src.infrastructure.database.orm import table_registry
+from src.infrastructure.database.session import get_replica_session
+from src.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+
+
+@pytest_asyncio.fixture
+async def replica_session(engine):
+    """Segundo banco no mesmo servidor, fazendo o papel de uma réplica atrasada"""
+    name = f'replica_{uuid.uuid4().hex}'
+    admin_engine = create_async_engine(engine.url, isolation_level='AUTOCOMMIT')
+    async with admin_engine.connect() as conn:
+        await conn.execute(text(f'CREATE DATABASE {name}'))
+
+    replica_engine = create_async_engine(engine.url.set(database=name))
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    async with AsyncSession(replica_engine, expire_on_commit=False) as session:
+        yield session
+
+    await replica_engine.dispose()
+    async with admin_engine.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE {name}'))
+    await admin_engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def replica_user(client, user_repository, replica_session):
+    """Usuário logado, copiado para a réplica sem nenhum humor"""
+    client.post(
+        '/auth/signup',
+        json={
+            'username': 'testuser0',
+            'email': 'testuser0@example.com',
+            'password': 'Password123',
+            'first_name': 'Test',
+            'last_name': 'User',
+        },
+    )
+    response = client.post(
+        '/auth/login', data={'username': 'testuser0@example.com', 'password': 'Password123'}
+    )
+    client.headers['Authorization'] = f'Bearer {response.json()["access_token"]}'
+
+    user = await user_repository.find_by_email('testuser0@example.com')
+    await SQLAlchemyUserRepository(
+        replica_session, InMemoryPrincipalCache(max_size=0, ttl_seconds=0)
+    ).save(user)
+
+    app.dependency_overrides[get_replica_session] = lambda: replica_session
+    return user
+
+
+def mood_payload():
+    return {
+        'registry_type': 'daily',
+        'visual_scale': 3,
+        'associated_emotions': [{'name': 'joy', 'intensity': 5}],
+        'triggers': [{'name': 'work'}],
+        'description': 'Replica test',
+    }
+
+
+class TestReadReplicaRouting:
+    def test_own_write_is_read_from_primary_within_window(self, client, replica_user):
+        response = client.post(f'/users/{replica_user.id}/moods/', json=mood_payload())
+        assert response.status_code == 201
+        mood_id = response.json()['id']
+
+        response = client.get(f'/users/{replica_user.id}/moods/')
+
+        assert response.status_code == 200
+        assert [mood['id'] for mood in response.json()['moods']] == [mood_id]
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica_without_recent_write(
+        self, client, replica_user, mood_repository
+    ):
+        # Written outside a request, so it only exists on the primary
+        await mood_repository.save(Mood(user_id=replica_user.id, **mood_payload()))
+
+        response = client.get(f'/users/{replica_user.id}/moods/')
+
+        assert response.status_code == 200
+        assert response.json()['moods'] == []
+
+
+class TestReadReplicaRoutingAfterWindow:
+    @pytest.fixture
+    def recent_writers(self):
+        return RecentWriters(max_size=128, window_seconds=0)
+
+    def test_reads_go_to_replica_once_window_has_passed(self, client, replica_user):
+        response = client.post(f'/users/{replica_user.id}/moods/', json=mood_payload())
+        assert response.status_code == 201
+
+        response = client.get(f'/users/{replica_user.id}/moods/')
+
+        assert response.status_code == 200
+        assert response.json()['moods'] == []
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_checked_on_primary(
+        self, client, monkeypatch, replica_user, user_repository, unit_of_work
+    ):
+        monkeypatch.setenv('JWT_SELF_CONTAINED_CLAIMS', 'true')
+        response = client.post(
+            '/auth/login', data={'username': 'testuser0@example.com', 'password': 'Password123'}
+        )
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+        assert client.get(f'/users/{replica_user.id}/moods/', headers=headers).status_code == 200
+
+        # Revoked outside the user's own requests, so the replica still has the old version
+        user = await user_repository.find_by_id(replica_user.id)
+        user.deactivate()
+        await user_repository.update(user)
+        await unit_of_work.commit()
+
+        response = client.get(f'/users/{replica_user.id}/moods/', headers=headers)
+
+        assert response.status_code == 401
+        assert response.json()['detail'] == 'Token has been revoked'
@@ -1,6 +1,9 @@
 import pytest
 from fastapi import status
 
+from src.domain.services.jwt_token import JWTTokenService
+from src.interfaces.cli.purge_deleted_accounts import purge
+
 
 @pytest.fixture(autouse=True)
 def token(client):
@@ -33,12 +36,55 @@ class TestGetUsers:
         assert response.status_code == status.HTTP_200_OK
         assert isinstance(response.json()['users'], list)
         assert len(response.json()['users']) == 4
+        assert response.json()['next_cursor'] is None
+
+    @pytest.mark.asyncio
+    async def test_get_users_cursor_pagination(self, client, user_repository, token):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        user.is_admin = True
+        await user_repository.update(user)
+
+        usernames = []
+        params = {'limit': 3}
+        while True:
+            response = client.get(
+                '/users', params=params, headers={'Authorization': f'Bearer {token}'}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            usernames += [user['username'] for user in response.json()['users']]
+            if response.json()['next_cursor'] is None:
+                break
+            params['cursor'] = response.json()['next_cursor']
+
+        assert usernames == [f'testuser{i}' for i in range(4)]
+
+    @pytest.mark.asyncio
+    async def test_get_users_with_invalid_cursor(self, client, user_repository, token):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        user.is_admin = True
+        await user_repository.update(user)
+
+        response = client.get(
+            '/users', params={'cursor': 'bm9wZQ'}, headers={'Authorization': f'Bearer {token}'}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'detail': 'Invalid pagination cursor'}
 
     def test_get_users_when_normal_user(self, client, token):
         response = client.get('/users', headers={'Authorization': f'Bearer {token}'})
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert response.json() == {'detail': 'Only admin users can retrieve the user list'}
 
+    def test_get_users_does_not_load_moods(self, client, engine, count_queries, user_with_moods):
+        token = JWTTokenService().create_access_token({'sub': user_with_moods.email})
+
+        with count_queries(engine=engine) as statements:
+            response = client.get('/users', headers={'Authorization': f'Bearer {token}'})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert len(statements) == 1
+        assert 'moods' not in statements[0]
+
 
 class TestUpdateUser:
     @pytest.mark.asyncio
@@ -119,3 +165,80 @@ class TestUpdateUser:
         )
         assert response.status_code == status.HTTP_409_CONFLICT
         assert response.json() == {'detail': 'User with this email or username already exists'}
+
+
+class TestDeleteUser:
+    @pytest.mark.asyncio
+    async def test_delete_user_when_itself(self, client, user_repository, token):
+        user = await user_repository.find_by_email('testuser0@example.com')
+
+        response = client.delete(f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        assert (await user_repository.find_by_id(user.id)).is_active is False
+        response = client.post(
+            '/auth/login', data={'username': 'testuser0@example.com', 'password': 'Password123'}
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.asyncio
+    async def test_deleted_user_cannot_use_moods(self, client, user_repository, token):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        client.delete(f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'})
+
+        response = client.get(
+            f'/users/{user.id}/moods/', headers={'Authorization': f'Bearer {token}'}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    async def test_purged_user_token_is_unauthorized(self, client, engine, user_repository, token):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        client.delete(f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'})
+        assert await purge(engine, batch_size=10) == 1
+
+        headers = {'Authorization': f'Bearer {token}'}
+        for response in (
+            client.get('/users', headers=headers),
+            client.put(f'/users/{user.id}', json={'first_name': 'Ghost'}, headers=headers),
+            client.delete(f'/users/{user.id}', headers=headers),
+            client.get(f'/users/{user.id}/moods/', headers=headers),
+        ):
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+            assert response.json() == {'detail': 'User not found'}
+
+    @pytest.mark.asyncio
+    async def test_purged_user_self_contained_token_is_unauthorized(
+        self, client, engine, monkeypatch, user_repository, token
+    ):
+        monkeypatch.setenv('JWT_SELF_CONTAINED_CLAIMS', 'true')
+        self_contained_token = client.post(
+            '/auth/login', data={'username': 'testuser0@example.com', 'password': 'Password123'}
+        ).json()['access_token']
+        user = await user_repository.find_by_email('testuser0@example.com')
+        client.delete(f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'})
+        assert await purge(engine, batch_size=10) == 1
+
+        response = client.get(
+            f'/users/{user.id}/moods/',
+            headers={'Authorization': f'Bearer {self_contained_token}'},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    async def test_delete_user_when_not_exists(self, client, token, user_repository):
+        user = await user_repository.find_by_email('testuser0@example.com')
+        user.is_admin = True
+        await user_repository.update(user)
+
+        response = client.delete('/users/999', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {'detail': 'User not found'}
+
+    @pytest.mark.asyncio
+    async def test_delete_user_when_not_permission(self, client, token, user_repository):
+        user = await user_repository.find_by_email('testuser1@example.com')
+
+        response = client.delete(f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == {'detail': 'Not enough permissions'}